@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+热点路径性能基准
+
+用法:
+    python benchmarks/run_benchmarks.py generate ./bench-data --questions 10000 --reviews 1000000
+    python benchmarks/run_benchmarks.py run --questions 10000 --reviews 1000000 -o bench.json
+    python benchmarks/run_benchmarks.py run --data-dir ./bench-data --baseline bench.json
+    python benchmarks/run_benchmarks.py sync --problems 300 --latency 0.05 --concurrency 1,4,8,16
+
+run 的结果以 JSON 输出 (每项的最小/中位耗时)，传入 --baseline 时会与
+之前的结果对比并标出变慢超过阈值的项目。sync 启动本地模拟的 LeetCode 服务器
+(每个请求固定延迟)，对比不同并发数下完整同步的耗时。
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import click
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from leetcode_fsrs_cli.fsrs import FSRS
+from leetcode_fsrs_cli.leetcode import QuestionManager
+from leetcode_fsrs_cli.leetcode_api import LeetCodeAPIClient
+from leetcode_fsrs_cli.scheduler import ReviewScheduler
+from leetcode_fsrs_cli.storage import StorageManager
+from leetcode_fsrs_cli.sync import SyncManager
+from leetcode_fsrs_cli.synthetic import write_dataset
+
+
+def _time(func, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": statistics.median(timings), "runs": repeat}
+
+
+def run_suite(data_dir: str, repeat: int, optimize_limit: int) -> dict:
+    """对 data_dir 中的数据集运行所有基准"""
+    storage = StorageManager(data_dir=data_dir)
+    results = {}
+
+    results["StorageManager.load_reviews"] = _time(storage.load_reviews, repeat)
+    reviews = storage.load_reviews()
+    results["StorageManager.save_reviews"] = _time(lambda: storage.save_reviews(reviews), repeat)
+    results["StorageManager.get_due_reviews"] = _time(storage.get_due_reviews, repeat)
+
+    results["QuestionManager.load"] = _time(lambda: QuestionManager(data_dir=data_dir), repeat)
+    qm = QuestionManager(data_dir=data_dir)
+    results["QuestionManager.search_questions"] = _time(
+        lambda: [qm.search_questions(k) for k in ("sum", "tree", "dynamic-programming", "42")], repeat
+    )
+    results["QuestionManager.list_questions"] = _time(
+        lambda: (qm.list_questions(), qm.list_questions("hard"), qm.list_questions(tags=["graph", "trie"])),
+        repeat
+    )
+
+    fsrs = FSRS()
+    scheduler = ReviewScheduler(fsrs)
+    due_reviews = storage.get_due_reviews()
+    results["ReviewScheduler.generate_daily_review_plan"] = _time(
+        lambda: scheduler.generate_daily_review_plan(due_reviews, qm.questions, 50), repeat
+    )
+
+    try:
+        from leetcode_fsrs_cli.optimizer import FSRSOptimizer, HAS_SCIPY, flatten_reviews
+    except ImportError:
+        HAS_SCIPY = False
+    if HAS_SCIPY:
+        flat = flatten_reviews(reviews)[:optimize_limit]
+        optimizer = FSRSOptimizer(fsrs)
+        results["FSRSOptimizer.optimize"] = dict(_time(lambda: optimizer.optimize(flat), 1),
+                                                 reviews=len(flat))
+
+    return results
+
+
+def _mock_leetcode_handler(n_problems: int, latency: float):
+    """模拟 LeetCode 的题目列表和 GraphQL 接口，每个请求延迟 latency 秒"""
+    slugs = [f"mock-problem-{i}" for i in range(1, n_problems + 1)]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, payload: dict):
+            time.sleep(latency)
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply({"stat_status_pairs": [
+                {"stat": {"question_id": i, "frontend_question_id": i, "question__title": slug,
+                          "question__title_slug": slug}, "difficulty": {"level": 1 + i % 3}, "status": "ac"}
+                for i, slug in enumerate(slugs, 1)
+            ]})
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            slug = (request.get("variables") or {}).get("titleSlug")
+            if slug is None:
+                self._reply({"data": {"userStatus": {"isSignedIn": True, "username": "bench"}}})
+                return
+            qid = slugs.index(slug) + 1
+            self._reply({"data": {"question": {
+                "questionId": str(qid), "questionFrontendId": str(qid), "title": slug, "titleSlug": slug,
+                "content": f"<p>{slug}</p>" * 50, "difficulty": "Medium",
+                "topicTags": [{"name": "Array", "slug": "array"}]
+            }}})
+
+    return Handler
+
+
+def bench_sync(n_problems: int, latency: float, concurrency_levels: list) -> dict:
+    """对本地模拟服务器执行完整同步，返回每个并发数的耗时"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _mock_leetcode_handler(n_problems, latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = {}
+    try:
+        for concurrency in concurrency_levels:
+            with tempfile.TemporaryDirectory() as data_dir:
+                client = LeetCodeAPIClient(cookie="LEETCODE_SESSION=bench", base_url=base_url)
+                start = time.perf_counter()
+                report = SyncManager(data_dir=data_dir).perform_sync(
+                    full_sync=True, concurrency=concurrency, client=client
+                )
+                elapsed = time.perf_counter() - start
+            results[f"SyncManager.perform_sync[concurrency={concurrency}]"] = {
+                "seconds": elapsed, "new": report.new_count, "status": report.status
+            }
+    finally:
+        server.shutdown()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """返回相对基线变慢超过 threshold 的项目"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old or not old.get("min"):
+            continue
+        ratio = result["min"] / old["min"]
+        result["baseline_ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+@click.group()
+def main():
+    """LeetCode FSRS CLI 性能基准"""
+
+
+@main.command()
+@click.argument('data_dir', type=click.Path(file_okay=False))
+@click.option('--questions', default=10000, help='题目数量')
+@click.option('--reviews', default=1000000, help='复习记录总数')
+@click.option('--seed', default=0, help='随机种子')
+def generate(data_dir, questions, reviews, seed):
+    """生成合成数据集"""
+    start = time.perf_counter()
+    n_questions, n_reviews = write_dataset(data_dir, questions, reviews, seed=seed)
+    click.echo(f"已生成 {n_questions} 道题目, {n_reviews} 条复习记录 "
+               f"({time.perf_counter() - start:.1f}s) -> {data_dir}", err=True)
+
+
+@main.command()
+@click.option('--data-dir', type=click.Path(exists=True, file_okay=False), help='已有数据集目录 (不提供则临时生成)')
+@click.option('--questions', default=10000, help='临时生成的题目数量')
+@click.option('--reviews', default=1000000, help='临时生成的复习记录总数')
+@click.option('--seed', default=0, help='随机种子')
+@click.option('--repeat', default=3, help='每项重复次数')
+@click.option('--optimize-limit', default=5000, help='优化器基准使用的最大复习条数')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='结果写入文件 (默认输出到stdout)')
+@click.option('--baseline', type=click.Path(exists=True, dir_okay=False), help='用于对比的历史结果JSON')
+@click.option('--threshold', default=0.2, help='判定为性能回退的变慢比例')
+def run(data_dir, questions, reviews, seed, repeat, optimize_limit, output, baseline, threshold):
+    """运行基准并输出JSON结果"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scale = {"seed": seed}
+        if not data_dir:
+            data_dir = tmp_dir
+            n_questions, n_reviews = write_dataset(data_dir, questions, reviews, seed=seed)
+            scale.update(questions=n_questions, reviews=n_reviews)
+        else:
+            scale["data_dir"] = data_dir
+
+        results = run_suite(data_dir, repeat, optimize_limit)
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": results
+    }
+
+    regressions = []
+    if baseline:
+        with open(baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), threshold)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        click.echo(text)
+
+    for name in regressions:
+        click.echo(f"⚠️ 性能回退: {name} ({results[name]['baseline_ratio']:.2f}x)", err=True)
+    if regressions:
+        sys.exit(1)
+
+
+@main.command()
+@click.option('--problems', default=300, help='模拟服务器上的已通过题目数')
+@click.option('--latency', default=0.05, help='模拟服务器每个请求的延迟 (秒)')
+@click.option('--concurrency', default='1,4,8,16', help='要对比的并发数 (逗号分隔)')
+def sync(problems, latency, concurrency):
+    """对本地模拟服务器运行完整同步，对比不同并发数的耗时"""
+    levels = [int(v) for v in concurrency.split(',') if v.strip()]
+    results = bench_sync(problems, latency, levels)
+    click.echo(json.dumps({
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "scale": {"problems": problems, "latency": latency},
+        "results": results
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
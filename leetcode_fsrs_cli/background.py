@@ -0,0 +1,233 @@
+"""
+后台自动优化
+在独立的低优先级子进程中运行 FSRSOptimizer，结果写入候选参数文件，
+由下一次 practice 提示应用 (或按配置自动应用)。候选参数记录拟合时的
+基准权重和拟合状态水位线，二者变化后 (如手动优化或设置过权重) 视为过期。
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+from .storage import StorageManager
+
+# 两次检查之间的最短间隔 (秒)
+CHECK_INTERVAL = 24 * 3600
+# 锁文件超过该时间视为上次子进程异常退出遗留 (秒)
+STALE_LOCK_SECONDS = 3600
+
+
+def _is_recent(path, seconds: float) -> bool:
+    try:
+        return time.time() - os.path.getmtime(path) < seconds
+    except OSError:
+        return False
+
+
+def maybe_launch(storage: StorageManager, config: dict) -> bool:
+    """
+    按需启动后台优化子进程
+
+    这里只做几次文件状态检查，复习记录的读取和是否需要优化的判断都在
+    子进程中完成，不会给交互命令增加延迟。
+
+    Returns:
+        bool: 是否启动了子进程
+    """
+    if not config.get("auto_optimize", True):
+        return False
+    # 打包后的二进制版本无法通过 -m 启动子模块
+    if getattr(sys, "frozen", False):
+        return False
+    if os.path.exists(storage.candidate_params_file):
+        return False
+    if _is_recent(storage.auto_optimize_lock_file, STALE_LOCK_SECONDS):
+        return False
+    if _is_recent(storage.auto_optimize_stamp_file, CHECK_INTERVAL):
+        return False
+
+    kwargs = {
+        "stdin": subprocess.DEVNULL,
+        "stdout": subprocess.DEVNULL,
+        "stderr": subprocess.DEVNULL,
+        "close_fds": True
+    }
+    if os.name == "nt":
+        kwargs["creationflags"] = (
+            subprocess.DETACHED_PROCESS
+            | subprocess.CREATE_NEW_PROCESS_GROUP
+            | subprocess.BELOW_NORMAL_PRIORITY_CLASS
+        )
+    else:
+        kwargs["start_new_session"] = True
+
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "leetcode_fsrs_cli.background", str(storage.data_dir)],
+            **kwargs
+        )
+    except OSError:
+        return False
+    return True
+
+
+def run(data_dir: Optional[str] = None) -> Optional[dict]:
+    """
+    子进程入口：新复习数达到阈值时进行增量优化并写入候选参数
+
+    Returns:
+        Optional[dict]: 写入的候选参数，未优化时返回 None
+    """
+    storage = StorageManager(data_dir)
+
+    try:
+        lock_fd = os.open(storage.auto_optimize_lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        if _is_recent(storage.auto_optimize_lock_file, STALE_LOCK_SECONDS):
+            return None
+        os.remove(storage.auto_optimize_lock_file)
+        lock_fd = os.open(storage.auto_optimize_lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+
+    try:
+        os.write(lock_fd, str(os.getpid()).encode())
+        with open(storage.auto_optimize_stamp_file, 'w', encoding='utf-8') as f:
+            f.write(datetime.now().isoformat())
+        return _optimize_candidate(storage)
+    finally:
+        os.close(lock_fd)
+        os.remove(storage.auto_optimize_lock_file)
+
+
+def _optimize_candidate(storage: StorageManager) -> Optional[dict]:
+    from .fsrs import FSRS
+    from .optimizer import FSRSOptimizer, HAS_SCIPY, flatten_reviews, parse_timestamp
+
+    if not HAS_SCIPY:
+        return None
+
+    config = storage.load_config()
+    flat_reviews = flatten_reviews(storage.load_reviews())
+    state = storage.load_optimizer_state()
+    base_watermark = state.get("watermark") if state else None
+    min_reviews = config.get("auto_optimize_min_reviews", 100)
+
+    def count_after(watermark: Optional[str]) -> int:
+        if not watermark:
+            return len(flat_reviews)
+        cutoff = datetime.fromisoformat(watermark)
+        return sum(1 for r in flat_reviews if parse_timestamp(r["timestamp"]) > cutoff)
+
+    new_count = count_after(base_watermark)
+    if new_count < min_reviews:
+        return None
+
+    # 同一基准上被拒绝过的候选：之后再积累足够的新复习才重新生成
+    declined = _load_json(storage.declined_candidate_file)
+    if declined and declined.get("base_watermark") == base_watermark:
+        if count_after(declined.get("watermark")) < min_reviews:
+            return None
+
+    fsrs = FSRS(config.get("fsrs_params"))
+    optimizer = FSRSOptimizer(fsrs)
+    result = optimizer.optimize_incremental(flat_reviews, state)
+    if result.mode == "unchanged":
+        return None
+
+    candidate = {
+        "w": result.weights,
+        "loss": result.loss,
+        "mode": result.mode,
+        "new_reviews": new_count,
+        "created_at": datetime.now().isoformat(),
+        "base_w": list(fsrs.params["w"]),
+        "base_watermark": base_watermark,
+        "state": result.state
+    }
+    tmp_path = f"{storage.candidate_params_file}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(candidate, f, ensure_ascii=False)
+    os.replace(tmp_path, storage.candidate_params_file)
+    return candidate
+
+
+def _load_json(path) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def load_candidate(storage: StorageManager) -> Optional[dict]:
+    """
+    读取后台优化生成的候选参数
+
+    当前权重或拟合状态已不是候选参数拟合时的基准 (之后手动优化或设置过权重)
+    时，候选参数已过期，删除并返回 None。
+    """
+    from .fsrs import FSRS
+
+    candidate = _load_json(storage.candidate_params_file)
+    if not candidate:
+        return None
+
+    state = storage.load_optimizer_state()
+    current_w = FSRS(storage.load_config().get("fsrs_params")).params["w"]
+    if (candidate.get("base_w") != list(current_w)
+            or candidate.get("base_watermark") != (state.get("watermark") if state else None)):
+        discard_candidate(storage)
+        return None
+    return candidate
+
+
+def apply_candidate(storage: StorageManager, candidate: dict):
+    """应用候选权重并记录对应的拟合状态"""
+    config = storage.load_config()
+    config.setdefault("fsrs_params", {})["w"] = candidate["w"]
+    storage.save_config(config)
+    if candidate.get("state"):
+        storage.save_optimizer_state(candidate["state"])
+    discard_candidate(storage)
+
+
+def discard_candidate(storage: StorageManager):
+    """删除候选参数文件"""
+    try:
+        os.remove(storage.candidate_params_file)
+    except OSError:
+        pass
+
+
+def decline_candidate(storage: StorageManager, candidate: dict):
+    """
+    拒绝候选参数
+
+    记录候选参数覆盖到的水位线，在同一基准上再积累 auto_optimize_min_reviews
+    条新复习之前不会重新生成 (否则每次检查都会得到同样的候选)。
+    """
+    declined = {
+        "watermark": (candidate.get("state") or {}).get("watermark"),
+        "base_watermark": candidate.get("base_watermark"),
+        "new_reviews": candidate.get("new_reviews"),
+        "declined_at": datetime.now().isoformat()
+    }
+    tmp_path = f"{storage.declined_candidate_file}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(declined, f, ensure_ascii=False)
+    os.replace(tmp_path, storage.declined_candidate_file)
+    discard_candidate(storage)
+
+
+if __name__ == '__main__':
+    try:
+        # 降低子进程优先级，避免影响前台使用
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+    run(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -4,17 +4,22 @@ CLI交互界面
 """
 
 import click
+import os
 import sys
 import json
-import re
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from typing import List, Optional
 
-from .fsrs import FSRS, ReviewRecord
+from .fsrs import FSRS, FSRSParamGroups, ReviewRecord
 from .leetcode import QuestionManager, Question, SAMPLE_QUESTIONS
 from .storage import StorageManager
-from .scheduler import ReviewScheduler, ReviewSession
+from .scheduler import ReviewScheduler, ReviewSession, ReviewQueue, DurationEstimator
+from .priority import PriorityExpression
+from .plan_cache import PlanCache, plan_key
+from .query import Query, query_record
 from .auth import AuthManager
+from . import background
 from .sync import SyncManager, SyncReport
 from .version import __version__
 
@@ -28,54 +33,56 @@ class LeetCodeFSRSCLI:
         
         # 加载配置并初始化FSRS
         config = self.storage_manager.load_config()
+        self.config = config
         fsrs_params = config.get("fsrs_params")
-        self.fsrs = FSRS(fsrs_params)
+        # 按标签/难度分组的参数，未匹配分组的题目使用全局参数
+        self.fsrs_groups = FSRSParamGroups(fsrs_params, config.get("fsrs_param_groups"))
+        self.fsrs = self.fsrs_groups.default
         
-        self.scheduler = ReviewScheduler(self.fsrs)
-
-    def practice(self, limit: int = 10, show_plan: bool = False, show_content: bool = False):
-        """开始练习"""
-        # 获取到期的复习记录
-        due_reviews = self.storage_manager.get_due_reviews()
+        try:
+            self.scheduler = ReviewScheduler(self.fsrs, config.get("priority_expression"))
+        except ValueError as e:
+            click.echo(f"⚠️ 评分表达式无效，使用默认公式: {e}")
+            self.scheduler = ReviewScheduler(self.fsrs)
+
+    def practice(
+        self,
+        limit: int = 10,
+        show_plan: bool = False,
+        show_content: bool = False,
+        minutes: Optional[float] = None
+    ):
+        """开始练习 (指定 minutes 时在时间预算内选择题目，limit 只限制新题数量)"""
         questions = {q.id: q for q in self.question_manager.list_questions()}
-        
-        # 如果复习题目不足，补充新题目
-        new_reviews = []
-        if len(due_reviews) < limit:
-            needed = limit - len(due_reviews)
-            # 查找没有复习记录的题目
-            existing_review_ids = set(self.storage_manager.load_reviews().keys())
-            new_questions = [
-                q for q_id, q in questions.items() 
-                if q_id not in existing_review_ids
+        reviews = self.storage_manager.load_reviews()
+        estimator = DurationEstimator([r for r in reviews.values()], questions) if minutes else None
+
+        # 当天数据没有变化时直接使用缓存的计划
+        cache = PlanCache(self.storage_manager.data_dir)
+        key = plan_key(limit, minutes)
+        now = datetime.now()
+        cached = cache.get(now.date(), key, now)
+        if cached is not None:
+            sessions = [
+                ReviewSession(questions[qid], reviews.get(qid) or ReviewRecord(question_id=qid), priority)
+                for qid, priority in cached if qid in questions
             ]
-            # 简单按ID排序取前N个
-            new_questions.sort(key=lambda q: q.id, reverse=True)
-            
-            for q in new_questions[:needed]:
-                # 创建初始复习记录
-                new_reviews.append(ReviewRecord(question_id=q.id))
-        
-        # 合并复习列表
-        all_reviews = due_reviews + new_reviews
-
-        if not all_reviews:
-            click.echo("🎉 没有需要复习或新的题目！")
-            return
-
-        # 生成复习计划
-        sessions = self.scheduler.generate_daily_review_plan(
-            all_reviews, questions, limit
-        )
+        else:
+            sessions = self._build_plan(questions, reviews, limit, estimator, minutes, now)
+            cache.put(now.date(), key, [(s.question.id, s.priority) for s in sessions],
+                      self._next_due_after(reviews, now))
 
         if not sessions:
-            click.echo("❌ 没有可复习的题目！")
+            click.echo("🎉 没有需要复习或新的题目！")
             return
 
         if show_plan:
             click.echo("📅 复习计划")
             click.echo("=" * 40)
             click.echo(f"待复习题目: {len(sessions)}")
+            if estimator is not None:
+                progress = self.scheduler.calculate_review_progress(sessions, 0, estimator)
+                click.echo(f"预计用时: {progress['estimated_time']:.0f} 分钟 (预算 {minutes:g} 分钟)")
             click.echo()
 
             for i, session in enumerate(sessions[:20], 1):  # 显示前20个
@@ -88,19 +95,34 @@ class LeetCodeFSRSCLI:
                 click.echo(f"... 还有 {len(sessions) - 20} 题")
             return
 
+        self._offer_candidate_params()
+
         click.echo(f"📚 今日复习计划 ({len(sessions)} 题):")
-        if new_reviews:
-            click.echo(f"   (包含 {len(new_reviews)} 个新题目)")
+        new_count = sum(1 for s in sessions if not s.review_record.review_history)
+        if new_count:
+            click.echo(f"   (包含 {new_count} 个新题目)")
         click.echo("=" * 50)
         click.pause("按任意键开始练习...")
 
+        balancer = None
+        if self.config.get("load_balance", True):
+            balancer = self.storage_manager.load_due_index(self.config.get("daily_review_limit"))
+            self.fsrs_groups.set_load_balancer(balancer)
+
+        # 评分后只重新调整被评分的题目，忘记的题目稍后在本次练习中重新出现
+        queue = ReviewQueue(self.scheduler, sessions)
         completed_count = 0
-        for i, session in enumerate(sessions, 1):
+        while True:
+            session = queue.pop()
+            if session is None:
+                break
             click.clear()  # 清屏
             question = session.question
             review = session.review_record
+            if show_content:
+                question = self._ensure_detail(question)
 
-            click.echo(f"📊 进度: {completed_count}/{len(sessions)}")
+            click.echo(f"📊 进度: {completed_count}/{queue.total}")
             click.echo("=" * 50)
             click.echo(f"{question.id}. {question.title}")
             click.echo(f"难度: {question.difficulty}")
@@ -109,8 +131,8 @@ class LeetCodeFSRSCLI:
             click.echo("-" * 50)
             
             if show_content and question.content:
-                # 显示题目内容摘要 (去除HTML)
-                clean_content = self._strip_html(question.content)
+                # 显示题目内容摘要 (添加题目时已渲染为纯文本)
+                clean_content = self.question_manager.get_rendered_content(question)
                 content_preview = clean_content[:500] + "..." if len(clean_content) > 500 else clean_content
                 click.echo(content_preview)
                 click.echo("-" * 50)
@@ -118,20 +140,105 @@ class LeetCodeFSRSCLI:
             click.echo(f"链接: {question.url}")
             click.echo("=" * 50)
 
-            # 获取用户评分
+            # 从显示题目到给出评分的用时
+            shown_at = time.monotonic()
             rating = self._get_user_rating()
             if rating is None:
                 click.echo("\n👋 练习结束！")
                 break
 
             # 更新复习记录
-            review.add_review(datetime.now(), rating, self.fsrs)
+            review.add_review(datetime.now(), rating, self.fsrs_groups.for_question(question),
+                              duration=time.monotonic() - shown_at)
             self.storage_manager.save_review_record(review)
+            self.storage_manager.record_daily_review(review)
+            if balancer is not None:
+                self.storage_manager.save_due_index(balancer)
 
             completed_count += 1
+            queue.record_rating(session, rating)
 
         click.echo(f"\n🎯 今日完成: {completed_count} 题")
 
+        if completed_count:
+            self._precompute_plans(limit, minutes)
+            background.maybe_launch(self.storage_manager, self.config)
+
+    def _build_plan(
+        self,
+        questions: dict,
+        reviews: dict,
+        limit: int,
+        estimator: Optional[DurationEstimator] = None,
+        minutes: Optional[float] = None,
+        now: Optional[datetime] = None
+    ) -> List[ReviewSession]:
+        """根据到期复习和新题生成复习计划"""
+        now = now or datetime.now()
+        due_reviews = sorted(
+            (r for r in reviews.values() if r.next_review and r.next_review <= now),
+            key=lambda r: r.next_review
+        )
+
+        # 如果复习题目不足，补充新题目
+        new_reviews = []
+        if len(due_reviews) < limit:
+            needed = limit - len(due_reviews)
+            # 查找没有复习记录的题目，简单按ID倒序取前N个
+            new_ids = sorted((q_id for q_id in questions if q_id not in reviews), reverse=True)
+            new_reviews = [ReviewRecord(question_id=q_id) for q_id in new_ids[:needed]]
+
+        all_reviews = due_reviews + new_reviews
+        if minutes:
+            return self.scheduler.generate_time_budget_plan(
+                all_reviews, questions, minutes, estimator, now=now
+            )
+        return self.scheduler.generate_daily_review_plan(all_reviews, questions, limit, now)
+
+    def _precompute_plans(self, limit: int, minutes: Optional[float]):
+        """练习结束后预先生成今天剩余和明天的计划"""
+        questions = {q.id: q for q in self.question_manager.list_questions()}
+        reviews = self.storage_manager.load_reviews()
+        estimator = DurationEstimator([r for r in reviews.values()], questions) if minutes else None
+        cache = PlanCache(self.storage_manager.data_dir)
+        now = datetime.now()
+        # 明天的计划从零点算起，当天之后到期的题目由 valid_until 触发重新生成
+        for day_now in (now, datetime.combine(now.date() + timedelta(days=1), datetime.min.time())):
+            sessions = self._build_plan(questions, reviews, limit, estimator, minutes, day_now)
+            cache.put(day_now.date(), plan_key(limit, minutes), [(s.question.id, s.priority) for s in sessions],
+                      self._next_due_after(reviews, day_now))
+
+    @staticmethod
+    def _next_due_after(reviews: dict, now: datetime) -> Optional[datetime]:
+        """now 之后最早到期的题目的到期时间 (此后基于 now 生成的计划会漏掉该题)"""
+        return min((r.next_review for r in reviews.values() if r.next_review and r.next_review > now),
+                   default=None)
+
+    def _offer_candidate_params(self):
+        """提示应用后台优化生成的候选参数"""
+        candidate = background.load_candidate(self.storage_manager)
+        if not candidate:
+            return
+
+        if self.config.get("auto_apply_candidate"):
+            background.apply_candidate(self.storage_manager, candidate)
+            click.echo(f"✅ 已自动应用后台优化的参数 (Loss: {candidate['loss']:.4f})")
+        elif click.confirm(
+            f"🔧 后台优化基于 {candidate['new_reviews']} 条新复习生成了新参数 "
+            f"(Loss: {candidate['loss']:.4f})，是否应用?"
+        ):
+            background.apply_candidate(self.storage_manager, candidate)
+            click.echo("✅ 配置已更新")
+        else:
+            background.decline_candidate(self.storage_manager, candidate)
+            return
+
+        self.fsrs_groups = FSRSParamGroups(
+            dict(self.fsrs.params, w=candidate["w"]), self.config.get("fsrs_param_groups")
+        )
+        self.fsrs = self.fsrs_groups.default
+        self.scheduler.fsrs = self.fsrs
+
     def _get_user_rating(self) -> Optional[int]:
         """获取用户评分"""
         click.echo("\n请评价回忆难度:")
@@ -175,21 +282,52 @@ class LeetCodeFSRSCLI:
         click.echo(f"   待复习: {review_stats['due_reviews']}")
         click.echo(f"   平均稳定性: {review_stats['avg_stability']:.2f}")
 
-        # 学习分析
-        all_reviews = list(self.storage_manager.load_reviews().values())
-        analytics = self.scheduler.get_study_analytics(all_reviews)
-
-        click.echo(f"\n📈 近期学习分析 (30天):")
-        click.echo(f"   复习次数: {analytics['total_reviews']}")
-        click.echo(f"   平均评分: {analytics['avg_rating']:.2f}")
-        click.echo(f"   成功率: {analytics['success_rate']:.1%}")
+        # 学习分析 (读取按天汇总表，只遍历窗口内的天数)
+        rollup = self.storage_manager.load_daily_rollup()
+        click.echo(f"\n📈 近期学习分析:")
+        for days in (7, 30, 365):
+            analytics = self.scheduler.get_study_analytics([], days, rollup=rollup)
+            click.echo(
+                f"   {days:>3}天: 复习 {analytics['total_reviews']} 次 | "
+                f"平均评分 {analytics['avg_rating']:.2f} | 成功率 {analytics['success_rate']:.1%}"
+            )
+
+        click.echo(f"\n🗓️ 复习热力图 (近一年):")
+        for line in self._render_heatmap(rollup.heatmap(365)):
+            click.echo(f"   {line}")
+
+    def _render_heatmap(self, counts) -> list:
+        """按周排列的复习热力图，每列一周、每行一个星期几"""
+        if not counts:
+            return []
+        shades = " ░▒▓█"
+        peak = max(count for _, count in counts)
+        # 第一列从周一开始，之前的位置留空
+        cells = [None] * counts[0][0].weekday() + [count for _, count in counts]
+        rows = []
+        for weekday, name in enumerate("一二三四五六日"):
+            line = ""
+            for count in cells[weekday::7]:
+                if count is None:
+                    line += " "
+                elif count == 0 or peak == 0:
+                    line += "·"
+                else:
+                    line += shades[min(4, 1 + (count * 4 - 1) // peak)]
+            rows.append(f"{name} {line}")
+        return rows
 
 
 
-    def list_questions(self, difficulty: Optional[str] = None, tag: Optional[str] = None, status: Optional[str] = None):
+    def list_questions(
+        self,
+        difficulty: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        status: Optional[str] = None,
+        match_all: bool = False
+    ):
         """列出题目"""
-        tags = [tag] if tag else None
-        questions = self.question_manager.list_questions(difficulty, tags)
+        questions = self.question_manager.list_questions(difficulty, tags or None, match_all)
 
         # 按状态过滤
         if status:
@@ -234,15 +372,116 @@ class LeetCodeFSRSCLI:
         
         click.echo_via_pager("\n".join(output))
 
-    def get_question_info(self, question_id: int):
-        """显示题目详细信息"""
-        question = self.question_manager.get_question(question_id)
-        
+    def search(self, keyword: str, limit: int = 20):
+        """全文搜索题目"""
+        questions = self.question_manager.search_questions(keyword, limit)
+        if not questions:
+            click.echo(f"❌ 没有找到与 '{keyword}' 相关的题目")
+            return
+
+        click.echo(f"🔍 搜索结果 ({len(questions)} 题)")
+        click.echo("=" * 60)
+        for question in questions:
+            click.echo(f"{question.id}. {question.title}")
+            click.echo(f"   难度: {question.difficulty} | 标签: {', '.join(question.tags)}")
+
+    def suggest(self, limit: int = 5, tags: Optional[List[str]] = None, max_hard: Optional[int] = None):
+        """推荐尚未做过的新题，尽量覆盖更多 (指定的) 标签"""
+        if tags:
+            # 只解析标签索引命中的题目，不扫描整个题库
+            questions = [
+                self.question_manager.get_question(qid)
+                for qid in self.question_manager.get_ids_by_tags(tags)
+            ]
+        else:
+            questions = self.question_manager.list_questions()
+        reviews = self.storage_manager.load_reviews()
+        budget = {"hard": max_hard} if max_hard is not None else None
+        suggestions = self.scheduler.get_review_suggestions(
+            questions, reviews.keys(), limit, focus_tags=tags or None, difficulty_budget=budget
+        )
+        if not suggestions:
+            click.echo("❌ 没有可推荐的新题目")
+            return
+
+        click.echo(f"💡 推荐新题 ({len(suggestions)} 题)")
+        click.echo("=" * 60)
+        for question in suggestions:
+            click.echo(f"{question.id}. {question.title}")
+            click.echo(f"   难度: {question.difficulty} | 标签: {', '.join(question.tags)}")
+
+    def query(self, text: str, output_format: str = "table", limit: Optional[int] = None):
+        """按查询语言筛选题目，逐行输出表格或 NDJSON"""
+        try:
+            compiled = Query(text)
+        except ValueError as e:
+            click.echo(f"❌ 查询无效: {e}", err=True)
+            return
+
+        reviews = self.storage_manager.load_reviews()
+        ids = compiled.execute(self.question_manager, reviews)
+        if limit is not None:
+            ids = ids[:limit]
+
+        if output_format == "ndjson":
+            for qid in ids:
+                record = query_record(self.question_manager.questions[qid], reviews.get(qid))
+                click.echo(json.dumps(record, ensure_ascii=False))
+            return
+
+        if not ids:
+            click.echo("❌ 没有找到符合条件的题目")
+            return
+        # 中文表头每个字占两列宽度，按显示宽度手动对齐
+        click.echo(f"{'ID':>5}  难度    稳定性  下次复习    标题")
+        for qid in ids:
+            question = self.question_manager.questions[qid]
+            review = reviews.get(qid)
+            stability = f"{review.stability:.2f}" if review else "-"
+            next_review = review.next_review.strftime('%Y-%m-%d') if review and review.next_review else "-"
+            click.echo(f"{qid:>5}  {question.difficulty:<6}  {stability:>6}  {next_review:<10}  {question.title}")
+        click.echo(f"共 {len(ids)} 题")
+
+    def import_questions(self, file_path: str, chunk_size: int):
+        """从 NDJSON/JSON 文件导入题目"""
+        stats = self.question_manager.import_questions(file_path, chunk_size)
+        click.echo(
+            f"✅ 导入 {stats.count} 题 (已存在跳过 {stats.skipped}，无效 {stats.failed})，"
+            f"用时 {stats.seconds:.2f} 秒，{stats.rate:.0f} 题/秒"
+        )
+
+    def export_questions(self, file_path: str, output_format: str):
+        """导出题目到 NDJSON/JSON 文件"""
+        stats = self.question_manager.export_questions(file_path, output_format)
+        if stats is None:
+            click.echo("❌ 导出失败")
+            return
+        click.echo(f"✅ 导出 {stats.count} 题到 {file_path}，用时 {stats.seconds:.2f} 秒，{stats.rate:.0f} 题/秒")
+
+    def _ensure_detail(self, question: Question) -> Question:
+        """题库模式导入的题目在首次显示时获取描述和标签 (失败时仍显示已有信息)"""
+        if not question.needs_detail:
+            return question
+        click.echo("⏳ 正在获取题目详情...")
+        sync_manager = SyncManager(data_dir=str(self.question_manager.data_dir))
+        return sync_manager.fetch_question_detail(self.question_manager, question) or question
+
+    def get_question_info(self, query):
+        """显示题目详细信息 (query 可以是题号、slug 或标题)"""
+        question = self.question_manager.find_question(str(query))
+
         if not question:
-            click.echo(f"❌ 题目 {question_id} 不存在")
+            click.echo(f"❌ 题目 {query} 不存在")
+            suggestions = self.question_manager.fuzzy_search(str(query), 3)
+            if suggestions:
+                click.echo("💡 您是不是要找:")
+                for qid, _ in suggestions:
+                    candidate = self.question_manager.get_question(qid)
+                    click.echo(f"   {candidate.id}. {candidate.title}")
             return
-        
-        review = self.storage_manager.get_review_record(question_id)
+
+        question = self._ensure_detail(question)
+        review = self.storage_manager.get_review_record(question.id)
         
         click.echo("=" * 60)
         click.echo(f"📌 题目 {question.id}: {question.title}")
@@ -265,24 +504,11 @@ class LeetCodeFSRSCLI:
         
         if question.content:
             click.echo(f"\n📖 题目描述:")
-            clean_content = self._strip_html(question.content)
+            clean_content = self.question_manager.get_rendered_content(question)
             click.echo(f"   {clean_content[:200]}...")
         
         click.echo("\n" + "=" * 60)
 
-    def _strip_html(self, content: str) -> str:
-        """去除HTML标签"""
-        if not content:
-            return ""
-        # 移除 <p>, <div>, <br> 等标签，替换为换行
-        content = re.sub(r'</?(p|div|br|li)[^>]*>', '\n', content)
-        # 移除其他标签
-        content = re.sub(r'<[^>]+>', '', content)
-        # 处理实体字符
-        content = content.replace('&nbsp;', ' ').replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&').replace('&quot;', '"')
-        # 移除多余空行
-        return re.sub(r'\n\s*\n', '\n\n', content).strip()
-
 @click.group()
 @click.version_option(__version__, '--version', '-v', help='显示版本信息')
 @click.pass_context
@@ -298,10 +524,11 @@ def cli(ctx):
 @click.option('--limit', default=10, help='每日复习题目数量限制')
 @click.option('--plan', is_flag=True, help='仅显示复习计划')
 @click.option('--show-content', is_flag=True, help='显示题目描述')
-def practice(limit, plan, show_content):
+@click.option('--minutes', type=float, help='时间预算 (分钟)，按预计用时选择收益最高的题目')
+def practice(limit, plan, show_content, minutes):
     """开始练习"""
     cli_obj = LeetCodeFSRSCLI()
-    cli_obj.practice(limit, show_plan=plan, show_content=show_content)
+    cli_obj.practice(limit, show_plan=plan, show_content=show_content, minutes=minutes)
 
 
 @cli.command()
@@ -316,20 +543,77 @@ def stats():
 
 @cli.command()
 @click.option('--difficulty', help='按难度过滤 (easy/medium/hard)')
-@click.option('--tag', help='按标签过滤')
+@click.option('--tag', multiple=True, help='按标签过滤 (可多次指定)')
+@click.option('--match-all', is_flag=True, help='必须带有全部指定的标签 (默认带有任一标签即可)')
 @click.option('--status', help='按状态过滤 (due/done/new)')
-def list(difficulty, tag, status):
+def list(difficulty, tag, match_all, status):
     """列出题目"""
     cli_obj = LeetCodeFSRSCLI()
-    cli_obj.list_questions(difficulty, tag, status)
+    cli_obj.list_questions(difficulty, [*tag], status, match_all)
+
+
+@cli.command()
+@click.argument('keyword')
+@click.option('--limit', default=20, help='最多显示的结果数量')
+def search(keyword, limit):
+    """全文搜索题目 (标题、标签、slug 和题目描述)"""
+    cli_obj = LeetCodeFSRSCLI()
+    cli_obj.search(keyword, limit)
+
+
+@cli.command()
+@click.option('--limit', default=5, help='推荐题目数量')
+@click.option('--tag', multiple=True, help='只推荐带有这些标签的题目，并按这些标签计算覆盖 (可多次指定)')
+@click.option('--max-hard', type=int, help='最多推荐的困难题数量')
+def suggest(limit, tag, max_hard):
+    """推荐新题 (按标签覆盖/难度代价贪心选择)"""
+    cli_obj = LeetCodeFSRSCLI()
+    cli_obj.suggest(limit, [*tag], max_hard)
+
+
+@cli.command()
+@click.argument('text')
+@click.option('--format', 'output_format', type=click.Choice(['table', 'ndjson']), default='table', help='输出格式')
+@click.option('--limit', type=int, help='最多输出的题目数量')
+def query(text, output_format, limit):
+    """按条件查询题目
+
+    例如: tag:dp and difficulty:hard and stability<3 and overdue>2d
+
+    \b
+    匹配字段 (字段:值): tag, difficulty, status (new/due/done), title
+    数值字段 (支持 < <= > >= = !=): id, stability, fsrs_difficulty, reviews,
+        overdue, due, retrievability；时间可带 d/w/h/m 单位
+    条件可用 and / or / not 和括号组合，相邻条件默认为 and
+    """
+    cli_obj = LeetCodeFSRSCLI()
+    cli_obj.query(text, output_format, limit)
+
+
+@cli.command(name="import")
+@click.argument('file_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=500, type=int, help='每导入多少题写入一次题库')
+def import_questions(file_path, chunk_size):
+    """从 NDJSON (每行一题) 或 JSON 数组文件导入题目"""
+    cli_obj = LeetCodeFSRSCLI()
+    cli_obj.import_questions(file_path, chunk_size)
+
+
+@cli.command(name="export")
+@click.argument('file_path', type=click.Path(dir_okay=False))
+@click.option('--format', 'output_format', type=click.Choice(['ndjson', 'json']), default='ndjson', help='输出格式')
+def export_questions(file_path, output_format):
+    """导出题库 (默认 NDJSON，每行一题)"""
+    cli_obj = LeetCodeFSRSCLI()
+    cli_obj.export_questions(file_path, output_format)
 
 
 @cli.command()
-@click.argument('question_id', type=int)
-def info(question_id):
-    """显示题目详细信息"""
+@click.argument('question')
+def info(question):
+    """显示题目详细信息 (QUESTION 可以是题号、slug 或标题)"""
     cli_obj = LeetCodeFSRSCLI()
-    cli_obj.get_question_info(question_id)
+    cli_obj.get_question_info(question)
 
 
 
@@ -378,6 +662,14 @@ def config_set(key, value):
     except AttributeError:
         parsed_value = value
 
+    if key == "priority_expression":
+        try:
+            PriorityExpression(str(value))
+        except ValueError as e:
+            click.echo(f"❌ 错误: {e}")
+            return
+        parsed_value = str(value)
+
     # 处理嵌套键
     keys = key.split('.')
     current = config_data
@@ -392,6 +684,9 @@ def config_set(key, value):
             
         current[keys[-1]] = parsed_value
         storage.save_config(config_data)
+        if keys[:2] == ["fsrs_params", "w"] or keys == ["fsrs_params"]:
+            # 后台优化的候选参数基于旧权重拟合
+            background.discard_candidate(storage)
         click.echo(f"✅ 已更新: {key} = {parsed_value}")
         
     except KeyError:
@@ -416,6 +711,7 @@ def config_set_weights(weights):
             
         config_data["fsrs_params"]["w"] = w_list
         storage.save_config(config_data)
+        background.discard_candidate(storage)
         click.echo("✅ FSRS权重已更新")
         click.echo(f"   {w_list}")
         
@@ -424,10 +720,18 @@ def config_set_weights(weights):
 
 
 @config.command(name="optimize")
-def config_optimize():
+@click.option('--restarts', default=1, type=int, help='并行优化的起点数量 (>1 时启用多起点优化)')
+@click.option('--workers', default=None, type=int, help='多起点优化的进程数 (默认CPU核数)')
+@click.option('--full', is_flag=True, help='忽略上次拟合结果，全量重新优化')
+@click.option('--stochastic', is_flag=True, help='小批量随机优化 (适合超大复习记录)')
+@click.option('--batch-size', default=256, type=int, help='随机优化每批题目数')
+@click.option('--epochs', default=5, type=int, help='随机优化轮数')
+@click.option('--resume', is_flag=True, help='从上次随机优化的检查点继续')
+@click.option('--by', type=click.Choice(['tag', 'difficulty']), help='按标签或难度分组并行优化参数')
+def config_optimize(restarts, workers, full, stochastic, batch_size, epochs, resume, by):
     """自动优化FSRS参数 (需要 scipy)"""
     try:
-        from .optimizer import FSRSOptimizer, HAS_SCIPY
+        from .optimizer import FSRSOptimizer, HAS_SCIPY, flatten_reviews
     except ImportError:
         click.echo("❌ 无法导入优化器模块")
         return
@@ -438,19 +742,20 @@ def config_optimize():
         return
 
     cli_obj = LeetCodeFSRSCLI()
-    reviews = cli_obj.storage_manager.load_reviews()
+    storage = cli_obj.storage_manager
+
+    if stochastic:
+        _optimize_stochastic(cli_obj, batch_size, epochs, resume)
+        return
+
+    reviews = storage.load_reviews()
     
     if not reviews:
         click.echo("❌ 没有复习记录，无法进行优化")
         return
         
     # 扁平化复习记录
-    flat_reviews = []
-    for qid, record in reviews.items():
-        for r in record.review_history:
-            r_copy = r.copy()
-            r_copy["question_id"] = qid
-            flat_reviews.append(r_copy)
+    flat_reviews = flatten_reviews(reviews)
             
     if len(flat_reviews) < 50:
         click.echo(f"⚠️ 复习记录太少 ({len(flat_reviews)} 条)，优化结果可能不准确")
@@ -461,27 +766,263 @@ def config_optimize():
     click.echo("   这可能需要几秒钟...")
     
     optimizer = FSRSOptimizer(cli_obj.fsrs)
+    if by:
+        _optimize_groups(cli_obj, optimizer, flat_reviews, by, workers)
+        return
+
+    fit_state = None
     try:
-        new_w, loss = optimizer.optimize(flat_reviews)
-        
-        click.echo(f"\n✅ 优化完成! (Loss: {loss:.4f})")
-        click.echo(f"旧权重: {cli_obj.fsrs.params['w']}")
-        click.echo(f"新权重: {new_w}")
-        
-        if click.confirm("\n是否应用新权重?"):
-            config_data = cli_obj.storage_manager.load_config()
-            if "fsrs_params" not in config_data:
-                config_data["fsrs_params"] = {}
-            config_data["fsrs_params"]["w"] = new_w
-            cli_obj.storage_manager.save_config(config_data)
-            click.echo("✅ 配置已更新")
+        if restarts > 1:
+            click.echo(f"   使用 {restarts} 个起点并行优化...")
+            result = optimizer.optimize_multistart(flat_reviews, restarts=restarts, workers=workers)
+            new_w, loss = result.weights, result.loss
+            spread = result.loss_spread()
+            click.echo(f"\n📊 各起点 Loss 分布: 最小 {spread['min']:.4f} | 中位 {spread['median']:.4f} | "
+                       f"最大 {spread['max']:.4f} | 标准差 {spread['std']:.4f}")
+            click.echo(f"   提前放弃: {result.abandoned_count}/{len(result.losses)}")
+        elif full:
+            new_w, loss = optimizer.optimize(flat_reviews)
         else:
-            click.echo("已取消应用")
+            result = optimizer.optimize_incremental(
+                flat_reviews, cli_obj.storage_manager.load_optimizer_state()
+            )
+            if result.mode == "unchanged":
+                click.echo("✅ 上次优化后没有新的复习记录，参数无需更新")
+                return
+            if result.mode == "incremental":
+                click.echo(f"   基于上次结果增量优化 ({result.new_reviews} 条新复习)")
+            new_w, loss, fit_state = result.weights, result.loss, result.state
+        
+        if _confirm_new_weights(cli_obj, new_w, loss):
+            if fit_state is None:
+                fit_state = optimizer.build_fit_state(flat_reviews, new_w, loss)
+            storage.save_optimizer_state(fit_state)
             
     except Exception as e:
         click.echo(f"❌ 优化失败: {e}")
 
 
+def _confirm_new_weights(cli_obj: LeetCodeFSRSCLI, new_w: List[float], loss: float) -> bool:
+    """显示优化结果并询问是否应用新权重"""
+    click.echo(f"\n✅ 优化完成! (Loss: {loss:.4f})")
+    click.echo(f"旧权重: {cli_obj.fsrs.params['w']}")
+    click.echo(f"新权重: {new_w}")
+
+    if not click.confirm("\n是否应用新权重?"):
+        click.echo("已取消应用")
+        return False
+
+    config_data = cli_obj.storage_manager.load_config()
+    if "fsrs_params" not in config_data:
+        config_data["fsrs_params"] = {}
+    config_data["fsrs_params"]["w"] = new_w
+    cli_obj.storage_manager.save_config(config_data)
+    background.discard_candidate(cli_obj.storage_manager)
+    click.echo("✅ 配置已更新")
+    return True
+
+
+def _optimize_groups(cli_obj: LeetCodeFSRSCLI, optimizer, flat_reviews, by: str, workers: Optional[int]):
+    """按标签或难度分组并行优化参数"""
+    question_groups = {
+        q.id: FSRSParamGroups.group_keys(q.tags, q.difficulty, by=by)
+        for q in cli_obj.question_manager.questions.values()
+    }
+    click.echo(f"   按{'标签' if by == 'tag' else '难度'}分组并行优化...")
+
+    try:
+        result = optimizer.optimize_groups(flat_reviews, question_groups, workers=workers)
+    except Exception as e:
+        click.echo(f"❌ 优化失败: {e}")
+        return
+
+    click.echo(f"\n✅ 优化完成! (全局 Loss: {result.loss:.4f})")
+    click.echo(f"\n{'分组':<32}{'复习数':>8}{'Loss':>10}{'收缩系数':>10}")
+    click.echo("-" * 60)
+    for key, group in sorted(result.groups.items(), key=lambda item: -item[1]["reviews"]):
+        click.echo(f"{key:<32}{group['reviews']:>8}{group['loss']:>10.4f}{group['shrinkage']:>10.2f}")
+    if result.skipped:
+        click.echo(f"\n⚠️ {len(result.skipped)} 个分组复习记录不足，将使用全局参数")
+
+    if not click.confirm("\n是否应用全局和分组权重?"):
+        click.echo("已取消应用")
+        return
+
+    config_data = cli_obj.storage_manager.load_config()
+    config_data.setdefault("fsrs_params", {})["w"] = result.weights
+    config_data["fsrs_param_groups"] = {key: group["w"] for key, group in result.groups.items()}
+    cli_obj.storage_manager.save_config(config_data)
+    background.discard_candidate(cli_obj.storage_manager)
+    click.echo("✅ 配置已更新")
+
+
+def _optimize_stochastic(cli_obj: LeetCodeFSRSCLI, batch_size: int, epochs: int, resume: bool):
+    """小批量随机优化：复习记录先写入磁盘上的题目序列文件，再按批流式读取"""
+    from .optimizer import FSRSOptimizer, spool_cards, flatten_reviews
+
+    storage = cli_obj.storage_manager
+    card_file = str(storage.optimizer_cards_file)
+    checkpoint_file = str(storage.optimizer_checkpoint_file)
+
+    if resume and os.path.exists(checkpoint_file) and os.path.exists(card_file):
+        click.echo("🔄 从检查点继续随机优化...")
+    else:
+        resume = False
+        reviews = storage.load_reviews()
+        if not reviews:
+            click.echo("❌ 没有复习记录，无法进行优化")
+            return
+        card_count = spool_cards(flatten_reviews(reviews), card_file)
+        del reviews
+        click.echo(f"🔄 已准备 {card_count} 道题目的复习序列，开始随机优化...")
+
+    optimizer = FSRSOptimizer(cli_obj.fsrs)
+    try:
+        new_w, loss = optimizer.optimize_stochastic(
+            card_file, batch_size=batch_size, epochs=epochs,
+            checkpoint_path=checkpoint_file, resume=resume
+        )
+    except ValueError as e:
+        click.echo(f"❌ {e}")
+        click.echo("👉 请去掉 --resume 重新开始随机优化")
+        return
+    except Exception as e:
+        click.echo(f"❌ 优化失败: {e}")
+        click.echo("👉 可使用 --resume 从检查点继续")
+        return
+
+    _confirm_new_weights(cli_obj, new_w, loss)
+
+
+def _parse_grid_values(ctx, param, value):
+    """解析逗号分隔的网格取值"""
+    if value is None:
+        return None
+    try:
+        return [float(x) if '.' in x else int(x) for x in (v.strip() for v in value.split(',')) if x]
+    except ValueError:
+        raise click.BadParameter("必须是逗号分隔的数字")
+
+
+@config.command(name="tune")
+@click.option('--easy-bonus', callback=_parse_grid_values, help='easy_bonus 候选值 (逗号分隔)')
+@click.option('--hard-factor', callback=_parse_grid_values, help='hard_factor 候选值 (逗号分隔)')
+@click.option('--maximum-interval', callback=_parse_grid_values, help='maximum_interval 候选值 (逗号分隔)')
+@click.option('--workload-weight', default=1.0, type=float, help='复习负担在得分中的权重')
+@click.option('--workers', default=None, type=int, help='并行回放的进程数 (默认CPU核数)')
+@click.option('--no-cache', is_flag=True, help='忽略缓存重新计算')
+def config_tune(easy_bonus, hard_factor, maximum_interval, workload_weight, workers, no_cache):
+    """网格搜索调度超参数 (easy_bonus/hard_factor/maximum_interval)"""
+    from .optimizer import flatten_reviews
+    from .tuning import tune_hyperparameters, DEFAULT_GRID
+
+    cli_obj = LeetCodeFSRSCLI()
+    storage = cli_obj.storage_manager
+    flat_reviews = flatten_reviews(storage.load_reviews())
+    if not flat_reviews:
+        click.echo("❌ 没有复习记录，无法进行调优")
+        return
+
+    grid = {
+        "easy_bonus": easy_bonus or DEFAULT_GRID["easy_bonus"],
+        "hard_factor": hard_factor or DEFAULT_GRID["hard_factor"],
+        "maximum_interval": maximum_interval or DEFAULT_GRID["maximum_interval"]
+    }
+    combinations = len(grid["easy_bonus"]) * len(grid["hard_factor"]) * len(grid["maximum_interval"])
+    click.echo(f"🔄 正在回放 {len(flat_reviews)} 条复习记录，共 {combinations} 个参数组合...")
+
+    report = tune_hyperparameters(
+        flat_reviews, cli_obj.fsrs.params, grid, workload_weight=workload_weight,
+        workers=workers, cache_path=None if no_cache else str(storage.tune_cache_file)
+    )
+    if report["cached"]:
+        click.echo("⚡ 数据未变化，使用缓存结果")
+
+    click.echo(f"\n{'easy_bonus':>11}{'hard_factor':>12}{'max_interval':>13}{'留存率':>9}{'负担':>9}{'得分':>9}")
+    click.echo("-" * 65)
+    for result in report["results"][:10]:
+        p = result["params"]
+        click.echo(f"{p['easy_bonus']:>11}{p['hard_factor']:>12}{p['maximum_interval']:>13}"
+                   f"{result['retention']:>10.3f}{result['workload']:>10.4f}{result['score']:>10.4f}")
+
+    best = report["results"][0]["params"]
+    click.echo(f"\n🏆 最佳组合: {best}")
+    if click.confirm("是否应用最佳组合?"):
+        config_data = storage.load_config()
+        config_data.setdefault("fsrs_params", {}).update(best)
+        storage.save_config(config_data)
+        click.echo("✅ 配置已更新")
+    else:
+        click.echo("已取消应用")
+
+
+@cli.command(name="eval")
+@click.option('--folds', default=5, type=int, help='时间序列交叉验证的折数')
+@click.option('--workers', default=None, type=int, help='并行评估的进程数 (默认CPU核数)')
+@click.option('--no-optimize', is_flag=True, help='不在训练段上拟合新权重')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='导出评估结果到JSON文件')
+def evaluate(folds, workers, no_optimize, output):
+    """评估FSRS参数 (时间序列交叉验证)"""
+    from .evaluation import evaluate_parameters
+    from .optimizer import HAS_SCIPY, flatten_reviews
+
+    cli_obj = LeetCodeFSRSCLI()
+    flat_reviews = flatten_reviews(cli_obj.storage_manager.load_reviews())
+
+    if len(flat_reviews) < (folds + 1) * 2:
+        click.echo(f"❌ 复习记录太少 ({len(flat_reviews)} 条)，无法进行 {folds} 折评估")
+        return
+
+    weight_sets = {
+        "default": FSRS.get_default_params()["w"],
+        "current": cli_obj.fsrs.params["w"]
+    }
+    optimize_from = None
+    if not no_optimize:
+        if HAS_SCIPY:
+            optimize_from = cli_obj.fsrs.params["w"]
+        else:
+            click.echo("⚠️ 未安装 scipy，跳过优化权重的评估")
+
+    click.echo(f"🔄 正在进行 {folds} 折时间序列交叉验证 ({len(flat_reviews)} 条复习)...")
+    report = evaluate_parameters(flat_reviews, weight_sets, folds=folds,
+                                 optimize_from=optimize_from, workers=workers)
+
+    labels = {"default": "默认", "current": "当前", "optimized": "优化"}
+    names = [n for n in report["metrics"]]
+
+    click.echo("\n📊 样本外评估结果")
+    click.echo("=" * 50)
+    click.echo(f"{'指标':<12}" + "".join(f"{labels[n]:>12}" for n in names))
+    for key, title in (("log_loss", "Log Loss"), ("rmse_bins", "RMSE(bins)")):
+        # 测试段没有可评分的复习 (如全部是首次复习) 时指标为 None
+        click.echo(f"{title:<12}" + "".join(
+            f"{'-':>12}" if report['metrics'][n][key] is None else f"{report['metrics'][n][key]:>12.4f}"
+            for n in names
+        ))
+    click.echo(f"{'样本数':<12}" + "".join(f"{report['metrics'][n]['count']:>12}" for n in names))
+
+    click.echo("\n📐 校准表 (预测留存率 / 实际留存率)")
+    click.echo("-" * 50)
+    rows = {}
+    for n in names:
+        for row in report["metrics"][n]["calibration"]:
+            rows.setdefault(tuple(row["range"]), {})[n] = row
+    for (low, high), by_name in sorted(rows.items()):
+        cells = "".join(
+            f"{by_name[n]['predicted']:>7.2f}/{by_name[n]['actual']:.2f}" if n in by_name else f"{'-':>12}"
+            for n in names
+        )
+        count = max(r["count"] for r in by_name.values())
+        click.echo(f"{low:.1f}-{high:.1f} (n={count:<5})" + cells)
+    click.echo("=" * 50)
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        click.echo(f"💾 评估结果已导出到 {output}")
+
+
 # ==================== 认证命令组 ====================
 
 @cli.group()
@@ -572,10 +1113,23 @@ def status():
 
 @cli.command()
 @click.option('--full', is_flag=True, help='执行完整重新同步')
-def sync(full):
+@click.option('--catalog', is_flag=True, help='一次导入完整题库的元数据 (无需登录，描述在首次查看时获取)')
+@click.option('--concurrency', default=8, type=click.IntRange(1, 32), help='同时获取题目详情的请求数')
+def sync(full, catalog, concurrency):
     """同步LeetCode题目"""
     auth_manager = AuthManager()
     sync_manager = SyncManager()
+
+    if catalog:
+        report = sync_manager.perform_catalog_sync()
+        if report.status == "success":
+            sync_manager.display_sync_summary(
+                report.new_count, report.updated_count, report.unchanged_count, report.total_count
+            )
+            click.echo("✅ 题库导入完成！")
+        else:
+            click.echo("❌ 获取题库失败，请检查网络")
+        return
     
     # 检查认证状态
     auth_info = auth_manager.get_auth_info()
@@ -585,7 +1139,7 @@ def sync(full):
     
     click.echo("\n🔄 正在从LeetCode同步题目...")
     
-    report = sync_manager.perform_sync(full_sync=full)
+    report = sync_manager.perform_sync(full_sync=full, concurrency=concurrency)
     
     if report.status == "success":
         sync_manager.display_sync_summary(
@@ -0,0 +1,213 @@
+"""
+FSRS 参数评估
+按时间顺序切分复习记录做交叉验证，比较不同权重的样本外预测效果
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Tuple, Optional
+
+from .fsrs import FSRS
+from .optimizer import (
+    FSRSOptimizer, HAS_SCIPY, pad_weights, parse_timestamp, _replay_card, _elapsed_days
+)
+
+# 校准表的留存率分箱数
+CALIBRATION_BINS = 10
+
+
+def _assign_chunks(reviews: List[Dict], n_chunks: int) -> Dict[int, List[Tuple[datetime, int, int]]]:
+    """
+    按时间顺序把复习记录均分为 n_chunks 段，并按题目分组
+
+    Returns:
+        Dict[int, List[Tuple[datetime, int, int]]]: question_id -> [(时间, 评分, 段号), ...]
+    """
+    ordered = sorted(
+        ((parse_timestamp(r["timestamp"]), r["question_id"], r["rating"]) for r in reviews),
+        key=lambda x: x[0]
+    )
+    n = len(ordered)
+    cards: Dict[int, List[Tuple[datetime, int, int]]] = {}
+    for i, (t, qid, rating) in enumerate(ordered):
+        cards.setdefault(qid, []).append((t, rating, i * n_chunks // n))
+    return cards
+
+
+def _fold_data(cards: Dict[int, List[Tuple[datetime, int, int]]], fold: int):
+    """
+    构造第 fold 折的数据：段号小于 fold 的记录用于训练，等于 fold 的记录用于测试
+
+    Returns:
+        Tuple[List[Dict], List[Tuple[List[int], List[float], int]]]:
+            (训练记录, 测试题目 (评分, 间隔, 首个测试记录下标))
+    """
+    train_reviews = []
+    test_cards = []
+    for qid, entries in cards.items():
+        history = [e for e in entries if e[2] <= fold]
+        for t, rating, chunk in history:
+            if chunk < fold:
+                train_reviews.append({"question_id": qid, "timestamp": t, "rating": rating})
+
+        # 第一条记录只用于初始化状态，不参与预测
+        first_test = next((i for i, e in enumerate(history) if e[2] == fold), None)
+        if first_test is None:
+            continue
+        first_test = max(1, first_test)
+        if first_test >= len(history):
+            continue
+        ratings = [rating for _, rating, _ in history]
+        elapsed = _elapsed_days([t for t, _, _ in history])
+        test_cards.append((ratings, elapsed, first_test))
+
+    return train_reviews, test_cards
+
+
+def _predict(w: List[float], test_cards) -> Tuple[List[float], List[int]]:
+    """返回测试记录的预测留存率和实际结果 (1=记住, 0=忘记)"""
+    predictions = []
+    labels = []
+    for ratings, elapsed, first_test in test_cards:
+        card_predictions = []
+        _replay_card(w, ratings, elapsed, predictions=card_predictions)
+        # card_predictions[i - 1] 对应第 i 条记录
+        predictions.extend(card_predictions[first_test - 1:])
+        labels.extend(0 if r == 1 else 1 for r in ratings[first_test:])
+    return predictions, labels
+
+
+def _evaluate_fold(
+    fold: int,
+    train_reviews: List[Dict],
+    test_cards,
+    weight_sets: Dict[str, List[float]],
+    fit_from: Optional[List[float]]
+) -> Dict:
+    """评估单折：可选地在训练段上拟合权重，再对所有权重组在测试段上预测"""
+    weight_sets = dict(weight_sets)
+    if fit_from is not None and train_reviews:
+        optimizer = FSRSOptimizer(FSRS({"w": fit_from}))
+        weight_sets["optimized"], _ = optimizer.optimize(train_reviews)
+
+    return {
+        "fold": fold,
+        "train_size": len(train_reviews),
+        "predictions": {name: _predict(w, test_cards) for name, w in weight_sets.items()}
+    }
+
+
+def compute_metrics(predictions: List[float], labels: List[int], bins: int = CALIBRATION_BINS) -> Dict:
+    """
+    计算 Log Loss、分箱 RMSE 和校准表
+
+    Args:
+        predictions: 预测留存率
+        labels: 实际结果 (1=记住, 0=忘记)
+        bins: 留存率分箱数
+
+    Returns:
+        Dict: 评估指标
+    """
+    count = len(predictions)
+    if count == 0:
+        return {"count": 0, "log_loss": None, "rmse_bins": None, "calibration": []}
+
+    log_loss = -sum(
+        math.log(p) if y else math.log(1 - p)
+        for p, y in zip(predictions, labels)
+    ) / count
+
+    bin_count = [0] * bins
+    bin_pred = [0.0] * bins
+    bin_actual = [0.0] * bins
+    for p, y in zip(predictions, labels):
+        b = min(bins - 1, int(p * bins))
+        bin_count[b] += 1
+        bin_pred[b] += p
+        bin_actual[b] += y
+
+    calibration = []
+    squared_error = 0.0
+    for b in range(bins):
+        if not bin_count[b]:
+            continue
+        mean_pred = bin_pred[b] / bin_count[b]
+        mean_actual = bin_actual[b] / bin_count[b]
+        squared_error += bin_count[b] * (mean_pred - mean_actual) ** 2
+        calibration.append({
+            "range": [b / bins, (b + 1) / bins],
+            "count": bin_count[b],
+            "predicted": mean_pred,
+            "actual": mean_actual
+        })
+
+    return {
+        "count": count,
+        "log_loss": log_loss,
+        "rmse_bins": math.sqrt(squared_error / count),
+        "calibration": calibration
+    }
+
+
+def evaluate_parameters(
+    reviews: List[Dict],
+    weight_sets: Dict[str, List[float]],
+    folds: int = 5,
+    optimize_from: Optional[List[float]] = None,
+    workers: Optional[int] = None
+) -> Dict:
+    """
+    时间序列交叉验证
+
+    复习记录按时间均分为 folds + 1 段，第 k 折使用前 k 段训练、第 k + 1 段
+    测试 (扩展窗口)，保证只用过去预测未来。各折在进程池中并行评估。
+
+    Args:
+        reviews: 复习记录列表 (扁平化)
+        weight_sets: 待比较的权重组，名称 -> 权重
+        folds: 折数
+        optimize_from: 若提供且安装了 scipy，每折从该权重出发在训练段上拟合 "optimized" 权重组
+        workers: 进程池大小，None 表示使用 CPU 核数
+
+    Returns:
+        Dict: 评估报告 (可直接导出为 JSON)
+    """
+    if not reviews:
+        raise ValueError("没有复习记录可供评估")
+
+    weight_sets = {name: pad_weights(w) for name, w in weight_sets.items()}
+    fit_from = pad_weights(optimize_from) if optimize_from is not None and HAS_SCIPY else None
+
+    cards = _assign_chunks(reviews, folds + 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for fold in range(1, folds + 1):
+            train_reviews, test_cards = _fold_data(cards, fold)
+            futures.append(pool.submit(_evaluate_fold, fold, train_reviews, test_cards, weight_sets, fit_from))
+        fold_results = [f.result() for f in futures]
+
+    names = list(weight_sets) + (["optimized"] if fit_from is not None else [])
+    pooled = {name: ([], []) for name in names}
+    per_fold = []
+    for result in fold_results:
+        fold_metrics = {"fold": result["fold"], "train_size": result["train_size"]}
+        for name, (predictions, labels) in result["predictions"].items():
+            pooled[name][0].extend(predictions)
+            pooled[name][1].extend(labels)
+            metrics = compute_metrics(predictions, labels)
+            fold_metrics[name] = {"log_loss": metrics["log_loss"], "rmse_bins": metrics["rmse_bins"],
+                                  "count": metrics["count"]}
+        per_fold.append(fold_metrics)
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "n_reviews": len(reviews),
+        "n_cards": len(cards),
+        "folds": folds,
+        "weights": {name: w for name, w in weight_sets.items()},
+        "metrics": {name: compute_metrics(*pooled[name]) for name in names},
+        "per_fold": per_fold
+    }
@@ -5,7 +5,7 @@ FSRS (Free Spaced Repetition Scheduler) 算法实现
 
 import math
 from datetime import datetime, timedelta
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Optional
 
 
 class FSRS:
@@ -21,6 +21,8 @@ class FSRS:
         self.params = self.get_default_params()
         if params:
             self.params.update(params)
+        # 可选的负载均衡器 (load_balance.LoadBalancer)，设置后在理想间隔附近选择负载最低的日期
+        self.load_balancer = None
 
     @staticmethod
     def get_default_params() -> dict:
@@ -106,7 +108,8 @@ class FSRS:
         stability: float,
         difficulty: float,
         rating: int,
-        last_review: datetime
+        last_review: datetime,
+        question_id: Optional[int] = None
     ) -> Tuple[datetime, float, float]:
         """
         计算下一次复习时间
@@ -117,6 +120,7 @@ class FSRS:
             difficulty: 当前题目难度
             rating: 用户评分 (1-5)
             last_review: 上次复习时间
+            question_id: 题目ID，设置了负载均衡器时用于更新按天到期索引
 
         Returns:
             Tuple[next_review_time, new_stability, new_difficulty]
@@ -127,7 +131,12 @@ class FSRS:
             stability, difficulty, rating, elapsed_days
         )
 
-        next_review = current_time + timedelta(days=new_interval)
+        if self.load_balancer is not None:
+            next_review = self.load_balancer.schedule(
+                question_id, current_time, new_interval, self.params["maximum_interval"]
+            )
+        else:
+            next_review = current_time + timedelta(days=new_interval)
 
         return next_review, new_stability, new_difficulty
 
@@ -136,6 +145,65 @@ class FSRS:
         return 2.5, 5.0  # 初始稳定性，初始难度
 
 
+class FSRSParamGroups:
+    """
+    按标签/难度分组的 FSRS 参数
+
+    组键形如 "tag:dynamic-programming" 或 "difficulty:hard"，组内只覆盖权重 w，
+    其余参数与全局一致。题目按自身标签顺序、再按难度查找所属组，找不到时
+    回退到全局参数。每个组的 FSRS 实例只创建一次。
+    """
+
+    def __init__(self, params: dict = None, groups: Optional[Dict[str, List[float]]] = None):
+        self.params = params or {}
+        self.groups = groups or {}
+        self.default = FSRS(self.params)
+        self._instances: Dict[str, FSRS] = {}
+
+    @staticmethod
+    def group_keys(tags: List[str], difficulty: str, by: Optional[str] = None) -> List[str]:
+        """
+        题目可能所属的组键 (按匹配优先级排序)
+
+        Args:
+            tags: 题目标签
+            difficulty: 题目难度
+            by: 只返回指定维度 ("tag" 或 "difficulty")，None 表示全部
+        """
+        keys = []
+        if by in (None, "tag"):
+            keys.extend(f"tag:{tag}" for tag in tags)
+        if by in (None, "difficulty") and difficulty:
+            keys.append(f"difficulty:{difficulty.lower()}")
+        return keys
+
+    def resolve(self, tags: List[str], difficulty: str) -> Optional[str]:
+        """返回题目所属的组键，没有匹配的组时返回 None"""
+        for key in self.group_keys(tags, difficulty):
+            if key in self.groups:
+                return key
+        return None
+
+    def for_question(self, question) -> FSRS:
+        """获取题目对应的 FSRS 实例"""
+        key = self.resolve(question.tags, question.difficulty)
+        if key is None:
+            return self.default
+
+        fsrs = self._instances.get(key)
+        if fsrs is None:
+            fsrs = FSRS(dict(self.params, w=self.groups[key]))
+            fsrs.load_balancer = self.default.load_balancer
+            self._instances[key] = fsrs
+        return fsrs
+
+    def set_load_balancer(self, load_balancer):
+        """为全局和所有分组的 FSRS 实例设置同一个负载均衡器"""
+        self.default.load_balancer = load_balancer
+        for fsrs in self._instances.values():
+            fsrs.load_balancer = load_balancer
+
+
 class ReviewRecord:
     """复习记录类"""
 
@@ -151,7 +219,8 @@ class ReviewRecord:
         self,
         timestamp: datetime,
         rating: int,
-        fsrs: FSRS
+        fsrs: FSRS,
+        duration: Optional[float] = None
     ):
         """
         添加复习记录
@@ -160,11 +229,12 @@ class ReviewRecord:
             timestamp: 复习时间
             rating: 用户评分 (1-5)
             fsrs: FSRS算法实例
+            duration: 本次复习用时 (秒)，None 表示未记录
         """
         last_review = self.review_history[-1]["timestamp"] if self.review_history else timestamp
 
         next_review, new_stability, new_difficulty = fsrs.calculate_next_review(
-            timestamp, self.stability, self.difficulty, rating, last_review
+            timestamp, self.stability, self.difficulty, rating, last_review, self.question_id
         )
 
         review_data = {
@@ -174,6 +244,8 @@ class ReviewRecord:
             "difficulty": self.difficulty,
             "interval": (next_review - timestamp).days
         }
+        if duration is not None:
+            review_data["duration"] = round(duration, 1)
 
         self.review_history.append(review_data)
         self.stability = new_stability
@@ -186,13 +258,16 @@ class ReviewRecord:
         return {
             "question_id": self.question_id,
             "review_history": [
-                {
-                    "timestamp": review["timestamp"].isoformat(),
-                    "rating": review["rating"],
-                    "stability": review["stability"],
-                    "difficulty": review["difficulty"],
-                    "interval": review["interval"]
-                }
+                dict(
+                    {
+                        "timestamp": review["timestamp"].isoformat(),
+                        "rating": review["rating"],
+                        "stability": review["stability"],
+                        "difficulty": review["difficulty"],
+                        "interval": review["interval"]
+                    },
+                    **({"duration": review["duration"]} if "duration" in review else {})
+                )
                 for review in self.review_history
             ],
             "stability": self.stability,
@@ -206,13 +281,16 @@ class ReviewRecord:
         """从字典创建实例"""
         record = cls(data["question_id"])
         record.review_history = [
-            {
-                "timestamp": datetime.fromisoformat(review["timestamp"]),
-                "rating": review["rating"],
-                "stability": review["stability"],
-                "difficulty": review["difficulty"],
-                "interval": review["interval"]
-            }
+            dict(
+                {
+                    "timestamp": datetime.fromisoformat(review["timestamp"]),
+                    "rating": review["rating"],
+                    "stability": review["stability"],
+                    "difficulty": review["difficulty"],
+                    "interval": review["interval"]
+                },
+                **({"duration": review["duration"]} if "duration" in review else {})
+            )
             for review in data["review_history"]
         ]
         record.stability = data["stability"]
@@ -0,0 +1,112 @@
+"""
+题目模糊搜索索引
+对标题和 slug 建立三元组 (trigram) 倒排索引，容忍拼写错误
+"""
+
+import math
+import re
+from typing import Dict, List, Set, Tuple
+
+# 返回结果的最低相似度 (查询三元组被命中的比例)
+FUZZY_MIN_SIMILARITY = 0.5
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    计算文本的三元组集合
+
+    每个单词前补两个空格、后补一个空格 (与 pg_trgm 相同)，
+    这样短词和词首也能产生三元组。
+    """
+    grams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def _question_trigrams(question) -> Set[str]:
+    return trigrams(f"{question.title} {question.slug.replace('-', ' ')}")
+
+
+class TrigramIndex:
+    """三元组倒排索引，支持增量添加/删除题目"""
+
+    def __init__(self):
+        # 三元组 -> 题目ID集合
+        self.postings: Dict[str, Set[int]] = {}
+        # 题目ID -> 三元组数量
+        self.sizes: Dict[int, int] = {}
+
+    @classmethod
+    def build(cls, questions) -> "TrigramIndex":
+        """为一组题目建立索引"""
+        index = cls()
+        for question in questions:
+            index.add(question)
+        return index
+
+    def add(self, question):
+        """添加题目 (已存在时先删除旧内容)"""
+        if question.id in self.sizes:
+            self.remove(question)
+        grams = _question_trigrams(question)
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(question.id)
+        self.sizes[question.id] = len(grams)
+
+    def remove(self, question):
+        """删除题目，question 需与添加时的内容一致"""
+        if self.sizes.pop(question.id, None) is None:
+            return
+        for gram in _question_trigrams(question):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(question.id)
+                if not ids:
+                    del self.postings[gram]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        min_similarity: float = FUZZY_MIN_SIMILARITY
+    ) -> List[Tuple[int, float]]:
+        """
+        模糊搜索
+
+        只统计与查询共享三元组的题目 (通过倒排表计数，不与每道题逐一比较)，
+        共享数不足 min_similarity 的候选直接剪枝。得分为查询三元组的命中比例，
+        相同时按 Jaccard 相似度 (偏向更短、更贴合的标题) 排序。
+
+        Args:
+            query: 查询文本
+            limit: 返回数量
+            min_similarity: 最低命中比例
+
+        Returns:
+            List[Tuple[int, float]]: 按相似度降序的 (题目ID, 命中比例)
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for qid in self.postings.get(gram, ()):
+                shared[qid] = shared.get(qid, 0) + 1
+
+        needed = math.ceil(min_similarity * len(query_grams))
+        results = []
+        for qid, count in shared.items():
+            if count < needed:
+                continue
+            coverage = count / len(query_grams)
+            jaccard = count / (len(query_grams) + self.sizes[qid] - count)
+            results.append((coverage, jaccard, qid))
+
+        results.sort(key=lambda r: (-r[0], -r[1], r[2]))
+        return [(qid, coverage) for coverage, _, qid in results[:limit]]
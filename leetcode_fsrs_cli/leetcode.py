@@ -5,45 +5,185 @@ LeetCode题目管理模块
 
 import json
 import os
-from typing import List, Dict, Optional
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from .plan_cache import bump_generation
+from .search_index import SearchIndex, slug_from_url, slugify
+from .fuzzy_index import TrigramIndex
+from .render import RenderCache
+
+
+def bitset_ids(bits: int) -> List[int]:
+    """按升序列出位图中的题目ID"""
+    # 反转后的二进制串第 i 个字符对应第 i 位，一次线性扫描即可
+    return [i for i, bit in enumerate(bin(bits)[:1:-1]) if bit == "1"]
+
+
+# 流式导入时每导入多少题写入一次题库文件
+IMPORT_CHUNK_SIZE = 500
+
+# 规范题目链接的格式，符合该格式的链接只保存 slug
+PROBLEM_URL_TEMPLATE = "https://leetcode.com/problems/{slug}/"
+
+
+class TagTable:
+    """
+    所有题目共享的标签表
+
+    题目只保存标签ID元组，同名标签在内存中只有一份字符串。
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, name: str) -> int:
+        """返回标签ID，新标签追加到表中"""
+        tag_id = self.ids.get(name)
+        if tag_id is None:
+            with self._lock:
+                tag_id = self.ids.get(name)
+                if tag_id is None:
+                    tag_id = len(self.names)
+                    self.names.append(sys.intern(name))
+                    self.ids[self.names[tag_id]] = tag_id
+        return tag_id
+
+
+TAG_TABLE = TagTable()
+
 
-@dataclass
 class Question:
-    """LeetCode题目数据结构"""
-    id: int
-    title: str
-    difficulty: str  # "easy", "medium", "hard"
-    tags: List[str]
-    url: str
-    content: str = ""
+    """
+    LeetCode题目数据结构
+
+    使用 __slots__ 存储: 标签保存为共享标签表中的ID，规范格式的链接只保存 slug，
+    tags 和 url 在访问时生成。needs_detail 表示题目来自题库列表，描述和标签
+    尚未获取 (在首次显示时获取)。
+    """
+
+    __slots__ = ("id", "title", "difficulty", "content", "slug", "needs_detail", "_tag_ids", "_url")
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        difficulty: str,  # "easy", "medium", "hard"
+        tags: List[str],
+        url: str,
+        content: str = "",
+        slug: Optional[str] = None,
+        needs_detail: bool = False
+    ):
+        self.id = id
+        self.title = title
+        self.difficulty = sys.intern(difficulty) if isinstance(difficulty, str) else difficulty
+        self.tags = tags
+        self.url = url
+        self.content = content
+        self.needs_detail = needs_detail
+        if slug:
+            # 只给出 slug 时链接按规范格式生成
+            if not url:
+                self._url = None
+            self.slug = slug
+
+    @property
+    def tags(self) -> List[str]:
+        """标签名列表 (每次访问生成新列表)"""
+        names = TAG_TABLE.names
+        return [names[tag_id] for tag_id in self._tag_ids]
+
+    @tags.setter
+    def tags(self, tags: List[str]):
+        self._tag_ids = tuple(TAG_TABLE.intern(tag) for tag in tags)
+
+    @property
+    def url(self) -> str:
+        """题目链接"""
+        if self._url is not None:
+            return self._url
+        return PROBLEM_URL_TEMPLATE.format(slug=self.slug)
+
+    @url.setter
+    def url(self, url: str):
+        # 非规范格式的链接 (如测试数据或其他站点) 原样保存
+        slug = slug_from_url(url)
+        self.slug = slug
+        if slug and url == PROBLEM_URL_TEMPLATE.format(slug=slug):
+            self._url = None
+        else:
+            self._url = url
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.id, self.title, self.difficulty, self._tag_ids, self.slug, self.url, self.content,
+             self.needs_detail)
+            == (other.id, other.title, other.difficulty, other._tag_ids, other.slug, other.url, other.content,
+                other.needs_detail)
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Question(id={self.id!r}, title={self.title!r}, difficulty={self.difficulty!r}, "
+            f"tags={self.tags!r}, url={self.url!r}, content={self.content!r}, slug={self.slug!r})"
+        )
 
     def to_dict(self) -> dict:
         """转换为字典格式"""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "difficulty": self.difficulty,
-            "tags": self.tags,
-            "url": self.url,
-            "content": self.content
-        }
+        return dict(
+            {
+                "id": self.id,
+                "title": self.title,
+                "difficulty": self.difficulty,
+                "tags": self.tags,
+                "url": self.url,
+                "content": self.content,
+                "slug": self.slug
+            },
+            **({"needs_detail": True} if self.needs_detail else {})
+        )
 
     @classmethod
     def from_dict(cls, data: dict):
-        """从字典创建实例"""
+        """从字典创建实例 (旧数据没有 slug 字段时从链接中提取)"""
         return cls(
             id=data["id"],
             title=data["title"],
             difficulty=data["difficulty"],
             tags=data["tags"],
-            url=data["url"],
-            content=data.get("content", "")
+            url=data.get("url", ""),
+            content=data.get("content", ""),
+            slug=data.get("slug"),
+            needs_detail=data.get("needs_detail", False)
         )
 
 
+@dataclass
+class TransferStats:
+    """导入/导出统计"""
+    count: int = 0  # 导入/导出的题目数
+    skipped: int = 0  # 已存在而跳过的题目数
+    failed: int = 0  # 无法解析的记录数
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """每秒处理的题目数"""
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+
 class QuestionManager:
     """题目管理器"""
 
@@ -57,7 +197,24 @@ class QuestionManager:
             self.data_dir = Path(data_dir)
 
         self.questions_file = self.data_dir / "questions.json"
+        self.search_index_file = self.data_dir / "search_index.json"
+        self.slug_index_file = self.data_dir / "slug_index.json"
+        # slug -> 题目ID，随增删题目维护并与题库一起保存
+        self.slug_index: Dict[str, int] = {}
+        # 全文搜索索引，首次搜索时加载或重建，之后随增删题目增量更新
+        self._search_index: Optional[SearchIndex] = None
+        # 标题/slug 的三元组索引，首次模糊搜索时在内存中建立
+        self._fuzzy_index: Optional[TrigramIndex] = None
+        # 题目描述的终端渲染结果，添加题目时写入
+        self.render_cache = RenderCache(self.data_dir)
         self.questions: Dict[int, Question] = {}
+        # batch() 嵌套层数，大于 0 时推迟写入题库文件
+        self._batch_depth = 0
+        self._batch_dirty = False
+        # 二级索引: 标签/难度 -> 题目ID位图 (第 id 位为 1 表示包含该题)，随增删题目同步维护
+        self.tag_bits: Dict[str, int] = {}
+        self.difficulty_bits: Dict[str, int] = {}
+        self.all_bits = 0
         self._ensure_data_dir()
         self._load_questions()
 
@@ -67,6 +224,7 @@ class QuestionManager:
 
     def _load_questions(self):
         """从文件加载题目数据"""
+        migrate = False
         if os.path.exists(self.questions_file):
             try:
                 with open(self.questions_file, 'r', encoding='utf-8') as f:
@@ -75,18 +233,139 @@ class QuestionManager:
                         int(qid): Question.from_dict(q_data)
                         for qid, q_data in data.items()
                     }
+                    # 旧版本的题库没有 slug 字段
+                    migrate = any("slug" not in q_data for q_data in data.values())
             except (json.JSONDecodeError, KeyError) as e:
                 print(f"加载题目数据失败: {e}")
                 self.questions = {}
 
+        self.tag_bits = {}
+        self.difficulty_bits = {}
+        self.all_bits = 0
+        for question in self.questions.values():
+            self._index_question(question)
+
+        if migrate:
+            self.slug_index = self._build_slug_index()
+            self._save_questions()
+        else:
+            self.slug_index = self._load_slug_index()
+            if self.slug_index is None:
+                self.slug_index = self._build_slug_index()
+                if self.questions:
+                    self._save_slug_index()
+
+    def _build_slug_index(self) -> Dict[str, int]:
+        return {question.slug: qid for qid, question in self.questions.items() if question.slug}
+
+    def _load_slug_index(self) -> Optional[Dict[str, int]]:
+        """加载 slug 索引，文件不存在或与题库签名不一致时返回 None"""
+        if not os.path.exists(self.slug_index_file):
+            return None
+        try:
+            with open(self.slug_index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        if data.get("source") != self._source_signature():
+            return None
+        return data.get("slugs", {})
+
+    def _save_slug_index(self):
+        data = {"source": self._source_signature(), "slugs": self.slug_index}
+        tmp_path = f"{self.slug_index_file}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.slug_index_file)
+        except OSError as e:
+            print(f"保存 slug 索引失败: {e}")
+
+    def _index_question(self, question: Question):
+        """把题目加入标签和难度索引"""
+        bit = 1 << question.id
+        self.all_bits |= bit
+        for tag in question.tags:
+            self.tag_bits[tag] = self.tag_bits.get(tag, 0) | bit
+        self.difficulty_bits[question.difficulty] = self.difficulty_bits.get(question.difficulty, 0) | bit
+
+    def _unindex_question(self, question: Question):
+        """从标签和难度索引中移除题目"""
+        mask = ~(1 << question.id)
+        self.all_bits &= mask
+        for index, keys in ((self.tag_bits, question.tags), (self.difficulty_bits, [question.difficulty])):
+            for key in keys:
+                bits = index.get(key, 0) & mask
+                if bits:
+                    index[key] = bits
+                else:
+                    index.pop(key, None)
+
+    def _tags_bits(self, tags: List[str], match_all: bool = False) -> int:
+        """标签查询对应的位图 (match_all 为 True 时取交集，否则取并集)"""
+        if match_all:
+            bits = self.all_bits
+            for tag in tags:
+                bits &= self.tag_bits.get(tag, 0)
+                if not bits:
+                    break
+            return bits
+        bits = 0
+        for tag in tags:
+            bits |= self.tag_bits.get(tag, 0)
+        return bits
+
+    @contextmanager
+    def batch(self):
+        """批量修改: 期间的增删改只在退出时写入一次题库文件"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self._save_questions()
+
     def _save_questions(self):
         """保存题目数据到文件"""
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
         data = {
             str(qid): question.to_dict()
             for qid, question in self.questions.items()
         }
         with open(self.questions_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        bump_generation(self.data_dir)
+        self._save_slug_index()
+        if self._search_index is not None:
+            self._save_search_index()
+
+    def _source_signature(self) -> Optional[dict]:
+        """题库文件的签名，用于判断持久化的索引是否过期"""
+        try:
+            stat = os.stat(self.questions_file)
+        except OSError:
+            return None
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def _save_search_index(self):
+        try:
+            self._search_index.save(self.search_index_file, self._source_signature())
+        except OSError as e:
+            print(f"保存搜索索引失败: {e}")
+
+    def get_search_index(self) -> SearchIndex:
+        """获取全文搜索索引，持久化的索引过期时重建"""
+        if self._search_index is None:
+            self._search_index = SearchIndex.load(self.search_index_file, self._source_signature())
+            if self._search_index is None:
+                self._search_index = SearchIndex.build(self.questions.values())
+                if self.questions:
+                    self._save_search_index()
+        return self._search_index
 
     def add_question(self, question: Question) -> bool:
         """
@@ -98,13 +377,45 @@ class QuestionManager:
         Returns:
             bool: 是否成功添加
         """
+        if not self._insert_question(question):
+            return False
+        self._save_questions()
+        return True
+
+    def _insert_question(self, question: Question) -> bool:
+        """在内存中添加题目并更新索引和渲染缓存 (不写入题库文件)"""
         if question.id in self.questions:
             return False
 
         self.questions[question.id] = question
-        self._save_questions()
+        self._index_question(question)
+        if question.slug:
+            self.slug_index[question.slug] = question.id
+        if self._search_index is not None:
+            self._search_index.add(question)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(question)
+        if question.content:
+            self.render_cache.put(question.content)
         return True
 
+    def get_rendered_content(self, question: Question) -> str:
+        """
+        获取题目描述的终端纯文本
+
+        Args:
+            question: 题目对象
+
+        Returns:
+            str: 渲染后的题目描述 (缓存未命中时渲染并写入缓存)
+        """
+        if not question.content:
+            return ""
+        rendered = self.render_cache.get(question.content)
+        if rendered is None:
+            rendered = self.render_cache.put(question.content)
+        return rendered
+
     def get_question(self, question_id: int) -> Optional[Question]:
         """
         获取题目
@@ -130,55 +441,178 @@ class QuestionManager:
         if question_id not in self.questions:
             return False
 
-        del self.questions[question_id]
+        self._detach_question(question_id)
         self._save_questions()
         return True
 
+    def _detach_question(self, question_id: int) -> Question:
+        """在内存中移除题目并更新索引 (不写入题库文件)"""
+        question = self.questions.pop(question_id)
+        self._unindex_question(question)
+        if self.slug_index.get(question.slug) == question_id:
+            del self.slug_index[question.slug]
+        if self._search_index is not None:
+            self._search_index.remove(question)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.remove(question)
+        return question
+
+    def update_question(self, question: Question):
+        """
+        添加或替换同ID的题目
+
+        Args:
+            question: 题目对象
+        """
+        if question.id in self.questions:
+            self._detach_question(question.id)
+        self._insert_question(question)
+        self._save_questions()
+
+    def add_questions(self, questions) -> int:
+        """
+        批量添加题目，只写入一次题库文件
+
+        Args:
+            questions: 题目对象序列 (已存在的ID跳过)
+
+        Returns:
+            int: 成功添加的题目数量
+        """
+        added = sum(1 for question in questions if self._insert_question(question))
+        if added:
+            self._save_questions()
+        return added
+
     def list_questions(
         self,
         difficulty: Optional[str] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        match_all: bool = False
     ) -> List[Question]:
         """
         列出题目
 
+        难度和标签条件在位图索引上求交集，结果按位顺序读出，本身就是按题目ID排序的。
+
         Args:
             difficulty: 难度过滤
             tags: 标签过滤
+            match_all: True 表示必须带有全部标签，False 表示带有任一标签即可
 
         Returns:
-            List[Question]: 题目列表
+            List[Question]: 按题目ID排序的题目列表
         """
-        questions = list(self.questions.values())
+        if not tags and not difficulty:
+            return [self.questions[qid] for qid in sorted(self.questions)]
 
+        bits = self._tags_bits(tags, match_all) if tags else self.all_bits
         if difficulty:
-            questions = [q for q in questions if q.difficulty == difficulty]
+            bits &= self.difficulty_bits.get(difficulty, 0)
+        return [self.questions[qid] for qid in bitset_ids(bits)]
 
-        if tags:
-            questions = [
-                q for q in questions
-                if any(tag in q.tags for tag in tags)
-            ]
+    def get_ids_by_tags(self, tags: List[str], match_all: bool = False) -> List[int]:
+        """
+        查询带有指定标签的题目
 
-        return sorted(questions, key=lambda q: q.id)
+        Args:
+            tags: 标签列表
+            match_all: True 表示必须带有全部标签，False 表示带有任一标签即可
+
+        Returns:
+            List[int]: 升序的题目ID列表
+        """
+        return bitset_ids(self._tags_bits(tags, match_all))
 
-    def search_questions(self, keyword: str) -> List[Question]:
+    def search_questions(self, keyword: str, limit: Optional[int] = None) -> List[Question]:
         """
         搜索题目
 
+        在标题、标签、slug 和题目描述中全文搜索，按 BM25 相关度排序，
+        输入题号时该题排在最前。查询中有无法匹配的词 (可能拼错) 时，
+        标题/slug 的模糊匹配结果排在前面。
+
         Args:
             keyword: 搜索关键词
+            limit: 返回数量，None 表示全部
 
         Returns:
             List[Question]: 匹配的题目列表
         """
-        keyword = keyword.lower()
-        return [
-            q for q in self.questions.values()
-            if (keyword in q.title.lower() or
-                keyword in str(q.id) or
-                any(keyword in tag.lower() for tag in q.tags))
-        ]
+        index = self.get_search_index()
+        expansions = index.expand(keyword)
+        ids = [qid for qid, _ in index.search(keyword, limit, expansions)]
+
+        # 关键词正好是某题的 slug 时该题排在最前
+        slug_id = self.slug_index.get(keyword.strip().lower())
+        if slug_id is not None:
+            ids = [slug_id] + [qid for qid in ids if qid != slug_id]
+            if limit is not None:
+                ids = ids[:limit]
+
+        if not ids or index.unknown_tokens(keyword, expansions):
+            fuzzy_ids = [qid for qid, _ in self.fuzzy_search(keyword, limit or 20)]
+            seen = set(fuzzy_ids)
+            ids = fuzzy_ids + [qid for qid in ids if qid not in seen]
+            if limit is not None:
+                ids = ids[:limit]
+
+        return [self.questions[qid] for qid in ids if qid in self.questions]
+
+    def fuzzy_search(self, keyword: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        按标题和 slug 模糊搜索 (容忍拼写错误)
+
+        Args:
+            keyword: 搜索关键词
+            limit: 返回数量
+
+        Returns:
+            List[Tuple[int, float]]: 按相似度降序的 (题目ID, 相似度)
+        """
+        if self._fuzzy_index is None:
+            self._fuzzy_index = TrigramIndex.build(self.questions.values())
+        return self._fuzzy_index.search(keyword, limit)
+
+    def find_question(self, text: str) -> Optional[Question]:
+        """
+        按题号、slug 或完整标题 (不区分大小写) 查找题目
+
+        Args:
+            text: 题号、slug 或标题
+
+        Returns:
+            Optional[Question]: 题目对象，找不到时返回 None
+        """
+        text = text.strip()
+        if text.isdigit():
+            return self.questions.get(int(text))
+
+        lowered = text.lower()
+        question = self.get_question_by_slug(lowered)
+        if question is not None:
+            return question
+        # 标题通常与 slug 对应，对应不上时再逐题比较标题
+        question = self.get_question_by_slug(slugify(text))
+        if question is not None and question.title.lower() == lowered:
+            return question
+        for question in self.questions.values():
+            if question.title.lower() == lowered:
+                return question
+        return None
+
+    def get_question_by_slug(self, slug: str) -> Optional[Question]:
+        """
+        按 slug 获取题目
+
+        Args:
+            slug: 题目 slug (如 two-sum)
+
+        Returns:
+            Optional[Question]: 题目对象，如果不存在返回None
+        """
+        qid = self.slug_index.get(slug)
+        return self.questions.get(qid) if qid is not None else None
 
     def get_question_count_by_difficulty(self) -> Dict[str, int]:
         """
@@ -202,26 +636,79 @@ class QuestionManager:
         从文件导入题目
 
         Args:
-            file_path: 文件路径
+            file_path: 文件路径 (JSON 数组或 NDJSON)
 
         Returns:
             int: 成功导入的题目数量
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        return self.import_questions(file_path).count
 
-            imported_count = 0
-            for q_data in data:
-                question = Question.from_dict(q_data)
-                if self.add_question(question):
-                    imported_count += 1
+    def import_questions(self, file_path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> TransferStats:
+        """
+        流式导入题目
 
-            return imported_count
+        NDJSON 文件逐行解析，每导入 chunk_size 题写入一次题库文件，内存占用与文件大小无关；
+        JSON 数组文件 (旧格式) 整体读入后同样分块写入。已存在的题目跳过，无法解析的行计入 failed。
 
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+        Args:
+            file_path: 文件路径
+            chunk_size: 每次写入题库文件前导入的题目数
+
+        Returns:
+            TransferStats: 导入统计
+        """
+        stats = TransferStats()
+        started = time.perf_counter()
+        pending = 0
+        try:
+            for q_data in self._read_records(file_path, stats):
+                try:
+                    question = Question.from_dict(q_data)
+                except (KeyError, TypeError):
+                    stats.failed += 1
+                    continue
+                if not self._insert_question(question):
+                    stats.skipped += 1
+                    continue
+                stats.count += 1
+                pending += 1
+                if pending >= chunk_size:
+                    self._save_questions()
+                    pending = 0
+        except (OSError, json.JSONDecodeError) as e:
             print(f"导入题目失败: {e}")
-            return 0
+        finally:
+            if pending:
+                self._save_questions()
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    @staticmethod
+    def _read_records(file_path: str, stats: TransferStats) -> Iterator[dict]:
+        """逐条读取 JSON 数组或 NDJSON 文件中的记录"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            if first == "[":
+                f.seek(0)
+                yield from json.load(f)
+                return
+
+            f.seek(0)
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    stats.failed += 1
+                    continue
+                if isinstance(record, dict):
+                    yield record
+                else:
+                    stats.failed += 1
 
     def export_to_file(self, file_path: str) -> bool:
         """
@@ -233,14 +720,42 @@ class QuestionManager:
         Returns:
             bool: 是否成功导出
         """
+        return self.export_questions(file_path, "json") is not None
+
+    def export_questions(self, file_path: str, output_format: str = "ndjson") -> Optional[TransferStats]:
+        """
+        按题号顺序流式导出题目，逐题写入临时文件后替换目标文件
+
+        Args:
+            file_path: 文件路径
+            output_format: "ndjson" (每行一题) 或 "json" (数组)
+
+        Returns:
+            Optional[TransferStats]: 导出统计，失败时返回 None
+        """
+        stats = TransferStats()
+        started = time.perf_counter()
+        tmp_path = f"{file_path}.tmp"
         try:
-            data = [question.to_dict() for question in self.questions.values()]
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            return True
-        except Exception as e:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                if output_format == "json":
+                    f.write("[")
+                for qid in sorted(self.questions):
+                    record = self.questions[qid].to_dict()
+                    if output_format == "json":
+                        item = json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                        f.write(("," if stats.count else "") + "\n  " + item)
+                    else:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    stats.count += 1
+                if output_format == "json":
+                    f.write("\n]" if stats.count else "]")
+            os.replace(tmp_path, file_path)
+        except OSError as e:
             print(f"导出题目失败: {e}")
-            return False
+            return None
+        stats.seconds = time.perf_counter() - started
+        return stats
 
 
 # 预定义的一些示例题目
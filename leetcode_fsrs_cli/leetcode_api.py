@@ -12,19 +12,32 @@ LeetCode GraphQL API 客户端（基础实现）
 
 from typing import Optional, Dict, Any, List
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
 from pathlib import Path
 import click
 
-GRAPHQL_URL = "https://leetcode.com/graphql"
 BASE_URL = "https://leetcode.com"
+GRAPHQL_URL = f"{BASE_URL}/graphql"
+
+# stat_status_pairs 中 difficulty.level 对应的难度
+DIFFICULTY_LEVELS = {1: "easy", 2: "medium", 3: "hard"}
 
 
 class LeetCodeAPIClient:
-    def __init__(self, cookie: Optional[str] = None, timeout: int = 10):
+    def __init__(self, cookie: Optional[str] = None, timeout: int = 10, base_url: Optional[str] = None):
+        """
+        Args:
+            cookie: LeetCode Cookie
+            timeout: 请求超时 (秒)
+            base_url: 站点地址，默认读取环境变量 LEETCODE_BASE_URL，未设置时为 leetcode.com
+                (可指向镜像站或本地模拟服务器)
+        """
         self.session = requests.Session()
         self.timeout = timeout
+        self.base_url = (base_url or os.environ.get("LEETCODE_BASE_URL") or BASE_URL).rstrip("/")
+        self.graphql_url = f"{self.base_url}/graphql"
 
         if cookie:
             self._set_cookie_header(cookie)
@@ -32,11 +45,17 @@ class LeetCodeAPIClient:
         # 常用请求头
         self.session.headers.update({
             "User-Agent": "leetcode-fsrs-cli/1.0",
-            "Referer": "https://leetcode.com",
+            "Referer": self.base_url,
             "Content-Type": "application/json",
-            "Origin": "https://leetcode.com"
+            "Origin": self.base_url
         })
 
+    def configure_pool(self, size: int):
+        """按并发请求数设置连接池大小，使多个线程共用同一个 session 时复用连接"""
+        adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def _set_cookie_header(self, cookie: str):
         # 支持 `LEETCODE_SESSION=xxx` 或 完整 cookie 字符串
         cookie = cookie.strip()
@@ -60,7 +79,7 @@ class LeetCodeAPIClient:
     def _post_graphql(self, query: str, variables: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         payload = {"query": query, "variables": variables or {}}
         try:
-            response = self.session.post(GRAPHQL_URL, json=payload, timeout=self.timeout)
+            response = self.session.post(self.graphql_url, json=payload, timeout=self.timeout)
             if response.status_code != 200:
                 return None
             return response.json()
@@ -110,14 +129,12 @@ class LeetCodeAPIClient:
         """
         # 尝试使用 REST API 获取所有题目状态
         try:
-            url = "https://leetcode.com/api/problems/all/"
-            resp = self.session.get(url, timeout=self.timeout)
-            
-            if resp.status_code == 200:
-                data = resp.json()
+            pairs = self._get_all_problems()
+
+            if pairs is not None:
                 problems = []
                 
-                for item in data.get("stat_status_pairs", []):
+                for item in pairs:
                     if item.get("status") == "ac":
                         stat = item.get("stat", {})
                         problems.append({
@@ -170,6 +187,48 @@ class LeetCodeAPIClient:
             click.echo(f"❌ 获取用户题目失败: {e}")
             return []
 
+    def _get_all_problems(self) -> Optional[List[Dict[str, Any]]]:
+        """获取 /api/problems/all/ 的 stat_status_pairs (全部题目及当前用户的状态)，失败返回 None"""
+        resp = self.session.get(f"{self.base_url}/api/problems/all/", timeout=self.timeout)
+        if resp.status_code != 200:
+            return None
+        return resp.json().get("stat_status_pairs", [])
+
+    def get_problem_catalog(self) -> List[Dict[str, Any]]:
+        """
+        一次请求获取全部题目的元数据 (不含描述和标签)
+
+        Returns:
+            List[Dict[str, Any]]: 按题号排序，每项包含 id (前端题号), title, slug,
+                difficulty, paid_only, status (当前用户的状态，如 "ac"，未登录为 None)
+        """
+        try:
+            pairs = self._get_all_problems()
+        except Exception as e:
+            click.echo(f"❌ 获取题库失败: {e}")
+            return []
+        if pairs is None:
+            click.echo("❌ 获取题库失败")
+            return []
+
+        problems = []
+        for item in pairs:
+            stat = item.get("stat") or {}
+            slug = stat.get("question__title_slug")
+            qid = stat.get("frontend_question_id") or stat.get("question_id")
+            if not slug or not str(qid or "").isdigit():
+                continue
+            problems.append({
+                "id": int(qid),
+                "title": stat.get("question__title") or slug,
+                "slug": slug,
+                "difficulty": DIFFICULTY_LEVELS.get((item.get("difficulty") or {}).get("level"), "unknown"),
+                "paid_only": bool(item.get("paid_only")),
+                "status": item.get("status")
+            })
+        problems.sort(key=lambda problem: problem["id"])
+        return problems
+
     def get_question_detail(self, slug: str) -> Optional[Dict[str, Any]]:
         """
         获取题目详情，使用 GraphQL 的 questionData 查询
@@ -0,0 +1,139 @@
+"""
+复习负载均衡
+在理想间隔附近的小窗口内选择预计到期题数最少的一天，避免同一批学习的题目
+在同一天集中到期
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from .fsrs import ReviewRecord
+
+# 间隔小于该天数时不做调整
+MIN_FUZZ_INTERVAL = 3
+# 允许调整的范围占理想间隔的比例
+FUZZ_FACTOR = 0.1
+# 最多调整的天数
+MAX_FUZZ_DAYS = 7
+
+
+def fuzz_range(interval: float) -> int:
+    """
+    理想间隔允许前后调整的天数
+
+    Args:
+        interval: 理想间隔 (天)
+
+    Returns:
+        int: 可前后调整的最大天数
+    """
+    if interval < MIN_FUZZ_INTERVAL:
+        return 0
+    return max(1, min(MAX_FUZZ_DAYS, round(interval * FUZZ_FACTOR)))
+
+
+class LoadBalancer:
+    """
+    按天的到期题数索引
+
+    每道题只登记下次到期的那一天，重新安排时先从原来的日期减掉，
+    因此选择日期只需查询窗口内的几天，不需要扫描全部复习记录。
+    """
+
+    def __init__(self, target: Optional[int] = None):
+        """
+        Args:
+            target: 每日目标复习量，窗口内低于目标的日期视为同样合适 (选最接近理想间隔的)，
+                None 表示总是选择负载最低的日期
+        """
+        self.target = target
+        self.due_counts: Dict[str, int] = {}
+        self.card_days: Dict[int, str] = {}
+
+    @classmethod
+    def from_reviews(cls, records: List[ReviewRecord], target: Optional[int] = None) -> "LoadBalancer":
+        """从复习记录重建索引"""
+        balancer = cls(target)
+        for record in records:
+            if record.next_review:
+                balancer.reschedule(record.question_id, record.next_review)
+        return balancer
+
+    def load(self, day: datetime) -> int:
+        """某一天的预计到期题数"""
+        return self.due_counts.get(day.date().isoformat(), 0)
+
+    def reschedule(self, question_id: int, next_review: datetime):
+        """把题目登记到新的到期日期"""
+        self.remove(question_id)
+        key = next_review.date().isoformat()
+        self.card_days[question_id] = key
+        self.due_counts[key] = self.due_counts.get(key, 0) + 1
+
+    def remove(self, question_id: int):
+        """从索引中移除题目"""
+        key = self.card_days.pop(question_id, None)
+        if key is None:
+            return
+        self.due_counts[key] -= 1
+        if self.due_counts[key] <= 0:
+            del self.due_counts[key]
+
+    def schedule(
+        self,
+        question_id: Optional[int],
+        current_time: datetime,
+        interval: float,
+        maximum_interval: float
+    ) -> datetime:
+        """
+        在理想间隔附近选择负载最低的日期并登记
+
+        Args:
+            question_id: 题目ID，None 表示只计算不登记
+            current_time: 当前时间
+            interval: 理想间隔 (天)
+            maximum_interval: 最大间隔 (天)
+
+        Returns:
+            datetime: 下次复习时间
+        """
+        # 题目原本登记的日期不计入负载
+        if question_id is not None:
+            self.remove(question_id)
+
+        spread = fuzz_range(interval)
+        best = None
+        for offset in range(-spread, spread + 1):
+            days = interval + offset
+            if days < 1 or days > maximum_interval:
+                continue
+            load = self.load(current_time + timedelta(days=days))
+            over = load if self.target is None else max(0, load - self.target + 1)
+            key = (over, abs(offset), offset)
+            if best is None or key < best[0]:
+                best = (key, days)
+
+        next_review = current_time + timedelta(days=best[1] if best else interval)
+        if question_id is not None:
+            self.reschedule(question_id, next_review)
+        return next_review
+
+    def drop_before(self, day: date):
+        """移除到期日早于 day 的登记 (过去的日期不会再参与选择)"""
+        cutoff = day.isoformat()
+        for qid in [qid for qid, key in self.card_days.items() if key < cutoff]:
+            self.remove(qid)
+
+    def to_dict(self) -> dict:
+        """转换为字典格式 (到期日计数可由题目日期推出，只保存后者)"""
+        return {"card_days": {str(qid): day for qid, day in self.card_days.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict, target: Optional[int] = None) -> "LoadBalancer":
+        """从字典创建实例"""
+        balancer = cls(target)
+        for qid, day in data.get("card_days", {}).items():
+            balancer.card_days[int(qid)] = day
+            balancer.due_counts[day] = balancer.due_counts.get(day, 0) + 1
+        return balancer
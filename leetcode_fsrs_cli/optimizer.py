@@ -5,7 +5,12 @@ FSRS 参数优化器
 
 import math
 import json
-from typing import List, Dict, Tuple
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Optional, Iterator
 from datetime import datetime
 
 try:
@@ -17,141 +22,803 @@ except ImportError:
 
 from .fsrs import FSRS
 
+# 增量优化: 新复习占比超过该值时改为全量重新拟合
+INCREMENTAL_MAX_NEW_FRACTION = 0.2
+# 增量优化的最大迭代次数
+INCREMENTAL_MAXITER = 50
+# 增量优化中将权重拉向上次拟合结果的近端项强度
+PROXIMAL_STRENGTH = 0.1
+
+# 随机优化: 乱序缓冲区大小 (以批次数计)，决定流式读取时的内存上限
+SHUFFLE_BUFFER_BATCHES = 8
+
+# 分组优化: 参与拟合所需的最少复习次数
+GROUP_MIN_REVIEWS = 30
+# 分组优化: 收缩先验强度 (相当于多少次复习的全局证据)
+GROUP_SHRINKAGE_REVIEWS = 200
+
+# 参数边界 (参考 FSRS 实现)，长度与 FSRS 默认权重一致
+PARAM_BOUNDS = [
+    (0.1, 10), (0.1, 10), (0.1, 10), (0.1, 10),
+    (0.1, 10), (0.1, 10), (0.1, 10), (0.01, 10),
+    (0.1, 10), (0.1, 10), (0.1, 10), (0.1, 10),
+    (0.01, 10), (0.1, 10), (0.1, 10), (0.1, 10),
+    (0.1, 10), (0.1, 10), (0.1, 10)
+]
+
+
+def pad_weights(w: List[float]) -> List[float]:
+    """权重不足部分用 FSRS 默认权重补齐到与边界一致的长度"""
+    w = list(w)
+    default_w = FSRS.get_default_params()["w"]
+    if len(w) < len(PARAM_BOUNDS):
+        w.extend(default_w[len(w):len(PARAM_BOUNDS)])
+    return w[:len(PARAM_BOUNDS)]
+
+
+def parse_timestamp(value) -> datetime:
+    """兼容 datetime 对象和 ISO 字符串两种时间戳"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def group_reviews(reviews: List[Dict]) -> Dict[int, List[Tuple[datetime, int]]]:
+    """
+    将扁平化的复习记录按题目分组并按时间排序
+
+    Args:
+        reviews: 复习记录列表 (扁平化，需包含 question_id, timestamp, rating)
+
+    Returns:
+        Dict[int, List[Tuple[datetime, int]]]: question_id -> [(时间, 评分), ...]
+    """
+    reviews_by_qid: Dict[int, List[Tuple[datetime, int]]] = {}
+    for r in reviews:
+        reviews_by_qid.setdefault(r["question_id"], []).append(
+            (parse_timestamp(r["timestamp"]), r["rating"])
+        )
+
+    for question_reviews in reviews_by_qid.values():
+        question_reviews.sort(key=lambda x: x[0])
+
+    return reviews_by_qid
+
+
+def _elapsed_days(timestamps: List[datetime], since: Optional[datetime] = None) -> List[float]:
+    """相邻复习之间的天数；第一项相对 since 计算，未提供时为 0"""
+    previous = since or timestamps[0]
+    elapsed = []
+    for t in timestamps:
+        elapsed.append(max(0.0, (t - previous).total_seconds() / 86400))
+        previous = t
+    return elapsed
+
+
+def prepare_cards(reviews: List[Dict]) -> List[Tuple[List[int], List[float]]]:
+    """
+    将扁平化的复习记录预处理为按题目分组的评分/间隔序列
+
+    时间戳解析和排序只做一次，损失函数的每次迭代直接使用预处理结果。
+
+    Args:
+        reviews: 复习记录列表 (扁平化，需包含 question_id, timestamp, rating)
+
+    Returns:
+        List[Tuple[List[int], List[float]]]: 每道题的 (评分序列, 距上次复习天数序列)
+    """
+    cards = []
+    for question_reviews in group_reviews(reviews).values():
+        ratings = [rating for _, rating in question_reviews]
+        elapsed = _elapsed_days([t for t, _ in question_reviews])
+        cards.append((ratings, elapsed))
+
+    return cards
+
+
+def flatten_reviews(records: Dict) -> List[Dict]:
+    """
+    将复习记录字典扁平化为单条复习列表
+
+    Args:
+        records: question_id -> ReviewRecord
+
+    Returns:
+        List[Dict]: 每条包含 question_id 的复习记录
+    """
+    flat_reviews = []
+    for qid, record in records.items():
+        for r in record.review_history:
+            r_copy = r.copy()
+            r_copy["question_id"] = qid
+            flat_reviews.append(r_copy)
+    return flat_reviews
+
+
+def _replay_card(
+    w,
+    ratings: List[int],
+    elapsed: List[float],
+    state: Optional[Tuple[float, float]] = None,
+    predictions: Optional[List[float]] = None
+) -> Tuple[float, int, float, float]:
+    """
+    按给定权重重放单道题的复习历史
+
+    Args:
+        w: 权重
+        ratings: 评分序列
+        elapsed: 距上次复习天数序列
+        state: 起始 (稳定性, 难度)；为 None 时由第一条记录初始化
+        predictions: 若提供，依次追加每条被评估复习的预测留存率
+
+    Returns:
+        Tuple[float, int, float, float]: (Log Loss 之和, 参与计算的复习次数, 最终稳定性, 最终难度)
+    """
+    total_loss = 0.0
+
+    if state is None:
+        # 第一条记录只用于初始化状态，不计算 Loss
+        first_rating = ratings[0]
+        # 初始稳定性
+        stability = w[first_rating - 1]
+        # 初始难度
+        difficulty = w[4] - w[5] * (first_rating - 3)
+        difficulty = max(1, min(10, difficulty))
+        start = 1
+    else:
+        stability, difficulty = state
+        start = 0
+
+    for i in range(start, len(ratings)):
+        rating = ratings[i]
+
+        # 计算留存率 (预测)
+        retrievability = math.pow(1 + elapsed[i] / (9 * stability), -1)
+
+        # 评分映射: 1=忘记(y=0), 2-5=记住(y=1)，同时避免 log(0)
+        p = max(1e-10, min(1 - 1e-10, retrievability))
+        total_loss -= math.log(1 - p) if rating == 1 else math.log(p)
+        if predictions is not None:
+            predictions.append(p)
+
+        # 更新状态
+        if rating == 1:
+            new_difficulty = max(1, min(10, difficulty + w[15]))
+            stability = w[16] * math.pow(difficulty, w[17]) * math.pow(new_difficulty, -w[18])
+        else:
+            new_difficulty = max(1, min(10, difficulty + w[7] * (rating - 3)))
+            if rating == 2:
+                stability = w[9] * math.pow(difficulty, w[10]) * math.pow(new_difficulty, -w[11]) * stability
+            elif rating == 3:
+                stability = w[12] * math.pow(difficulty, w[13]) * math.pow(new_difficulty, -w[14]) * stability
+            else:  # 4 or 5
+                stability = stability * (1 + w[5] * (5 - rating) * math.pow(retrievability, w[6]))
+        difficulty = new_difficulty
+
+    return total_loss, len(ratings) - start, stability, difficulty
+
+
+def _loss_sum(w, cards) -> Tuple[float, int]:
+    """所有题目的 Log Loss 之和及计数；card 为 (评分, 间隔) 或 (评分, 间隔, 起始状态)"""
+    total_loss = 0.0
+    total_count = 0
+    for card in cards:
+        loss, count, _, _ = _replay_card(w, *card)
+        total_loss += loss
+        total_count += count
+    return total_loss, total_count
+
+
+def _loss(w, cards: List[Tuple[List[int], List[float]]]) -> float:
+    """计算损失函数 (平均 Log Loss)"""
+    total_loss, total_count = _loss_sum(w, cards)
+    return total_loss / total_count if total_count > 0 else 0
+
+
+def _incremental_loss(w, cards, prev_w, prev_loss: float, prev_count: int) -> float:
+    """
+    增量损失: 新复习的 Log Loss 与上次拟合 Loss 按样本数加权，
+    并加入拉向上次权重的近端项，以代替对旧复习的重新计算
+    """
+    new_loss, new_count = _loss_sum(w, cards)
+    proximal = PROXIMAL_STRENGTH * float(np.mean((w - prev_w) ** 2))
+    return (prev_loss * prev_count + new_loss + prev_count * proximal) / (prev_count + new_count)
+
+
+def spool_cards(reviews: List[Dict], path: str) -> int:
+    """
+    将预处理后的题目序列按行写入 NDJSON 文件，供随机优化流式读取
+
+    Args:
+        reviews: 复习记录列表 (扁平化)
+        path: 输出文件路径
+
+    Returns:
+        int: 写入的题目数
+    """
+    count = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for ratings, elapsed in prepare_cards(reviews):
+            if len(ratings) < 2:
+                continue
+            f.write(json.dumps([ratings, elapsed]) + "\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def iter_card_batches(path: str, batch_size: int, rng: Optional[random.Random] = None) -> Iterator[List]:
+    """
+    从 NDJSON 文件流式读取题目并按批次返回
+
+    提供 rng 时使用固定大小的乱序缓冲区打乱顺序，内存占用与文件大小无关。
+    """
+    buffer_size = batch_size * SHUFFLE_BUFFER_BATCHES if rng else batch_size
+    buffer = []
+    batch = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            buffer.append(tuple(json.loads(line)))
+            if len(buffer) < buffer_size:
+                continue
+            if rng:
+                batch.append(buffer.pop(rng.randrange(len(buffer))))
+            else:
+                batch.extend(buffer)
+                buffer = []
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+    if rng:
+        rng.shuffle(buffer)
+    batch.extend(buffer)
+    for i in range(0, len(batch), batch_size):
+        yield batch[i:i + batch_size]
+
+
+def _numeric_gradient(w, cards, eps: float = 1e-5):
+    """前向差分计算批次平均 Loss 的梯度"""
+    base = _loss(w, cards)
+    grad = np.zeros_like(w)
+    for i in range(len(w)):
+        shifted = w.copy()
+        shifted[i] += eps
+        grad[i] = (_loss(shifted, cards) - base) / eps
+    return base, grad
+
+
+# 工作进程中的数据集，由进程池 initializer 设置，避免为每个起点重复序列化
+_WORKER_CARDS: List[Tuple[List[int], List[float]]] = []
+# 各起点共享的当前最优 Loss (multiprocessing.Value)
+_WORKER_BEST = None
+
+
+class _Abandoned(Exception):
+    """由回调抛出，中止落后过多的起点"""
+
+
+def _init_worker(cards: List[Tuple[List[int], List[float]]], best=None):
+    global _WORKER_CARDS, _WORKER_BEST
+    _WORKER_CARDS = cards
+    _WORKER_BEST = best
+
+
+def _minimize_start(
+    x0: List[float],
+    maxiter: int,
+    grace_iters: int,
+    margin: float
+) -> Tuple[List[float], float, str]:
+    """
+    在工作进程中从 x0 出发运行一次完整的 L-BFGS-B
+
+    每次迭代后的回调把本起点的最低 Loss 写入共享最优值，运行满 grace_iters
+    次迭代后若落后共享最优值超过 margin (相对比例) 则中止。中止时返回
+    已求值过的最低点。
+
+    Returns:
+        Tuple[List[float], float, str]: (权重, Loss, 状态: converged/exhausted/abandoned)
+    """
+    best_seen = {"x": np.array(x0), "fun": math.inf, "iters": 0}
+
+    def objective(w):
+        loss = _loss(w, _WORKER_CARDS)
+        if loss < best_seen["fun"]:
+            best_seen["x"], best_seen["fun"] = np.array(w), loss
+        return loss
+
+    def callback(xk):
+        best_seen["iters"] += 1
+        with _WORKER_BEST.get_lock():
+            if best_seen["fun"] < _WORKER_BEST.value:
+                _WORKER_BEST.value = best_seen["fun"]
+            best = _WORKER_BEST.value
+        if best_seen["iters"] >= grace_iters and best_seen["fun"] > best + margin * abs(best):
+            raise _Abandoned()
+
+    try:
+        result = minimize(
+            objective,
+            np.array(x0),
+            bounds=PARAM_BOUNDS,
+            method='L-BFGS-B',
+            options={'maxiter': maxiter},
+            callback=callback
+        )
+    except _Abandoned:
+        return best_seen["x"].tolist(), float(best_seen["fun"]), "abandoned"
+    # status == 0 表示已收敛，1 表示达到迭代上限
+    return result.x.tolist(), float(result.fun), "converged" if result.status == 0 else "exhausted"
+
+
+def _fit_cards(initial_w: List[float], cards) -> Tuple[List[float], float]:
+    """在工作进程中对一组题目做完整拟合"""
+    result = minimize(
+        _loss,
+        np.array(initial_w),
+        args=(cards,),
+        bounds=PARAM_BOUNDS,
+        method='L-BFGS-B',
+        options={'maxiter': 1000}
+    )
+    return result.x.tolist(), float(result.fun)
+
+
+@dataclass
+class GroupFitResult:
+    """分组优化结果"""
+    weights: List[float]  # 全局权重
+    loss: float  # 全局 Loss
+    groups: Dict[str, Dict] = field(default_factory=dict)  # 组键 -> {w, loss, reviews, shrinkage}
+    skipped: Dict[str, int] = field(default_factory=dict)  # 数据不足而跳过的组 -> 复习次数
+
+
+@dataclass
+class MultiStartResult:
+    """多起点优化结果"""
+    weights: List[float]
+    loss: float
+    losses: List[float] = field(default_factory=list)  # 每个起点的最终 Loss
+    statuses: List[str] = field(default_factory=list)  # converged, abandoned, exhausted
+
+    @property
+    def abandoned_count(self) -> int:
+        return self.statuses.count("abandoned")
+
+    def loss_spread(self) -> Dict[str, float]:
+        """各起点最终 Loss 的分布"""
+        losses = sorted(self.losses)
+        n = len(losses)
+        mean = sum(losses) / n
+        return {
+            "min": losses[0],
+            "median": losses[n // 2] if n % 2 else (losses[n // 2 - 1] + losses[n // 2]) / 2,
+            "max": losses[-1],
+            "mean": mean,
+            "std": math.sqrt(sum((x - mean) ** 2 for x in losses) / n)
+        }
+
+
+@dataclass
+class IncrementalResult:
+    """增量优化结果"""
+    weights: List[float]
+    loss: float
+    mode: str  # full, incremental, unchanged
+    new_reviews: int
+    state: Dict  # 待持久化的拟合状态
+
+
 class FSRSOptimizer:
     """FSRS 参数优化器"""
 
     def __init__(self, fsrs: FSRS):
         self.fsrs = fsrs
 
+    def _initial_weights(self) -> List[float]:
+        """当前权重 (补齐到与边界一致的长度)"""
+        return pad_weights(self.fsrs.params["w"])
+
+    def _check_ready(self, reviews: List[Dict]):
+        if not HAS_SCIPY:
+            raise ImportError("需要安装 scipy 和 numpy 才能使用优化功能: pip install scipy numpy")
+
+        if not reviews:
+            raise ValueError("没有足够的复习记录进行优化")
+
     def optimize(self, reviews: List[Dict]) -> Tuple[List[float], float]:
         """
         优化 FSRS 参数
-        
+
         Args:
             reviews: 复习记录列表 (扁平化)
-            
+
         Returns:
             Tuple[List[float], float]: (优化后的权重, 最小Loss)
         """
-        if not HAS_SCIPY:
-            raise ImportError("需要安装 scipy 和 numpy 才能使用优化功能: pip install scipy numpy")
+        self._check_ready(reviews)
+        return self._minimize_from(self._initial_weights(), prepare_cards(reviews), 1000)
 
-        if not reviews:
-            raise ValueError("没有足够的复习记录进行优化")
+    def optimize_groups(
+        self,
+        reviews: List[Dict],
+        question_groups: Dict[int, List[str]],
+        min_reviews: int = GROUP_MIN_REVIEWS,
+        shrinkage_reviews: int = GROUP_SHRINKAGE_REVIEWS,
+        workers: Optional[int] = None
+    ) -> GroupFitResult:
+        """
+        按组并行优化参数
+
+        全局参数和每个组的参数在进程池中同时拟合。组的拟合结果按
+        n / (n + shrinkage_reviews) 的比例与全局结果加权 (n 为组内参与计算的
+        复习次数)，数据稀疏的组因此更接近全局参数；少于 min_reviews 的组不拟合。
+
+        Args:
+            reviews: 复习记录列表 (扁平化)
+            question_groups: question_id -> 所属组键列表 (一道题可属于多个组)
+            min_reviews: 拟合一个组所需的最少复习次数
+            shrinkage_reviews: 收缩先验强度
+            workers: 进程池大小，None 表示使用 CPU 核数
+
+        Returns:
+            GroupFitResult: 全局及各组的权重
+        """
+        self._check_ready(reviews)
+
+        cards_by_qid = {}
+        for qid, question_reviews in group_reviews(reviews).items():
+            ratings = [rating for _, rating in question_reviews]
+            cards_by_qid[qid] = (ratings, _elapsed_days([t for t, _ in question_reviews]))
+
+        group_cards: Dict[str, List] = {}
+        for qid, card in cards_by_qid.items():
+            for key in question_groups.get(qid, []):
+                group_cards.setdefault(key, []).append(card)
+
+        result = GroupFitResult(weights=[], loss=0.0)
+        initial_w = self._initial_weights()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            global_future = pool.submit(_fit_cards, initial_w, list(cards_by_qid.values()))
+            futures = {}
+            for key, cards in group_cards.items():
+                n = sum(len(ratings) - 1 for ratings, _ in cards)
+                if n < min_reviews:
+                    result.skipped[key] = n
+                    continue
+                futures[key] = (pool.submit(_fit_cards, initial_w, cards), n)
+
+            result.weights, result.loss = global_future.result()
+            global_w = np.array(result.weights)
+            for key, (future, n) in futures.items():
+                group_w, _ = future.result()
+                shrinkage = n / (n + shrinkage_reviews)
+                weights = (shrinkage * np.array(group_w) + (1 - shrinkage) * global_w).tolist()
+                result.groups[key] = {
+                    "w": weights,
+                    "loss": _loss(weights, group_cards[key]),
+                    "reviews": n,
+                    "shrinkage": shrinkage
+                }
+
+        return result
+
+    def optimize_multistart(
+        self,
+        reviews: List[Dict],
+        restarts: int = 4,
+        margin: float = 0.05,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        grace_iters: int = 50,
+        maxiter: int = 1000
+    ) -> MultiStartResult:
+        """
+        多起点并行优化
+
+        第一个起点为当前权重，其余为其随机扰动。每个起点在进程池中运行一次
+        完整的 L-BFGS-B (保留曲率历史，收敛速度与单起点相同)，各起点通过共享
+        的最优 Loss 互相剪枝：运行满 grace_iters 次迭代后，Loss 落后最优值超过
+        margin (相对比例) 的起点被中止，不再占用计算资源。进程数少于起点数时
+        排队的起点较晚开始，面对的最优值已更低，但同样有 grace_iters 次迭代的宽限。
+
+        Args:
+            reviews: 复习记录列表 (扁平化)
+            restarts: 起点数量
+            margin: 放弃阈值 (相对最优 Loss 的比例)
+            workers: 进程池大小，None 表示使用 CPU 核数
+            seed: 随机扰动种子
+            grace_iters: 起点参与剪枝前的最少迭代次数
+            maxiter: 每个起点的最大迭代次数
+
+        Returns:
+            MultiStartResult: 最优权重及各起点结果
+        """
+        self._check_ready(reviews)
+        cards = prepare_cards(reviews)
+
+        starts = self._perturbed_starts(max(1, restarts), seed)
+        best = multiprocessing.Value('d', math.inf)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cards, best)) as pool:
+            futures = [pool.submit(_minimize_start, start, maxiter, grace_iters, margin) for start in starts]
+            results = [future.result() for future in futures]
+
+        points = [r[0] for r in results]
+        losses = [r[1] for r in results]
+        statuses = [r[2] for r in results]
+        best_index = min(range(len(losses)), key=lambda i: losses[i])
+
+        return MultiStartResult(
+            weights=points[best_index],
+            loss=losses[best_index],
+            losses=losses,
+            statuses=statuses
+        )
+
+    def build_fit_state(self, reviews: List[Dict], weights: List[float], loss: float) -> Dict:
+        """
+        根据拟合结果构建可持久化的状态
+
+        Args:
+            reviews: 参与拟合的复习记录 (扁平化)
+            weights: 拟合得到的权重
+            loss: 拟合 Loss
+
+        Returns:
+            Dict: 包含权重、Loss、参与评分的复习数、水位线时间戳和每道题最终状态的字典
+        """
+        card_states = {}
+        watermark = None
+        scored = 0
+        for qid, question_reviews in group_reviews(reviews).items():
+            timestamps = [t for t, _ in question_reviews]
+            ratings = [rating for _, rating in question_reviews]
+            _, count, stability, difficulty = _replay_card(weights, ratings, _elapsed_days(timestamps))
+            scored += count
+            card_states[str(qid)] = [stability, difficulty, timestamps[-1].isoformat()]
+            if watermark is None or timestamps[-1] > watermark:
+                watermark = timestamps[-1]
+
+        return {
+            "w": list(weights),
+            "loss": loss,
+            # 每道题的首次复习不参与 Loss，这里只计参与评分的复习数，与 Loss 的平均口径一致
+            "n_scored": scored,
+            "watermark": watermark.isoformat() if watermark else None,
+            "fitted_at": datetime.now().isoformat(),
+            "card_states": card_states
+        }
 
-        # 准备数据
-        # 按题目分组并按时间排序
-        reviews_by_qid = {}
-        for r in reviews:
-            qid = r["question_id"]
-            if qid not in reviews_by_qid:
-                reviews_by_qid[qid] = []
-            reviews_by_qid[qid].append(r)
-
-        for qid in reviews_by_qid:
-            reviews_by_qid[qid].sort(key=lambda x: x["timestamp"])
-
-        # 初始参数
-        initial_w = np.array(self.fsrs.params["w"])
-        
-        # 定义边界 (参考 FSRS 实现)
-        bounds = [
-            (0.1, 10), (0.1, 10), (0.1, 10), (0.1, 10),
-            (0.1, 10), (0.1, 10), (0.1, 10), (0.01, 10),
-            (0.1, 10), (0.1, 10), (0.1, 10), (0.1, 10),
-            (0.01, 10), (0.1, 10), (0.1, 10), (0.1, 10),
-            (0.1, 10)
-        ]
-
-        # 运行优化
+    def _state_matches(self, state: Optional[Dict]) -> bool:
+        """拟合状态完整且其权重就是当前使用的权重"""
+        if not state or not state.get("watermark") or "n_scored" not in state:
+            return False
+        if len(state.get("w", [])) != len(PARAM_BOUNDS):
+            return False
+        return bool(np.allclose(state["w"], self._initial_weights()))
+
+    def optimize_incremental(
+        self,
+        reviews: List[Dict],
+        state: Optional[Dict],
+        max_new_fraction: float = INCREMENTAL_MAX_NEW_FRACTION,
+        maxiter: int = INCREMENTAL_MAXITER
+    ) -> IncrementalResult:
+        """
+        基于上次拟合结果的增量优化
+
+        只重放水位线之后的新复习：有缓存状态的题目从缓存的 (稳定性, 难度)
+        继续，其余题目从头重放。旧复习不再重新计算，其贡献由上次的 Loss
+        和一个拉向上次权重的近端项近似，因此迭代次数可以限制得很小。
+        新复习占比超过 max_new_fraction 时退化为从上次权重出发的全量拟合；
+        没有可用状态，或当前权重已不是上次拟合的结果 (如手动设置过权重) 时，
+        从当前权重全量拟合。
+
+        Args:
+            reviews: 全部复习记录 (扁平化)
+            state: 上次持久化的拟合状态，可为 None
+            max_new_fraction: 允许增量优化的最大新复习占比
+            maxiter: 增量优化的最大迭代次数
+
+        Returns:
+            IncrementalResult: 优化结果及更新后的状态
+        """
+        self._check_ready(reviews)
+
+        if not self._state_matches(state):
+            weights, loss = self.optimize(reviews)
+            return IncrementalResult(weights, loss, "full", len(reviews),
+                                     self.build_fit_state(reviews, weights, loss))
+
+        watermark = datetime.fromisoformat(state["watermark"])
+        new_reviews = [r for r in reviews if parse_timestamp(r["timestamp"]) > watermark]
+
+        if not new_reviews:
+            return IncrementalResult(state["w"], state["loss"], "unchanged", 0, state)
+
+        if len(new_reviews) > max_new_fraction * len(reviews):
+            weights, loss = self._minimize_from(state["w"], prepare_cards(reviews), 1000)
+            return IncrementalResult(weights, loss, "full", len(new_reviews),
+                                     self.build_fit_state(reviews, weights, loss))
+
+        card_states = state.get("card_states", {})
+        cards = []
+        card_qids = []
+        for qid, question_reviews in group_reviews(new_reviews).items():
+            timestamps = [t for t, _ in question_reviews]
+            ratings = [rating for _, rating in question_reviews]
+            cached = card_states.get(str(qid))
+            if cached:
+                last_review = datetime.fromisoformat(cached[2])
+                cards.append((ratings, _elapsed_days(timestamps, since=last_review), (cached[0], cached[1])))
+            else:
+                cards.append((ratings, _elapsed_days(timestamps)))
+            card_qids.append((qid, timestamps[-1]))
+
+        prev_w = np.array(state["w"])
+        prev_count = state["n_scored"]
+        result = minimize(
+            _incremental_loss,
+            prev_w,
+            args=(cards, prev_w, state["loss"], prev_count),
+            bounds=PARAM_BOUNDS,
+            method='L-BFGS-B',
+            options={'maxiter': maxiter}
+        )
+        weights = result.x.tolist()
+        new_loss, new_count = _loss_sum(weights, cards)
+        loss = (state["loss"] * prev_count + new_loss) / (prev_count + new_count)
+
+        # 用新权重推进新复习涉及题目的缓存状态
+        updated_states = dict(card_states)
+        for card, (qid, last_review) in zip(cards, card_qids):
+            _, _, stability, difficulty = _replay_card(weights, *card)
+            updated_states[str(qid)] = [stability, difficulty, last_review.isoformat()]
+
+        new_state = {
+            "w": weights,
+            "loss": loss,
+            "n_scored": prev_count + new_count,
+            "watermark": max(watermark, max(t for _, t in card_qids)).isoformat(),
+            "fitted_at": datetime.now().isoformat(),
+            "card_states": updated_states
+        }
+        return IncrementalResult(weights, loss, "incremental", len(new_reviews), new_state)
+
+    def _minimize_from(self, initial_w: List[float], cards, maxiter: int) -> Tuple[List[float], float]:
         result = minimize(
-            self._loss_function,
-            initial_w,
-            args=(reviews_by_qid,),
-            bounds=bounds,
+            _loss,
+            np.array(initial_w),
+            args=(cards,),
+            bounds=PARAM_BOUNDS,
             method='L-BFGS-B',
-            options={'maxiter': 1000}
+            options={'maxiter': maxiter}
         )
+        return result.x.tolist(), float(result.fun)
+
+    def optimize_stochastic(
+        self,
+        card_file: str,
+        batch_size: int = 256,
+        epochs: int = 5,
+        learning_rate: float = 0.02,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 20,
+        resume: bool = False,
+        seed: int = 0
+    ) -> Tuple[List[float], float]:
+        """
+        小批量随机优化 (Adam)
+
+        题目序列从 spool_cards 生成的 NDJSON 文件中按批流式读取，内存占用
+        只取决于批大小。每步更新后将权重投影回 PARAM_BOUNDS。每
+        checkpoint_every 步及每轮结束时写入检查点，resume 时从检查点的
+        轮次和批次继续 (每轮的乱序由 seed 和轮次决定，可复现)。批次位置只对
+        同一题目文件和同一批大小有意义，不一致时拒绝继续。
+
+        Args:
+            card_file: spool_cards 生成的文件
+            batch_size: 每批题目数
+            epochs: 训练轮数
+            learning_rate: Adam 学习率
+            checkpoint_path: 检查点文件路径，None 表示不保存
+            checkpoint_every: 保存检查点的步数间隔
+            resume: 是否从检查点继续
+            seed: 乱序随机种子
+
+        Returns:
+            Tuple[List[float], float]: (优化后的权重, 全量数据上的平均Loss)
+
+        Raises:
+            ValueError: 检查点的题目文件或批大小与本次不一致
+        """
+        if not HAS_SCIPY:
+            raise ImportError("需要安装 scipy 和 numpy 才能使用优化功能: pip install scipy numpy")
+
+        beta1, beta2, adam_eps = 0.9, 0.999, 1e-8
+        lower = np.array([b[0] for b in PARAM_BOUNDS])
+        upper = np.array([b[1] for b in PARAM_BOUNDS])
+
+        w = np.clip(np.array(self._initial_weights()), lower, upper)
+        m = np.zeros_like(w)
+        v = np.zeros_like(w)
+        step = 0
+        start_epoch = 0
+        start_batch = 0
+        card_stat = os.stat(card_file)
+        card_signature = {"mtime_ns": card_stat.st_mtime_ns, "size": card_stat.st_size}
+
+        if resume and checkpoint_path and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            expected = {"card_file": str(card_file), "batch_size": batch_size, "card_signature": card_signature}
+            mismatched = [k for k, value in expected.items() if k in checkpoint and checkpoint[k] != value]
+            if mismatched:
+                raise ValueError(f"检查点与本次优化不一致 ({', '.join(mismatched)})，无法继续")
+            w, m, v = (np.array(checkpoint[k]) for k in ("w", "m", "v"))
+            step = checkpoint["step"]
+            start_epoch = checkpoint["epoch"]
+            start_batch = checkpoint["batch"]
+            seed = checkpoint.get("seed", seed)
+
+        def save_checkpoint(epoch: int, batch: int):
+            if not checkpoint_path:
+                return
+            tmp_path = f"{checkpoint_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "w": w.tolist(), "m": m.tolist(), "v": v.tolist(), "step": step,
+                    "epoch": epoch, "batch": batch, "seed": seed,
+                    "card_file": str(card_file), "batch_size": batch_size, "card_signature": card_signature,
+                    "saved_at": datetime.now().isoformat()
+                }, f)
+            os.replace(tmp_path, checkpoint_path)
+
+        for epoch in range(start_epoch, epochs):
+            rng = random.Random(seed * 1000003 + epoch)
+            for batch_index, batch in enumerate(iter_card_batches(card_file, batch_size, rng)):
+                if epoch == start_epoch and batch_index < start_batch:
+                    continue
+
+                _, grad = _numeric_gradient(w, batch)
+                step += 1
+                m = beta1 * m + (1 - beta1) * grad
+                v = beta2 * v + (1 - beta2) * grad ** 2
+                m_hat = m / (1 - beta1 ** step)
+                v_hat = v / (1 - beta2 ** step)
+                w = np.clip(w - learning_rate * m_hat / (np.sqrt(v_hat) + adam_eps), lower, upper)
+
+                if step % checkpoint_every == 0:
+                    save_checkpoint(epoch, batch_index + 1)
+
+            save_checkpoint(epoch + 1, 0)
+
+        weights = w.tolist()
+        total_loss, total_count = 0.0, 0
+        for batch in iter_card_batches(card_file, batch_size):
+            loss, count = _loss_sum(weights, batch)
+            total_loss += loss
+            total_count += count
+
+        return weights, total_loss / total_count if total_count > 0 else 0
+
+    def _perturbed_starts(self, count: int, seed: Optional[int] = None,
+                          scale: float = 0.3) -> List[List[float]]:
+        """生成起点：当前权重 + (count - 1) 个对数正态扰动后的权重"""
+        base = np.array(self._initial_weights())
+        lower = np.array([b[0] for b in PARAM_BOUNDS])
+        upper = np.array([b[1] for b in PARAM_BOUNDS])
+        rng = np.random.default_rng(seed)
 
-        return result.x.tolist(), result.fun
-
-    def _loss_function(self, w: np.ndarray, reviews_by_qid: Dict[int, List[Dict]]) -> float:
-        """计算损失函数 (Log Loss)"""
-        total_loss = 0
-        total_count = 0
-        
-        # 临时更新 FSRS 参数
-        original_w = self.fsrs.params["w"]
-        self.fsrs.params["w"] = w.tolist()
-
-        for qid, question_reviews in reviews_by_qid.items():
-            # 初始状态
-            stability = 2.5  # 这里的初始值应该由参数决定，但简化处理
-            difficulty = 5.0
-            
-            # 第一条记录通常是学习，不计算 Loss，只更新状态
-            # 但 FSRS v4 中第一条记录也有评分
-            
-            # 我们需要模拟整个过程
-            # 初始: stability=w[0-3] based on first rating
-            
-            first_rating = question_reviews[0]["rating"]
-            # 初始稳定性
-            stability = w[first_rating - 1]
-            # 初始难度
-            difficulty = w[4] - w[5] * (first_rating - 3)
-            difficulty = max(1, min(10, difficulty))
-            
-            last_date = datetime.fromisoformat(question_reviews[0]["timestamp"])
-
-            for i in range(1, len(question_reviews)):
-                review = question_reviews[i]
-                current_date = datetime.fromisoformat(review["timestamp"])
-                rating = review["rating"]
-                
-                elapsed_days = (current_date - last_date).total_seconds() / 86400
-                elapsed_days = max(0, elapsed_days)
-
-                # 计算留存率 (预测)
-                retrievability = math.pow(1 + elapsed_days / (9 * stability), -1)
-                
-                # 计算 Loss
-                # 评分映射: 1=忘记(y=0), 2-5=记住(y=1)
-                y = 0 if rating == 1 else 1
-                
-                # 避免 log(0)
-                p = max(1e-10, min(1 - 1e-10, retrievability))
-                
-                loss = - (y * math.log(p) + (1 - y) * math.log(1 - p))
-                
-                # 加权 (可选，这里简化)
-                total_loss += loss
-                total_count += 1
-
-                # 更新状态
-                if rating == 1:
-                    new_difficulty = difficulty + w[15]
-                    new_difficulty = max(1, min(10, new_difficulty))
-                    stability = w[16] * math.pow(difficulty, w[17]) * math.pow(new_difficulty, -w[18])
-                    difficulty = new_difficulty
-                else:
-                    # 难度更新
-                    new_difficulty = difficulty + w[7] * (rating - 3)
-                    new_difficulty = max(1, min(10, new_difficulty))
-                    
-                    # 稳定性更新
-                    if rating == 2:
-                        stability = w[9] * math.pow(difficulty, w[10]) * math.pow(new_difficulty, -w[11]) * stability
-                    elif rating == 3:
-                        stability = w[12] * math.pow(difficulty, w[13]) * math.pow(new_difficulty, -w[14]) * stability
-                    else: # 4 or 5
-                        stability = stability * (1 + w[5] * (5 - rating) * math.pow(retrievability, w[6]))
-                    
-                    difficulty = new_difficulty
-                
-                last_date = current_date
-
-        # 恢复参数
-        self.fsrs.params["w"] = original_w
-        
-        return total_loss / total_count if total_count > 0 else 0
+        starts = [np.clip(base, lower, upper).tolist()]
+        for _ in range(count - 1):
+            noise = np.exp(rng.normal(0.0, scale, size=base.shape))
+            starts.append(np.clip(base * noise, lower, upper).tolist())
+        return starts
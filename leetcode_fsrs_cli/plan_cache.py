@@ -0,0 +1,137 @@
+"""
+每日复习计划缓存
+计划按日期缓存，复习记录、题库或配置的任何写入都会递增数据版本号，使缓存失效；
+计划生成之后有新题目到期时也会失效
+"""
+
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+GENERATION_FILE = "generation"
+PLAN_CACHE_FILE = "plan_cache.json"
+
+
+def read_generation(data_dir) -> int:
+    """
+    读取数据版本号
+
+    Args:
+        data_dir: 数据目录
+
+    Returns:
+        int: 版本号，从未写入过数据时为 0
+    """
+    try:
+        return int((Path(data_dir) / GENERATION_FILE).read_text(encoding='utf-8').strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def bump_generation(data_dir):
+    """
+    递增数据版本号 (在写入复习记录、题库或配置之后调用)
+
+    Args:
+        data_dir: 数据目录
+    """
+    path = Path(data_dir) / GENERATION_FILE
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(str(read_generation(data_dir) + 1), encoding='utf-8')
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"更新数据版本号失败: {e}")
+
+
+def plan_key(limit: int, minutes: Optional[float]) -> str:
+    """计划参数对应的缓存键"""
+    return f"minutes={minutes:g}" if minutes else f"limit={limit}"
+
+
+class PlanCache:
+    """
+    按日期缓存的复习计划
+
+    缓存内容为 (题目ID, 优先级) 列表，只在写入时的数据版本号与当前一致、
+    且还没有到达 valid_until (计划生成之后最早到期的题目的到期时间) 时有效，
+    过去日期的计划在写入时清理。
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        self.cache_file = self.data_dir / PLAN_CACHE_FILE
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def get(
+        self,
+        day: date,
+        key: str,
+        now: Optional[datetime] = None
+    ) -> Optional[List[Tuple[int, float]]]:
+        """
+        读取某天的缓存计划
+
+        Args:
+            day: 计划日期
+            key: plan_key 返回的缓存键
+            now: 当前时间，默认 datetime.now()
+
+        Returns:
+            Optional[List[Tuple[int, float]]]: (题目ID, 优先级) 列表，未命中返回 None
+        """
+        cache = self._load()
+        if cache.get("generation") != read_generation(self.data_dir):
+            return None
+        plan = cache.get("days", {}).get(day.isoformat(), {}).get(key)
+        if not isinstance(plan, dict):
+            return None
+        valid_until = plan.get("valid_until")
+        if valid_until and (now or datetime.now()) >= datetime.fromisoformat(valid_until):
+            return None
+        return [(int(qid), priority) for qid, priority in plan["entries"]]
+
+    def put(
+        self,
+        day: date,
+        key: str,
+        entries: List[Tuple[int, float]],
+        valid_until: Optional[datetime] = None
+    ):
+        """
+        写入某天的计划
+
+        Args:
+            day: 计划日期
+            key: plan_key 返回的缓存键
+            entries: (题目ID, 优先级) 列表
+            valid_until: 计划失效的时间 (生成之后最早有题目到期的时间)，None 表示不会因时间失效
+        """
+        generation = read_generation(self.data_dir)
+        cache = self._load()
+        if cache.get("generation") != generation:
+            cache = {"generation": generation, "days": {}}
+
+        today = date.today().isoformat()
+        days: Dict[str, dict] = {d: plans for d, plans in cache["days"].items() if d >= today}
+        days.setdefault(day.isoformat(), {})[key] = {
+            "entries": [[qid, priority] for qid, priority in entries],
+            "valid_until": valid_until.isoformat() if valid_until else None
+        }
+        cache["days"] = days
+
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"保存复习计划缓存失败: {e}")
@@ -0,0 +1,168 @@
+"""
+复习优先级评分
+把到期题目整理为列式状态，用配置中的评分表达式一次性批量计算优先级
+"""
+
+import ast
+import math
+from datetime import datetime
+from typing import List, Dict, Optional, Sequence
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .fsrs import ReviewRecord
+from .leetcode import Question
+
+# 默认评分表达式，与原先硬编码的公式一致
+DEFAULT_PRIORITY_EXPRESSION = (
+    "2.0 * overdue + 1.5 * difficulty + max(0.1, 5.0 - stability) + 0.5 * max(0.5, 1.0 - 0.1 * reviews)"
+)
+
+# 难度等级对应的 difficulty 变量取值
+DIFFICULTY_WEIGHTS = {"easy": 1.0, "medium": 1.5, "hard": 2.0}
+
+# 表达式中可用的变量
+VARIABLES = {
+    "overdue": "逾期天数 (未逾期为 0)",
+    "difficulty": "难度等级权重 (easy=1.0, medium=1.5, hard=2.0)",
+    "stability": "FSRS 稳定性",
+    "fsrs_difficulty": "FSRS 难度系数",
+    "reviews": "复习次数",
+    "retrievability": "当前预测留存率 (新题为 1.0)",
+}
+
+# 表达式中可用的函数: 名称 -> (numpy 实现, 标量实现)
+_FUNCTIONS = {
+    "max": (lambda a, b: np.maximum(a, b), max),
+    "min": (lambda a, b: np.minimum(a, b), min),
+    "abs": (lambda a: np.abs(a), abs),
+    "exp": (lambda a: np.exp(a), math.exp),
+    "log": (lambda a: np.log(a), math.log),
+    "sqrt": (lambda a: np.sqrt(a), math.sqrt),
+}
+
+_ALLOWED_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd)
+
+
+def _validate(node: ast.AST):
+    """只允许数字、已知变量、四则运算/乘方和白名单函数调用"""
+    if isinstance(node, ast.Expression):
+        _validate(node.body)
+    elif isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _ALLOWED_OPERATORS):
+            raise ValueError(f"不支持的运算符: {type(node.op).__name__}")
+        _validate(node.left)
+        _validate(node.right)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _ALLOWED_OPERATORS):
+            raise ValueError(f"不支持的运算符: {type(node.op).__name__}")
+        _validate(node.operand)
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"不支持的常量: {node.value!r}")
+    elif isinstance(node, ast.Name):
+        if node.id not in VARIABLES:
+            raise ValueError(f"未知变量: {node.id} (可用: {', '.join(VARIABLES)})")
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS:
+            raise ValueError(f"不支持的函数 (可用: {', '.join(_FUNCTIONS)})")
+        if node.keywords:
+            raise ValueError("函数调用不支持关键字参数")
+        for arg in node.args:
+            _validate(arg)
+    else:
+        raise ValueError(f"不支持的语法: {type(node).__name__}")
+
+
+class PriorityExpression:
+    """编译后的评分表达式"""
+
+    def __init__(self, expression: Optional[str] = None):
+        """
+        Args:
+            expression: 评分表达式，None 表示使用 DEFAULT_PRIORITY_EXPRESSION
+
+        Raises:
+            ValueError: 表达式语法错误或使用了不允许的变量/函数
+        """
+        self.expression = expression or DEFAULT_PRIORITY_EXPRESSION
+        try:
+            tree = ast.parse(self.expression, mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"评分表达式语法错误: {e.msg}")
+        _validate(tree)
+        self._code = compile(tree, "<priority>", "eval")
+        self._vector_functions = {name: impl[0] for name, impl in _FUNCTIONS.items()}
+        self._scalar_functions = {name: impl[1] for name, impl in _FUNCTIONS.items()}
+
+    def evaluate(self, columns: Dict[str, Sequence[float]]) -> List[float]:
+        """
+        对列式状态批量求值
+
+        Args:
+            columns: build_columns 返回的列
+
+        Returns:
+            List[float]: 每道题的优先级
+        """
+        size = len(columns["overdue"])
+        if size == 0:
+            return []
+
+        if HAS_NUMPY:
+            namespace = {name: np.asarray(columns[name], dtype=float) for name in VARIABLES}
+            namespace.update(self._vector_functions)
+            namespace["__builtins__"] = {}
+            result = eval(self._code, namespace)
+            return np.broadcast_to(np.asarray(result, dtype=float), (size,)).tolist()
+
+        scores = []
+        for i in range(size):
+            namespace = {name: columns[name][i] for name in VARIABLES}
+            namespace.update(self._scalar_functions)
+            namespace["__builtins__"] = {}
+            scores.append(float(eval(self._code, namespace)))
+        return scores
+
+
+def build_columns(
+    reviews: List[ReviewRecord],
+    questions: List[Question],
+    now: Optional[datetime] = None
+) -> Dict[str, List[float]]:
+    """
+    把复习记录整理为列式状态
+
+    Args:
+        reviews: 复习记录
+        questions: 与 reviews 一一对应的题目
+        now: 计算逾期天数和留存率的时间 (默认当前时间，整批只取一次)
+
+    Returns:
+        Dict[str, List[float]]: 变量名 -> 列
+    """
+    now = now or datetime.now()
+    columns = {name: [] for name in VARIABLES}
+
+    for review, question in zip(reviews, questions):
+        overdue = 0.0
+        if review.next_review:
+            overdue = max(0.0, (now - review.next_review).total_seconds() / 86400)
+
+        retrievability = 1.0
+        if review.review_history and review.stability > 0:
+            elapsed = max(0.0, (now - review.review_history[-1]["timestamp"]).total_seconds() / 86400)
+            retrievability = (1 + elapsed / (9 * review.stability)) ** -1
+
+        columns["overdue"].append(overdue)
+        columns["difficulty"].append(DIFFICULTY_WEIGHTS.get(question.difficulty, 1.0))
+        columns["stability"].append(review.stability)
+        columns["fsrs_difficulty"].append(review.difficulty)
+        columns["reviews"].append(float(len(review.review_history)))
+        columns["retrievability"].append(retrievability)
+
+    return columns
@@ -0,0 +1,446 @@
+"""
+题目查询语言
+把 "tag:dp and difficulty:hard and stability<3 and overdue>2d" 这样的查询解析为语法树，
+编译一次后在列式的题目/复习状态上批量求值，标签和难度条件下推到题目位图索引
+"""
+
+import math
+import operator
+import re
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .fsrs import ReviewRecord
+from .leetcode import Question, QuestionManager, bitset_ids
+
+# 可比较的数值字段 (新题没有复习状态，除 id 和 reviews 外取 NaN，任何比较都不成立)
+NUMERIC_FIELDS = {
+    "id": "题号",
+    "stability": "FSRS 稳定性",
+    "fsrs_difficulty": "FSRS 难度系数",
+    "reviews": "复习次数",
+    "overdue": "逾期天数 (未逾期为 0)",
+    "due": "距离下次复习的天数 (已逾期为负)",
+    "retrievability": "当前预测留存率",
+}
+
+# 匹配字段 (字段:值)
+MATCH_FIELDS = {
+    "tag": "带有该标签，也可写标签前缀或首字母缩写 (如 dp)",
+    "difficulty": "难度 (easy/medium/hard)",
+    "status": "状态 (new/due/done)",
+    "title": "标题包含该文本 (不区分大小写)",
+}
+
+STATUSES = ("new", "due", "done")
+
+# 数值的时间单位后缀 -> 天数
+_UNITS = {"": 1.0, "d": 1.0, "w": 7.0, "h": 1 / 24, "m": 1 / 1440}
+
+_COMPARATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "=": operator.eq,
+    "!=": operator.ne,
+}
+
+_TOKEN_RE = re.compile(r'\s*(?:(<=|>=|!=|[<>=:()])|"([^"]*)"|([^\s<>=!:()"]+))')
+_NUMBER_RE = re.compile(r'([+-]?\d+(?:\.\d+)?)([a-z]?)')
+
+Token = Tuple[str, str]
+
+
+def _tokenize(text: str) -> List[Token]:
+    """切分为 ("op", 运算符)、("str", 引号内文本) 和 ("word", 单词)"""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"无法识别的字符: {text[pos:].strip()[:1]}")
+        op, quoted, word = match.groups()
+        if op is not None:
+            tokens.append(("op", op))
+        elif quoted is not None:
+            tokens.append(("str", quoted))
+        else:
+            tokens.append(("word", word))
+        pos = match.end()
+    return tokens
+
+
+def _parse_number(text: str) -> float:
+    """解析数值，支持 d/w/h/m 时间单位 (换算为天)"""
+    match = _NUMBER_RE.fullmatch(text.lower())
+    if not match or match.group(2) not in _UNITS:
+        raise ValueError(f"无效的数值: {text}")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+class _Parser:
+    """
+    递归下降解析器
+
+    query  := or
+    or     := and ("or" and)*
+    and    := not (["and"] not)*
+    not    := "not" not | term
+    term   := "(" or ")" | 字段 ":" 值 | 字段 比较符 数值
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self) -> Token:
+        token = self._peek()
+        if token is None:
+            raise ValueError("查询不完整")
+        self.pos += 1
+        return token
+
+    def _keyword(self, word: str) -> bool:
+        token = self._peek()
+        if token is not None and token[0] == "word" and token[1].lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> tuple:
+        node = self._parse_or()
+        token = self._peek()
+        if token is not None:
+            raise ValueError(f"无法解析: {token[1]}")
+        return node
+
+    def _parse_or(self) -> tuple:
+        children = [self._parse_and()]
+        while self._keyword("or"):
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else ("or", children)
+
+    def _parse_and(self) -> tuple:
+        children = [self._parse_not()]
+        while True:
+            token = self._peek()
+            if token is None or token == ("op", ")") or (token[0] == "word" and token[1].lower() == "or"):
+                break
+            # 相邻的条件之间可以省略 and
+            self._keyword("and")
+            children.append(self._parse_not())
+        return children[0] if len(children) == 1 else ("and", children)
+
+    def _parse_not(self) -> tuple:
+        if self._keyword("not"):
+            return ("not", self._parse_not())
+        return self._parse_term()
+
+    def _parse_term(self) -> tuple:
+        kind, text = self._take()
+        if (kind, text) == ("op", "("):
+            node = self._parse_or()
+            if self._take() != ("op", ")"):
+                raise ValueError("缺少右括号")
+            return node
+        if kind != "word":
+            raise ValueError(f"此处需要字段名: {text}")
+
+        field = text.lower()
+        kind, op = self._take()
+        if kind != "op" or op not in _COMPARATORS and op != ":":
+            raise ValueError(f"字段 {field} 后需要 ':' 或比较符")
+
+        if op == ":":
+            if field not in MATCH_FIELDS:
+                raise ValueError(f"未知字段: {field} (可用: {', '.join(MATCH_FIELDS)})")
+            kind, value = self._take()
+            if kind == "op":
+                raise ValueError(f"字段 {field} 缺少取值")
+            if field == "status" and value.lower() not in STATUSES:
+                raise ValueError(f"未知状态: {value} (可用: {', '.join(STATUSES)})")
+            return ("match", field, value if field == "title" else value.lower())
+
+        if field not in NUMERIC_FIELDS:
+            raise ValueError(f"未知数值字段: {field} (可用: {', '.join(NUMERIC_FIELDS)})")
+        kind, value = self._take()
+        if kind != "word":
+            raise ValueError(f"字段 {field} 缺少数值")
+        return ("compare", field, op, _parse_number(value))
+
+
+def resolve_tags(value: str, tags) -> List[str]:
+    """
+    把查询中的标签解析为实际标签: 完全匹配，否则按前缀，再否则按首字母缩写
+
+    Args:
+        value: 查询中的标签 (小写)
+        tags: 全部标签
+
+    Returns:
+        List[str]: 匹配的标签
+    """
+    if value in tags:
+        return [value]
+    matched = [tag for tag in tags if tag.lower().startswith(value)]
+    if matched:
+        return matched
+    return [tag for tag in tags if "".join(word[:1] for word in tag.lower().split("-")) == value]
+
+
+def _index_bits(node: tuple, manager: QuestionManager) -> Optional[int]:
+    """
+    用位图索引求出结果的超集，无法利用索引时返回 None (表示全部题目)
+
+    and 只需其中一个子条件可用索引即可缩小范围，or 需要全部子条件可用索引。
+    """
+    kind = node[0]
+    if kind == "match" and node[1] == "tag":
+        bits = 0
+        for tag in resolve_tags(node[2], manager.tag_bits):
+            bits |= manager.tag_bits[tag]
+        return bits
+    if kind == "match" and node[1] == "difficulty":
+        bits = 0
+        for difficulty, difficulty_bits in manager.difficulty_bits.items():
+            if difficulty.lower() == node[2]:
+                bits |= difficulty_bits
+        return bits
+    if kind == "and":
+        result = None
+        for child in node[1]:
+            bits = _index_bits(child, manager)
+            if bits is not None:
+                result = bits if result is None else result & bits
+        return result
+    if kind == "or":
+        result = 0
+        for child in node[1]:
+            bits = _index_bits(child, manager)
+            if bits is None:
+                return None
+            result |= bits
+        return result
+    return None
+
+
+class _Frame:
+    """一次求值的输入: 候选题目ID及其列式状态"""
+
+    def __init__(self, ids: List[int], columns: Dict[str, list], manager: QuestionManager):
+        self.ids = ids
+        self.columns = columns
+        self.manager = manager
+        self.size = len(ids)
+
+    def column(self, name: str):
+        return self.columns[name]
+
+    def member(self, bits: int):
+        """候选题目是否在位图中"""
+        if HAS_NUMPY:
+            return np.isin(self.columns["id"], bitset_ids(bits), assume_unique=True)
+        members = set(bitset_ids(bits))
+        return [qid in members for qid in self.ids]
+
+    def where(self, values: List[bool]):
+        return np.asarray(values, dtype=bool) if HAS_NUMPY else values
+
+
+def _and(a, b):
+    return a & b if HAS_NUMPY else [x and y for x, y in zip(a, b)]
+
+
+def _or(a, b):
+    return a | b if HAS_NUMPY else [x or y for x, y in zip(a, b)]
+
+
+def _not(a):
+    return ~a if HAS_NUMPY else [not x for x in a]
+
+
+def _compare(column, op: str, value: float):
+    compare = _COMPARATORS[op]
+    if HAS_NUMPY:
+        return compare(column, value)
+    return [compare(x, value) for x in column]
+
+
+def _isnan(column):
+    return np.isnan(column) if HAS_NUMPY else [math.isnan(x) for x in column]
+
+
+def _compile(node: tuple) -> Callable[[_Frame], list]:
+    """把语法树编译为在 _Frame 上求布尔掩码的函数"""
+    kind = node[0]
+
+    if kind in ("and", "or"):
+        parts = [_compile(child) for child in node[1]]
+        combine = _and if kind == "and" else _or
+
+        def run(frame):
+            mask = parts[0](frame)
+            for part in parts[1:]:
+                mask = combine(mask, part(frame))
+            return mask
+        return run
+
+    if kind == "not":
+        part = _compile(node[1])
+        return lambda frame: _not(part(frame))
+
+    if kind == "compare":
+        _, field, op, value = node
+        return lambda frame: _compare(frame.column(field), op, value)
+
+    _, field, value = node
+    if field in ("tag", "difficulty"):
+        return lambda frame: frame.member(_index_bits(node, frame.manager))
+    if field == "title":
+        needle = value.lower()
+        return lambda frame: frame.where(
+            [needle in frame.manager.questions[qid].title.lower() for qid in frame.ids]
+        )
+    # status: 没有下次复习时间的视为新题
+    if value == "new":
+        return lambda frame: _isnan(frame.column("due"))
+    if value == "due":
+        return lambda frame: _compare(frame.column("due"), "<=", 0.0)
+    return lambda frame: _compare(frame.column("due"), ">", 0.0)
+
+
+def build_query_columns(
+    ids: List[int],
+    reviews: Dict[int, ReviewRecord],
+    now: Optional[datetime] = None
+) -> Dict[str, list]:
+    """
+    把候选题目的复习状态整理为列
+
+    Args:
+        ids: 候选题目ID
+        reviews: 题目ID -> 复习记录
+        now: 计算逾期天数和留存率的时间 (默认当前时间)
+
+    Returns:
+        Dict[str, list]: 字段名 -> 列 (有 numpy 时为数组)
+    """
+    now = now or datetime.now()
+    nan = float("nan")
+    columns = {name: [] for name in NUMERIC_FIELDS}
+
+    for qid in ids:
+        review = reviews.get(qid)
+        columns["id"].append(qid)
+        if review is None:
+            columns["stability"].append(nan)
+            columns["fsrs_difficulty"].append(nan)
+            columns["reviews"].append(0.0)
+            columns["overdue"].append(nan)
+            columns["due"].append(nan)
+            columns["retrievability"].append(nan)
+            continue
+
+        due = nan
+        if review.next_review:
+            due = (review.next_review - now).total_seconds() / 86400
+        retrievability = nan
+        if review.review_history and review.stability > 0:
+            elapsed = max(0.0, (now - review.review_history[-1]["timestamp"]).total_seconds() / 86400)
+            retrievability = (1 + elapsed / (9 * review.stability)) ** -1
+
+        columns["stability"].append(review.stability)
+        columns["fsrs_difficulty"].append(review.difficulty)
+        columns["reviews"].append(float(len(review.review_history)))
+        columns["overdue"].append(max(0.0, -due) if not math.isnan(due) else nan)
+        columns["due"].append(due)
+        columns["retrievability"].append(retrievability)
+
+    if HAS_NUMPY:
+        columns = {
+            name: np.asarray(column, dtype=np.int64 if name == "id" else float)
+            for name, column in columns.items()
+        }
+    return columns
+
+
+class Query:
+    """编译后的查询"""
+
+    def __init__(self, text: str):
+        """
+        Args:
+            text: 查询文本
+
+        Raises:
+            ValueError: 查询语法错误或使用了未知字段
+        """
+        self.text = text
+        self.tree = _Parser(text).parse()
+        self._predicate = _compile(self.tree)
+
+    def candidate_ids(self, manager: QuestionManager) -> List[int]:
+        """通过标签/难度索引得到的候选题目ID (升序)"""
+        bits = _index_bits(self.tree, manager)
+        if bits is None:
+            return sorted(manager.questions)
+        return bitset_ids(bits)
+
+    def execute(
+        self,
+        manager: QuestionManager,
+        reviews: Dict[int, ReviewRecord],
+        now: Optional[datetime] = None
+    ) -> List[int]:
+        """
+        执行查询
+
+        Args:
+            manager: 题目管理器
+            reviews: 题目ID -> 复习记录
+            now: 计算时间相关字段的时间 (默认当前时间)
+
+        Returns:
+            List[int]: 满足条件的题目ID (升序)
+        """
+        ids = self.candidate_ids(manager)
+        if not ids:
+            return []
+        frame = _Frame(ids, build_query_columns(ids, reviews, now), manager)
+        mask = self._predicate(frame)
+        if HAS_NUMPY:
+            return frame.columns["id"][np.asarray(mask, dtype=bool)].tolist()
+        return [qid for qid, keep in zip(ids, mask) if keep]
+
+
+def query_record(question: Question, review: Optional[ReviewRecord]) -> dict:
+    """查询结果的一行 (NDJSON 输出格式)"""
+    record = {
+        "id": question.id,
+        "title": question.title,
+        "difficulty": question.difficulty,
+        "tags": question.tags,
+        "stability": None,
+        "fsrs_difficulty": None,
+        "reviews": 0,
+        "next_review": None,
+    }
+    if review is not None:
+        record.update({
+            "stability": round(review.stability, 4),
+            "fsrs_difficulty": round(review.difficulty, 4),
+            "reviews": len(review.review_history),
+            "next_review": review.next_review.isoformat() if review.next_review else None,
+        })
+    return record
@@ -0,0 +1,192 @@
+"""
+题目描述渲染
+把 LeetCode 的 HTML 题目描述转换为终端纯文本，结果按内容哈希缓存，
+题目添加/同步时渲染一次，显示时只需读取缓存
+"""
+
+import hashlib
+import os
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import List, Optional
+
+# 渲染规则变化时递增，旧缓存自然失效
+RENDER_VERSION = 1
+
+# 代码块的缩进
+CODE_INDENT = "    "
+
+_BLOCK_TAGS = {"p", "div", "pre", "ul", "ol", "li", "table", "tr", "blockquote",
+               "h1", "h2", "h3", "h4", "h5", "h6"}
+_SKIP_TAGS = {"script", "style"}
+_SPACES_RE = re.compile(r"[ \t\r\n\f\xa0]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+class _TerminalRenderer(HTMLParser):
+    """
+    HTML -> 纯文本
+
+    段落之间空一行，<pre> 内保留原始换行并缩进，列表项加 "-" 或序号并按层级缩进，
+    <sup>/<sub> 渲染为 ^ 和 _ (如 10^4)，行内 <code> 保持原文。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self.current = ""
+        self.pre_depth = 0
+        self.skip_depth = 0
+        # 每层列表的下一个序号，None 表示无序列表
+        self.lists: List[Optional[int]] = []
+        # 当前行只有列表项标记 (如 <li><p>...)，此时不换行
+        self.marker_only = False
+
+    def _break(self, blank: bool = False):
+        """结束当前行，blank 为 True 时额外空一行"""
+        if self.marker_only:
+            return
+        if self.current.strip():
+            self.lines.append(self.current.rstrip())
+        self.current = ""
+        if blank and self.lines and self.lines[-1] != "":
+            self.lines.append("")
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "br":
+            self._break()
+        elif tag == "pre":
+            self._break(blank=True)
+            self.pre_depth += 1
+        elif tag in ("ul", "ol"):
+            self._break(blank=not self.lists)
+            self.lists.append(1 if tag == "ol" else None)
+        elif tag == "li":
+            self._break()
+            indent = "  " * max(0, len(self.lists) - 1)
+            if self.lists and self.lists[-1] is not None:
+                self.current = f"{indent}{self.lists[-1]}. "
+                self.lists[-1] += 1
+            else:
+                self.current = f"{indent}- "
+            self.marker_only = True
+        elif tag == "sup":
+            self.current += "^"
+        elif tag == "sub":
+            self.current += "_"
+        elif tag == "img":
+            self.current += "[图片]"
+        elif tag in _BLOCK_TAGS:
+            self._break(blank=True)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == "pre":
+            self.pre_depth = max(0, self.pre_depth - 1)
+            self._break(blank=True)
+        elif tag in ("ul", "ol"):
+            if self.lists:
+                self.lists.pop()
+            self._break(blank=not self.lists)
+        elif tag == "li":
+            self.marker_only = False
+            self._break()
+        elif tag in _BLOCK_TAGS:
+            self._break(blank=True)
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.pre_depth:
+            # 代码块保留原始换行 (包括空行)
+            self.marker_only = False
+            for i, line in enumerate(data.split("\n")):
+                if i > 0:
+                    self.lines.append(self.current.rstrip())
+                    self.current = ""
+                if line.strip() and not self.current:
+                    self.current = CODE_INDENT
+                self.current += line
+            return
+        text = _SPACES_RE.sub(" ", data)
+        if not self.current.strip() or self.marker_only:
+            text = text.lstrip()
+        if text:
+            self.marker_only = False
+        self.current += text
+
+    def render(self, content: str) -> str:
+        self.feed(content)
+        self.close()
+        self._break()
+        return _BLANK_LINES_RE.sub("\n\n", "\n".join(self.lines)).strip()
+
+
+def render_html(content: str) -> str:
+    """
+    把题目描述 HTML 渲染为终端纯文本
+
+    Args:
+        content: HTML 题目描述
+
+    Returns:
+        str: 纯文本
+    """
+    if not content:
+        return ""
+    return _TerminalRenderer().render(content)
+
+
+def content_hash(content: str) -> str:
+    """题目描述的缓存键 (包含渲染版本号)"""
+    return hashlib.sha1(f"{RENDER_VERSION}\0{content}".encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    按内容哈希保存的渲染结果
+
+    每个结果保存为 rendered/<哈希>.txt，读取只需打开一个小文件，
+    内容相同的题目共用同一份结果。
+    """
+
+    def __init__(self, data_dir):
+        self.cache_dir = Path(data_dir) / "rendered"
+
+    def _path(self, content: str) -> Path:
+        return self.cache_dir / f"{content_hash(content)}.txt"
+
+    def get(self, content: str) -> Optional[str]:
+        """读取缓存，未命中返回 None"""
+        try:
+            return self._path(content).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(self, content: str) -> str:
+        """
+        渲染并写入缓存 (已存在时直接返回)
+
+        Args:
+            content: HTML 题目描述
+
+        Returns:
+            str: 渲染结果
+        """
+        cached = self.get(content)
+        if cached is not None:
+            return cached
+        text = render_html(content)
+        path = self._path(content)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"保存题目描述缓存失败: {e}")
+        return text
@@ -0,0 +1,141 @@
+"""
+按天汇总的复习统计
+每次复习时增量更新，窗口统计和热力图只需遍历窗口内的天数
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .fsrs import ReviewRecord
+
+# 评分不低于该值视为成功
+SUCCESS_RATING = 3
+
+
+def _difficulty_bucket(difficulty: float) -> str:
+    """按 FSRS 难度系数划分难度等级"""
+    if difficulty <= 3:
+        return "easy"
+    if difficulty <= 6:
+        return "medium"
+    return "hard"
+
+
+def _empty_day() -> dict:
+    return {
+        "count": 0,
+        "ratings": [0, 0, 0, 0, 0],  # 评分 1-5 的次数
+        "successes": 0,
+        "stability_sum": 0.0,  # 复习后稳定性之和
+        "difficulty": {"easy": 0, "medium": 0, "hard": 0}
+    }
+
+
+class DailyRollup:
+    """按天汇总的复习统计表"""
+
+    def __init__(self, days: Optional[Dict[str, dict]] = None):
+        # 日期 (YYYY-MM-DD) -> 当天汇总
+        self.days: Dict[str, dict] = days or {}
+
+    def add(self, timestamp: datetime, rating: int, stability: float, difficulty: float):
+        """
+        记录一次复习
+
+        Args:
+            timestamp: 复习时间
+            rating: 评分 (1-5)
+            stability: 复习后的稳定性
+            difficulty: 复习后的 FSRS 难度系数
+        """
+        day = self.days.setdefault(timestamp.date().isoformat(), _empty_day())
+        day["count"] += 1
+        if 1 <= rating <= 5:
+            day["ratings"][rating - 1] += 1
+        if rating >= SUCCESS_RATING:
+            day["successes"] += 1
+        day["stability_sum"] += stability
+        day["difficulty"][_difficulty_bucket(difficulty)] += 1
+
+    def add_latest(self, record: ReviewRecord):
+        """记录复习记录中最近一次复习 (在 add_review 之后调用)"""
+        if record.review_history:
+            latest = record.review_history[-1]
+            self.add(latest["timestamp"], latest["rating"], record.stability, record.difficulty)
+
+    @classmethod
+    def from_reviews(cls, records: List[ReviewRecord]) -> "DailyRollup":
+        """
+        从全部复习记录重建汇总表
+
+        历史条目保存的是复习前的状态，第 i 次复习后的状态取自第 i + 1 条，
+        最后一次取自记录的当前状态。
+        """
+        rollup = cls()
+        for record in records:
+            history = record.review_history
+            for i, entry in enumerate(history):
+                if i + 1 < len(history):
+                    stability, difficulty = history[i + 1]["stability"], history[i + 1]["difficulty"]
+                else:
+                    stability, difficulty = record.stability, record.difficulty
+                rollup.add(entry["timestamp"], entry["rating"], stability, difficulty)
+        return rollup
+
+    def _window(self, days: int, today: Optional[date] = None):
+        today = today or date.today()
+        for offset in range(days - 1, -1, -1):
+            day = today - timedelta(days=offset)
+            yield day, self.days.get(day.isoformat())
+
+    def summary(self, days: int = 30, today: Optional[date] = None) -> Dict[str, any]:
+        """
+        最近 days 天 (含今天) 的统计
+
+        Returns:
+            Dict[str, any]: 复习次数、平均评分、成功率、平均稳定性、评分分布、难度分布
+        """
+        total = 0
+        successes = 0
+        stability_sum = 0.0
+        ratings = [0, 0, 0, 0, 0]
+        difficulty = {"easy": 0, "medium": 0, "hard": 0}
+
+        for _, day in self._window(days, today):
+            if not day:
+                continue
+            total += day["count"]
+            successes += day["successes"]
+            stability_sum += day["stability_sum"]
+            for i, n in enumerate(day["ratings"]):
+                ratings[i] += n
+            for bucket, n in day["difficulty"].items():
+                difficulty[bucket] += n
+
+        rated = sum(ratings)
+        return {
+            "total_reviews": total,
+            "avg_rating": sum((i + 1) * n for i, n in enumerate(ratings)) / rated if rated else 0.0,
+            "success_rate": successes / total if total else 0.0,
+            "avg_stability": stability_sum / total if total else 0.0,
+            "rating_histogram": {i + 1: n for i, n in enumerate(ratings)},
+            "difficulty_distribution": difficulty
+        }
+
+    def heatmap(self, days: int = 365, today: Optional[date] = None) -> List[Tuple[date, int]]:
+        """
+        最近 days 天每天的复习次数
+
+        Returns:
+            List[Tuple[date, int]]: 按日期升序的 (日期, 复习次数)
+        """
+        return [(day, data["count"] if data else 0) for day, data in self._window(days, today)]
+
+    def to_dict(self) -> dict:
+        """转换为字典格式"""
+        return {"days": self.days}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DailyRollup":
+        """从字典创建实例"""
+        return cls(data.get("days", {}))
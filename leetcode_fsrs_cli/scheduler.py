@@ -3,12 +3,28 @@
 负责生成复习计划和安排复习顺序
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+import heapq
+import math
+from datetime import datetime
+from typing import List, Dict, Iterable, Tuple, Optional, Set
 from dataclasses import dataclass
 
 from .fsrs import FSRS, ReviewRecord
 from .leetcode import Question
+from .priority import PriorityExpression, build_columns
+from .rollup import DailyRollup
+
+# 新题建议中各难度的代价
+SUGGESTION_DIFFICULTY_COSTS = {"easy": 1.0, "medium": 2.0, "hard": 3.0}
+
+# 没有任何用时记录时每题的默认用时 (秒)
+DEFAULT_REVIEW_SECONDS = 5 * 60
+# 单题用时估计使用最近几次的记录
+RECENT_DURATIONS = 3
+# 时间预算规划中背包容量的最小单位 (秒)
+KNAPSACK_UNIT_SECONDS = 30
+# 时间预算规划最多考察的候选题数 (按优先级排名)
+KNAPSACK_MAX_CANDIDATES = 300
 
 
 @dataclass
@@ -19,17 +35,137 @@ class ReviewSession:
     priority: float  # 优先级分数，用于排序
 
 
+class ReviewQueue:
+    """
+    练习过程中的复习队列
+
+    以堆维护剩余题目，每次评分后只重新计算被评分题目的优先级：
+    评分不高于 relearn_rating 的题目在再练 relearn_gap 道题之后优先重新出现，
+    同时到达间隔的多道重学题目按重新计算的优先级出队，每道题在一次练习中
+    最多重新出现 max_relearns 次。每次评分的开销为 O(log k)，与队列长度基本无关。
+    """
+
+    def __init__(
+        self,
+        scheduler: "ReviewScheduler",
+        sessions: List[ReviewSession],
+        relearn_rating: int = 1,
+        relearn_gap: int = 3,
+        max_relearns: int = 2
+    ):
+        self.scheduler = scheduler
+        self.relearn_rating = relearn_rating
+        self.relearn_gap = relearn_gap
+        self.max_relearns = max_relearns
+        self._heap = [(-s.priority, i, s) for i, s in enumerate(sessions)]
+        heapq.heapify(self._heap)
+        self._waiting = []  # 未到间隔的重学题目: (可重新出现时已完成的题数, 序号, session)
+        self._ready = []  # 已到间隔的重学题目: (-优先级, 序号, session)
+        self._seq = len(sessions)
+        self._relearns: Dict[int, int] = {}
+        self.served = 0
+        self.total = len(sessions)
+
+    def __len__(self) -> int:
+        return len(self._heap) + len(self._waiting) + len(self._ready)
+
+    def pop(self) -> Optional[ReviewSession]:
+        """取出下一道题，队列为空时返回 None"""
+        # 到达间隔的重学题目优先；没有其他题目可做时不必等待间隔
+        while self._waiting and (self._waiting[0][0] <= self.served or not self._heap):
+            _, seq, session = heapq.heappop(self._waiting)
+            heapq.heappush(self._ready, (-session.priority, seq, session))
+
+        if self._ready:
+            session = heapq.heappop(self._ready)[2]
+        elif self._heap:
+            session = heapq.heappop(self._heap)[2]
+        else:
+            return None
+
+        self.served += 1
+        return session
+
+    def record_rating(self, session: ReviewSession, rating: int) -> bool:
+        """
+        根据评分更新队列 (应在 review.add_review 之后调用)
+
+        Returns:
+            bool: 题目是否会在本次练习中重新出现
+        """
+        qid = session.question.id
+        if rating > self.relearn_rating or self._relearns.get(qid, 0) >= self.max_relearns:
+            return False
+
+        self._relearns[qid] = self._relearns.get(qid, 0) + 1
+        session.priority = self.scheduler._calculate_priority(session.review_record, session.question)
+        heapq.heappush(self._waiting, (self.served + self.relearn_gap, self._seq, session))
+        self._seq += 1
+        self.total += 1
+        return True
+
+
+class DurationEstimator:
+    """
+    复习用时估计
+
+    优先使用该题最近几次的实际用时，其次使用同难度题目的中位数用时，
+    都没有记录时使用 DEFAULT_REVIEW_SECONDS。
+    """
+
+    def __init__(self, review_records: List[ReviewRecord], questions: Dict[int, Question]):
+        self.card_seconds: Dict[int, float] = {}
+        by_difficulty: Dict[str, List[float]] = {}
+
+        for record in review_records:
+            durations = [e["duration"] for e in record.review_history if e.get("duration")]
+            if not durations:
+                continue
+            recent = durations[-RECENT_DURATIONS:]
+            self.card_seconds[record.question_id] = sum(recent) / len(recent)
+            question = questions.get(record.question_id)
+            if question:
+                by_difficulty.setdefault(question.difficulty, []).extend(durations)
+
+        self.difficulty_seconds: Dict[str, float] = {}
+        for difficulty, durations in by_difficulty.items():
+            durations.sort()
+            self.difficulty_seconds[difficulty] = durations[len(durations) // 2]
+
+    def estimate(self, question: Question) -> float:
+        """
+        估计一道题的复习用时
+
+        Returns:
+            float: 用时 (秒)
+        """
+        seconds = self.card_seconds.get(question.id)
+        if seconds is None:
+            seconds = self.difficulty_seconds.get(question.difficulty, DEFAULT_REVIEW_SECONDS)
+        return seconds
+
+
 class ReviewScheduler:
     """复习调度器"""
 
-    def __init__(self, fsrs: FSRS):
+    def __init__(self, fsrs: FSRS, priority_expression: Optional[str] = None):
+        """
+        Args:
+            fsrs: FSRS 算法实例
+            priority_expression: 评分表达式 (见 priority 模块)，None 表示使用默认公式
+
+        Raises:
+            ValueError: 评分表达式无效
+        """
         self.fsrs = fsrs
+        self.priority = PriorityExpression(priority_expression)
 
     def generate_daily_review_plan(
         self,
         due_reviews: List[ReviewRecord],
         questions: Dict[int, Question],
-        limit: int = 20
+        limit: int = 20,
+        now: Optional[datetime] = None
     ) -> List[ReviewSession]:
         """
         生成每日复习计划
@@ -38,28 +174,90 @@ class ReviewScheduler:
             due_reviews: 到期的复习记录
             questions: 题目字典
             limit: 每日复习题目数量限制
+            now: 计算优先级的时间，默认当前时间 (用于预先生成之后日期的计划)
 
         Returns:
             List[ReviewSession]: 复习会话列表
         """
-        sessions = []
+        matched = [(review, questions[review.question_id])
+                   for review in due_reviews if review.question_id in questions]
+        if not matched:
+            return []
 
-        for review in due_reviews:
-            question = questions.get(review.question_id)
-            if question:
-                priority = self._calculate_priority(review, question)
-                session = ReviewSession(question, review, priority)
-                sessions.append(session)
+        reviews = [review for review, _ in matched]
+        matched_questions = [question for _, question in matched]
+        # 整批只构建一次列式状态并向量化求值
+        priorities = self.priority.evaluate(build_columns(reviews, matched_questions, now))
+
+        # 堆选取优先级最高的 limit 个 (O(n log k))，结果与完整排序后截取一致
+        top = heapq.nlargest(limit, range(len(matched)), key=priorities.__getitem__)
+        return [ReviewSession(matched_questions[i], reviews[i], priorities[i]) for i in top]
+
+    def generate_time_budget_plan(
+        self,
+        due_reviews: List[ReviewRecord],
+        questions: Dict[int, Question],
+        minutes: float,
+        estimator: DurationEstimator,
+        new_card_gain: float = 0.1,
+        now: Optional[datetime] = None
+    ) -> List[ReviewSession]:
+        """
+        在时间预算内生成复习计划
+
+        对按优先级排名的候选题求解 0/1 背包：重量为估计用时，价值为复习带来的
+        预期留存率提升 (1 - 当前留存率，新题使用 new_card_gain)。选中的题目
+        保持优先级顺序。
 
-        # 按优先级排序
-        sessions.sort(key=lambda s: s.priority, reverse=True)
+        Args:
+            due_reviews: 到期的复习记录 (可包含新题的空记录)
+            questions: 题目字典
+            minutes: 时间预算 (分钟)
+            estimator: 复习用时估计
+            new_card_gain: 新题的价值，默认与刚到期 (留存率约 0.9) 的题目相当
+            now: 计算优先级和留存率的时间，默认当前时间
+
+        Returns:
+            List[ReviewSession]: 复习会话列表
+        """
+        ranked = self.generate_daily_review_plan(due_reviews, questions, KNAPSACK_MAX_CANDIDATES, now)
+        capacity = int(minutes * 60 // KNAPSACK_UNIT_SECONDS)
+        if not ranked or capacity <= 0:
+            return []
+
+        columns = build_columns([s.review_record for s in ranked], [s.question for s in ranked], now)
+        values = [
+            new_card_gain if not s.review_record.review_history else 1.0 - r
+            for s, r in zip(ranked, columns["retrievability"])
+        ]
+        weights = [
+            max(1, math.ceil(estimator.estimate(s.question) / KNAPSACK_UNIT_SECONDS)) for s in ranked
+        ]
 
-        # 限制数量
-        return sessions[:limit]
+        # best[c]: 容量 c 下的最大价值；keep[i][c]: 第 i 题在容量 c 时是否被选中
+        best = [0.0] * (capacity + 1)
+        keep = []
+        for value, weight in zip(values, weights):
+            row = bytearray(capacity + 1)
+            for c in range(capacity, weight - 1, -1):
+                candidate = best[c - weight] + value
+                if candidate > best[c]:
+                    best[c] = candidate
+                    row[c] = 1
+            keep.append(row)
+
+        chosen = []
+        c = capacity
+        for i in range(len(ranked) - 1, -1, -1):
+            if keep[i][c]:
+                chosen.append(i)
+                c -= weights[i]
+
+        return [ranked[i] for i in sorted(chosen)]
 
     def _calculate_priority(self, review: ReviewRecord, question: Question) -> float:
         """
-        计算复习优先级
+        计算单道题的复习优先级
 
         Args:
             review: 复习记录
@@ -68,90 +266,77 @@ class ReviewScheduler:
         Returns:
             float: 优先级分数
         """
-        now = datetime.now()
-
-        # 基础优先级：距离下次复习时间越近，优先级越高
-        time_priority = 0.0
-        if review.next_review:
-            days_overdue = (now - review.next_review).total_seconds() / (24 * 3600)
-            time_priority = max(0, days_overdue)
-
-        # 难度权重：难度越高，优先级越高
-        difficulty_weights = {"easy": 1.0, "medium": 1.5, "hard": 2.0}
-        difficulty_weight = difficulty_weights.get(question.difficulty, 1.0)
-
-        # 稳定性权重：稳定性越低，优先级越高
-        stability_weight = max(0.1, 5.0 - review.stability)
-
-        # 复习次数权重：复习次数越多，优先级越低（避免过度复习）
-        review_count = len(review.review_history)
-        review_weight = max(0.5, 1.0 - review_count * 0.1)
-
-        # 综合优先级
-        priority = (
-            time_priority * 2.0 +
-            difficulty_weight * 1.5 +
-            stability_weight * 1.0 +
-            review_weight * 0.5
-        )
-
-        return priority
+        return self.priority.evaluate(build_columns([review], [question]))[0]
 
     def get_review_suggestions(
         self,
-        all_questions: List[Question],
-        reviewed_questions: List[int],
-        limit: int = 5
+        questions: Iterable[Question],
+        reviewed_questions: Iterable[int],
+        limit: int = 5,
+        focus_tags: Optional[List[str]] = None,
+        difficulty_budget: Optional[Dict[str, int]] = None
     ) -> List[Question]:
         """
         获取新题目建议
 
+        按加权贪心集合覆盖选题：每一步选择 "新覆盖的标签数 / 难度代价" 最大的题目，
+        难题只有在覆盖更多新标签时才会优先于简单题。标签全部覆盖后按难度代价
+        从低到高补足。使用惰性堆 (覆盖增益只会减少)，每次选题只需重新计算
+        堆顶少数题目的增益。
+
         Args:
-            all_questions: 所有题目
-            reviewed_questions: 已复习的题目ID列表
+            questions: 候选题目 (如对 QuestionManager.get_ids_by_tags(focus_tags) 的结果
+                逐个 get_question 得到的题目)，只考察这些题目
+            reviewed_questions: 已复习的题目ID
             limit: 建议数量限制
+            focus_tags: 只统计这些标签的覆盖，None 表示所有标签
+            difficulty_budget: 每种难度最多选择的题目数，None 表示不限制
 
         Returns:
             List[Question]: 建议的新题目列表
         """
-        # 过滤未复习的题目
-        new_questions = [
-            q for q in all_questions
-            if q.id not in reviewed_questions
-        ]
-
-        # 按难度和标签多样性排序
-        def get_question_score(question: Question) -> float:
-            difficulty_scores = {"easy": 1.0, "medium": 2.0, "hard": 3.0}
-            return difficulty_scores.get(question.difficulty, 1.0)
-
-        new_questions.sort(key=get_question_score)
-
-        # 确保题目类型多样性
+        reviewed = set(reviewed_questions)
+        focus = set(focus_tags) if focus_tags else None
+
+        heap = []
+        tag_sets = []
+        for question in questions:
+            if question.id in reviewed:
+                continue
+            tags = set(question.tags) if focus is None else set(question.tags) & focus
+            cost = SUGGESTION_DIFFICULTY_COSTS.get(question.difficulty, 1.0)
+            heap.append((-len(tags) / cost, cost, len(tag_sets), len(tags)))
+            tag_sets.append((question, tags))
+        heapq.heapify(heap)
+
+        budget = dict(difficulty_budget) if difficulty_budget else None
+        covered: Set[str] = set()
         selected_questions = []
-        selected_tags = set()
 
-        for question in new_questions:
-            if len(selected_questions) >= limit:
-                break
+        while heap and len(selected_questions) < limit:
+            _, cost, index, gain = heapq.heappop(heap)
+            question, tags = tag_sets[index]
+            if budget is not None and budget.get(question.difficulty, limit) <= 0:
+                continue
 
-            # 检查是否有新的标签
-            new_tags = set(question.tags) - selected_tags
-            if new_tags or not selected_questions:
-                selected_questions.append(question)
-                selected_tags.update(question.tags)
+            current_gain = len(tags - covered)
+            if current_gain != gain:
+                # 增益已过期，更新后放回堆中
+                heapq.heappush(heap, (-current_gain / cost, cost, index, current_gain))
+                continue
 
-        # 如果还不够，补充剩余的题目
-        if len(selected_questions) < limit:
-            remaining = [q for q in new_questions if q not in selected_questions]
-            selected_questions.extend(remaining[:limit - len(selected_questions)])
+            selected_questions.append(question)
+            covered |= tags
+            if budget is not None and question.difficulty in budget:
+                budget[question.difficulty] -= 1
 
         return selected_questions
 
     def calculate_review_progress(
         self,
         sessions: List[ReviewSession],
-        completed_count: int
+        completed_count: int,
+        estimator: Optional[DurationEstimator] = None
     ) -> Dict[str, float]:
         """
         计算复习进度
@@ -159,6 +344,7 @@ class ReviewScheduler:
         Args:
             sessions: 复习会话列表
             completed_count: 已完成复习数量
+            estimator: 复习用时估计，None 表示每题按5分钟计算
 
         Returns:
             Dict[str, float]: 进度统计
@@ -174,8 +360,11 @@ class ReviewScheduler:
         completion_rate = completed_count / total_count
         remaining_count = total_count - completed_count
 
-        # 估计剩余时间（假设每题平均5分钟）
-        estimated_time = remaining_count * 5
+        # 估计剩余时间 (分钟)，没有用时估计时假设每题平均5分钟
+        if estimator is not None:
+            estimated_time = sum(estimator.estimate(s.question) for s in sessions[completed_count:]) / 60
+        else:
+            estimated_time = remaining_count * DEFAULT_REVIEW_SECONDS / 60
 
         return {
             "completion_rate": completion_rate,
@@ -186,70 +375,22 @@ class ReviewScheduler:
     def get_study_analytics(
         self,
         review_records: List[ReviewRecord],
-        time_period: int = 30  # 天
+        time_period: int = 30,  # 天
+        rollup: Optional[DailyRollup] = None
     ) -> Dict[str, any]:
         """
         获取学习分析
 
+        统计时间范围内的每一次复习 (而不只是每道题的最近一次)。
+
         Args:
-            review_records: 复习记录列表
+            review_records: 复习记录列表 (提供 rollup 时不使用)
             time_period: 分析的时间周期（天）
+            rollup: 已持久化的按天汇总表，提供时只需遍历 time_period 天
 
         Returns:
             Dict[str, any]: 分析数据
         """
-        now = datetime.now()
-        cutoff_date = now - timedelta(days=time_period)
-
-        # 过滤指定时间范围内的复习记录
-        recent_reviews = []
-        for record in review_records:
-            if record.review_history:
-                last_review = record.review_history[-1]["timestamp"]
-                if last_review >= cutoff_date:
-                    recent_reviews.append(record)
-
-        if not recent_reviews:
-            return {
-                "total_reviews": 0,
-                "avg_rating": 0.0,
-                "success_rate": 0.0,
-                "avg_stability": 0.0,
-                "difficulty_distribution": {}
-            }
-
-        # 计算统计数据
-        total_reviews = len(recent_reviews)
-
-        # 平均评分
-        ratings = [
-            review.review_history[-1]["rating"]
-            for review in recent_reviews
-            if review.review_history
-        ]
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0.0
-
-        # 成功率（评分>=3视为成功）
-        success_count = sum(1 for rating in ratings if rating >= 3)
-        success_rate = success_count / len(ratings) if ratings else 0.0
-
-        # 平均稳定性
-        avg_stability = sum(r.stability for r in recent_reviews) / total_reviews
-
-        # 难度分布
-        difficulty_distribution = {"easy": 0, "medium": 0, "hard": 0}
-        for review in recent_reviews:
-            if review.difficulty <= 3:
-                difficulty_distribution["easy"] += 1
-            elif review.difficulty <= 6:
-                difficulty_distribution["medium"] += 1
-            else:
-                difficulty_distribution["hard"] += 1
-
-        return {
-            "total_reviews": total_reviews,
-            "avg_rating": avg_rating,
-            "success_rate": success_rate,
-            "avg_stability": avg_stability,
-            "difficulty_distribution": difficulty_distribution
-        }
\ No newline at end of file
+        if rollup is None:
+            rollup = DailyRollup.from_reviews(review_records)
+        return rollup.summary(time_period)
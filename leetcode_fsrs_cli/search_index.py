@@ -0,0 +1,265 @@
+"""
+题目全文搜索索引
+对标题、标签、slug 和去除 HTML 的题目描述建立倒排索引，按 BM25 排序
+"""
+
+import bisect
+import heapq
+import json
+import math
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+# BM25 参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 各字段的词频权重
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "slug": 1.0, "content": 1.0}
+
+# 前缀扩展最多保留的词数 (按文档频率取最常见的补全)，避免一两个字母的前缀扩展出上千个词
+PREFIX_EXPANSION_LIMIT = 50
+
+# 索引文件格式版本，格式变化时旧索引会被重建
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]")
+
+
+def tokenize(text: str) -> List[str]:
+    """切分为小写英文/数字词和单个汉字"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def strip_html(content: str) -> str:
+    """去除 HTML 标签和常见实体"""
+    if not content:
+        return ""
+    content = re.sub(r'<[^>]+>', ' ', content)
+    return (content.replace('&nbsp;', ' ').replace('&lt;', '<').replace('&gt;', '>')
+            .replace('&amp;', '&').replace('&quot;', '"'))
+
+
+def slug_from_url(url: str) -> str:
+    """从题目链接中提取 slug"""
+    match = re.search(r'/problems/([^/]+)', url or "")
+    return match.group(1) if match else ""
+
+
+def slugify(title: str) -> str:
+    """按 LeetCode 的规则由标题生成 slug (如 "Pow(x, n)" -> "powx-n")"""
+    slug = re.sub(r"[^a-z0-9\s-]", "", title.lower())
+    return re.sub(r"[\s-]+", "-", slug).strip("-")
+
+
+def document_terms(question) -> Dict[str, float]:
+    """
+    计算题目各词的加权词频
+
+    Args:
+        question: 题目对象
+
+    Returns:
+        Dict[str, float]: 词 -> 加权词频
+    """
+    fields = {
+        "title": tokenize(question.title),
+        "tags": [t for tag in question.tags for t in tokenize(tag.replace("-", " "))],
+        "slug": tokenize(question.slug.replace("-", " ")),
+        "content": tokenize(strip_html(question.content)),
+    }
+    terms: Dict[str, float] = {}
+    for field, tokens in fields.items():
+        weight = FIELD_WEIGHTS[field]
+        for token in tokens:
+            terms[token] = terms.get(token, 0.0) + weight
+    return terms
+
+
+class SearchIndex:
+    """BM25 倒排索引，支持增量添加/删除题目"""
+
+    def __init__(self):
+        # 词 -> {题目ID: 加权词频}
+        self.postings: Dict[str, Dict[int, float]] = {}
+        # 题目ID -> 加权文档长度
+        self.doc_lengths: Dict[int, float] = {}
+        self.total_length = 0.0
+        # 排序的词表，用于按前缀二分查找扩展词
+        self.terms: List[str] = []
+        # 各题目的 BM25 长度归一化项，索引变化后在下一次搜索时重新计算
+        self._norms: Optional[Dict[int, float]] = None
+
+    @classmethod
+    def build(cls, questions) -> "SearchIndex":
+        """为一组题目建立索引"""
+        index = cls()
+        for question in questions:
+            index._add_postings(question)
+        index.terms = sorted(index.postings)
+        return index
+
+    def add(self, question):
+        """添加题目 (已存在时先删除旧内容)"""
+        if question.id in self.doc_lengths:
+            self.remove(question)
+        for term in self._add_postings(question):
+            bisect.insort(self.terms, term)
+
+    def _add_postings(self, question) -> List[str]:
+        """写入倒排表，返回新出现的词 (不维护 terms)"""
+        terms = document_terms(question)
+        new_terms = []
+        for term, tf in terms.items():
+            docs = self.postings.get(term)
+            if docs is None:
+                docs = self.postings[term] = {}
+                new_terms.append(term)
+            docs[question.id] = tf
+        length = sum(terms.values())
+        self.doc_lengths[question.id] = length
+        self.total_length += length
+        self._norms = None
+        return new_terms
+
+    def remove(self, question):
+        """删除题目，question 需与添加时的内容一致"""
+        length = self.doc_lengths.pop(question.id, None)
+        if length is None:
+            return
+        self.total_length -= length
+        self._norms = None
+        for term in document_terms(question):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(question.id, None)
+                if not docs:
+                    del self.postings[term]
+                    i = bisect.bisect_left(self.terms, term)
+                    if i < len(self.terms) and self.terms[i] == term:
+                        del self.terms[i]
+
+    def _expand(self, token: str) -> List[str]:
+        """
+        词不在索引中时按前缀扩展 (用于输入未完成的单词)
+
+        在排序词表上二分查找前缀范围，范围内超过 PREFIX_EXPANSION_LIMIT 个词时
+        只保留文档频率最高的几个。
+        """
+        if token in self.postings:
+            return [token]
+        start = bisect.bisect_left(self.terms, token)
+        # 词只含小写字母、数字和单个汉字，前缀后接 \uffff 即为前缀范围的上界
+        end = bisect.bisect_left(self.terms, token + "\uffff", start)
+        if end - start <= PREFIX_EXPANSION_LIMIT:
+            return self.terms[start:end]
+        return heapq.nlargest(PREFIX_EXPANSION_LIMIT, self.terms[start:end],
+                              key=lambda term: len(self.postings[term]))
+
+    def expand(self, query: str) -> Dict[str, List[str]]:
+        """
+        计算查询中每个词的扩展词，可传给 search 和 unknown_tokens 复用
+
+        Returns:
+            Dict[str, List[str]]: 查询词 -> 索引中的匹配词 (无匹配时为空列表)
+        """
+        return {token: self._expand(token) for token in tokenize(query)}
+
+    def unknown_tokens(self, query: str, expansions: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        """查询中既没有完全匹配也没有前缀匹配的词 (通常是拼写错误)"""
+        expansions = expansions if expansions is not None else self.expand(query)
+        return [token for token in tokenize(query) if not expansions.get(token)]
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        expansions: Optional[Dict[str, List[str]]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        按 BM25 搜索
+
+        Args:
+            query: 查询文本
+            limit: 返回数量，None 表示全部
+            expansions: expand(query) 的结果，None 时在此计算
+
+        Returns:
+            List[Tuple[int, float]]: 按得分降序的 (题目ID, 得分)
+        """
+        expansions = expansions if expansions is not None else self.expand(query)
+        n_docs = len(self.doc_lengths)
+        if n_docs == 0:
+            return []
+        if self._norms is None:
+            avg_length = self.total_length / n_docs or 1.0
+            self._norms = {
+                qid: BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                for qid, length in self.doc_lengths.items()
+            }
+        norms = self._norms
+
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            for term in expansions.get(token, ()):
+                docs = self.postings[term]
+                weight = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5)) * (BM25_K1 + 1)
+                for qid, tf in docs.items():
+                    scores[qid] = scores.get(qid, 0.0) + weight * tf / (tf + norms[qid])
+
+        # 查询为题号时该题排在最前
+        stripped = query.strip()
+        if stripped.isdigit() and int(stripped) in self.doc_lengths:
+            scores[int(stripped)] = float("inf")
+
+        if limit is not None:
+            return heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def save(self, path, source: dict):
+        """
+        保存索引
+
+        Args:
+            path: 索引文件路径
+            source: 题库文件的签名，加载时用于判断索引是否过期
+        """
+        data = {
+            "version": INDEX_VERSION,
+            "source": source,
+            "postings": {term: {str(qid): tf for qid, tf in docs.items()} for term, docs in self.postings.items()},
+            "doc_lengths": {str(qid): length for qid, length in self.doc_lengths.items()},
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, source: dict) -> Optional["SearchIndex"]:
+        """
+        加载索引，文件不存在、格式不符或与题库签名不一致时返回 None
+
+        Args:
+            path: 索引文件路径
+            source: 当前题库文件的签名
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        if data.get("version") != INDEX_VERSION or data.get("source") != source:
+            return None
+
+        index = cls()
+        index.postings = {
+            term: {int(qid): tf for qid, tf in docs.items()} for term, docs in data["postings"].items()
+        }
+        index.doc_lengths = {int(qid): length for qid, length in data["doc_lengths"].items()}
+        index.terms = sorted(index.postings)
+        index.total_length = sum(index.doc_lengths.values())
+        return index
@@ -5,11 +5,15 @@
 
 import json
 import os
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 
 from .fsrs import ReviewRecord
+from .rollup import DailyRollup
+from .load_balance import LoadBalancer
+from .plan_cache import bump_generation
+from .priority import DEFAULT_PRIORITY_EXPRESSION
 
 
 class StorageManager:
@@ -27,6 +31,16 @@ class StorageManager:
         self.reviews_file = self.data_dir / "reviews.json"
         self.config_file = self.data_dir / "config.json"
         self.questions_file = self.data_dir / "questions.json"
+        self.optimizer_state_file = self.data_dir / "optimizer_state.json"
+        self.optimizer_cards_file = self.data_dir / "optimizer_cards.ndjson"
+        self.optimizer_checkpoint_file = self.data_dir / "optimizer_checkpoint.json"
+        self.tune_cache_file = self.data_dir / "tune_cache.json"
+        self.candidate_params_file = self.data_dir / "candidate_params.json"
+        self.auto_optimize_lock_file = self.data_dir / "auto_optimize.lock"
+        self.auto_optimize_stamp_file = self.data_dir / "auto_optimize.stamp"
+        self.declined_candidate_file = self.data_dir / "declined_candidate.json"
+        self.daily_stats_file = self.data_dir / "daily_stats.json"
+        self.due_index_file = self.data_dir / "due_index.json"
         self._ensure_data_dir()
 
     def _ensure_data_dir(self):
@@ -80,6 +94,7 @@ class StorageManager:
                 json.dump(data, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"保存复习记录失败: {e}")
+        bump_generation(self.data_dir)
 
     def get_review_record(self, question_id: int) -> Optional[ReviewRecord]:
         """
@@ -121,6 +136,11 @@ class StorageManager:
 
         del reviews[question_id]
         self.save_reviews(reviews)
+        # 按天汇总无法按题目撤销，删除后在下次读取时重建
+        if os.path.exists(self.daily_stats_file):
+            os.remove(self.daily_stats_file)
+        if os.path.exists(self.due_index_file):
+            os.remove(self.due_index_file)
         return True
 
     # 配置相关方法
@@ -137,6 +157,12 @@ class StorageManager:
             "auto_update_due": True,
             "show_progress_bar": True,
             "language": "zh",
+            "auto_optimize": True,  # 新复习足够多时在后台自动优化参数
+            "auto_optimize_min_reviews": 100,
+            "auto_apply_candidate": False,  # 自动应用后台优化结果，否则在练习前询问
+            "load_balance": True,  # 在理想间隔附近选择到期题数较少的日期，目标为 daily_review_limit
+            # 复习优先级评分表达式，可用变量和函数见 priority 模块
+            "priority_expression": DEFAULT_PRIORITY_EXPRESSION,
             "fsrs_params": {
                 "w": [
                     0.4, 0.6, 2.4, 5.8, 4.93, 0.94, 0.86, 0.01,
@@ -146,7 +172,9 @@ class StorageManager:
                 "maximum_interval": 36500,
                 "easy_bonus": 1.3,
                 "hard_factor": 1.2
-            }
+            },
+            # 按 "tag:<标签>" / "difficulty:<难度>" 分组的权重，未匹配的题目使用 fsrs_params
+            "fsrs_param_groups": {}
         }
 
         if not os.path.exists(self.config_file):
@@ -184,6 +212,7 @@ class StorageManager:
                 json.dump(config, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"保存配置失败: {e}")
+        bump_generation(self.data_dir)
 
     def update_config(self, updates: dict):
         """
@@ -196,8 +225,144 @@ class StorageManager:
         config.update(updates)
         self.save_config(config)
 
+    # 优化器状态相关方法
+
+    def load_optimizer_state(self) -> Optional[dict]:
+        """
+        加载上次参数拟合的状态
+
+        Returns:
+            Optional[dict]: 拟合状态 (权重、Loss、水位线、题目最终状态)，不存在返回None
+        """
+        if not os.path.exists(self.optimizer_state_file):
+            return None
+
+        try:
+            with open(self.optimizer_state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            print(f"加载优化器状态失败: {e}")
+            return None
+
+    def save_optimizer_state(self, state: dict):
+        """
+        保存参数拟合状态
+
+        Args:
+            state: 拟合状态字典
+        """
+        try:
+            with open(self.optimizer_state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"保存优化器状态失败: {e}")
+
+    # 到期索引相关方法
+
+    def _reviews_signature(self) -> Optional[dict]:
+        """复习记录文件的签名，用于判断到期索引是否过期"""
+        try:
+            stat = os.stat(self.reviews_file)
+        except OSError:
+            return None
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def load_due_index(self, target: Optional[int] = None) -> LoadBalancer:
+        """
+        加载按天的到期题数索引
+
+        索引保存时记录复习记录文件的签名，文件不存在、损坏或复习记录在此之后
+        被其他途径修改过 (如未开启负载均衡时练习、恢复备份) 时从复习记录重建。
+        今天之前的登记在加载时丢弃。
+
+        Args:
+            target: 每日目标复习量
+
+        Returns:
+            LoadBalancer: 负载均衡器
+        """
+        balancer = None
+        if os.path.exists(self.due_index_file):
+            try:
+                with open(self.due_index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("source") == self._reviews_signature():
+                    balancer = LoadBalancer.from_dict(data, target)
+            except (json.JSONDecodeError, FileNotFoundError, ValueError) as e:
+                print(f"加载到期索引失败，正在重建: {e}")
+
+        rebuilt = balancer is None
+        if rebuilt:
+            balancer = LoadBalancer.from_reviews(list(self.load_reviews().values()), target)
+        balancer.drop_before(date.today())
+        if rebuilt:
+            self.save_due_index(balancer)
+        return balancer
+
+    def save_due_index(self, balancer: LoadBalancer):
+        """
+        保存到期索引
+
+        Args:
+            balancer: 负载均衡器
+        """
+        data = balancer.to_dict()
+        # 应在写入复习记录之后调用，使签名对应已包含本次调整的复习记录
+        data["source"] = self._reviews_signature()
+        try:
+            with open(self.due_index_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"保存到期索引失败: {e}")
+
     # 统计相关方法
 
+    def load_daily_rollup(self) -> DailyRollup:
+        """
+        加载按天汇总的复习统计，文件不存在或损坏时从复习记录重建
+
+        Returns:
+            DailyRollup: 按天汇总表
+        """
+        if os.path.exists(self.daily_stats_file):
+            try:
+                with open(self.daily_stats_file, 'r', encoding='utf-8') as f:
+                    return DailyRollup.from_dict(json.load(f))
+            except (json.JSONDecodeError, FileNotFoundError) as e:
+                print(f"加载每日统计失败，正在重建: {e}")
+
+        rollup = DailyRollup.from_reviews(list(self.load_reviews().values()))
+        self.save_daily_rollup(rollup)
+        return rollup
+
+    def save_daily_rollup(self, rollup: DailyRollup):
+        """
+        保存按天汇总的复习统计
+
+        Args:
+            rollup: 按天汇总表
+        """
+        try:
+            with open(self.daily_stats_file, 'w', encoding='utf-8') as f:
+                json.dump(rollup.to_dict(), f, ensure_ascii=False)
+        except Exception as e:
+            print(f"保存每日统计失败: {e}")
+
+    def record_daily_review(self, review: ReviewRecord):
+        """
+        把复习记录中最近一次复习计入按天汇总 (在 save_review_record 之后调用)
+
+        Args:
+            review: 复习记录对象
+        """
+        if not os.path.exists(self.daily_stats_file):
+            # 首次使用时整体重建，重建结果已包含这次复习
+            self.load_daily_rollup()
+            return
+        rollup = self.load_daily_rollup()
+        rollup.add_latest(review)
+        self.save_daily_rollup(rollup)
+
     def get_review_stats(self) -> dict:
         """
         获取复习统计信息
@@ -237,15 +402,18 @@ class StorageManager:
             "avg_stability": avg_stability
         }
 
-    def get_due_reviews(self) -> List[ReviewRecord]:
+    def get_due_reviews(self, now: Optional[datetime] = None) -> List[ReviewRecord]:
         """
         获取到期的复习记录
 
+        Args:
+            now: 判断是否到期的时间，默认当前时间
+
         Returns:
             List[ReviewRecord]: 到期的复习记录列表
         """
         reviews = self.load_reviews()
-        now = datetime.now()
+        now = now or datetime.now()
 
         due_reviews = [
             review for review in reviews.values()
@@ -4,6 +4,7 @@
 """
 
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
 import json
@@ -11,6 +12,14 @@ import os
 from pathlib import Path
 import click
 
+from .leetcode import QuestionManager, Question
+
+# 默认同时获取题目详情的请求数
+DEFAULT_CONCURRENCY = 8
+
+# 同步时每写入多少题保存一次题库文件
+SYNC_COMMIT_CHUNK = 50
+
 
 @dataclass
 class SyncReport:
@@ -139,18 +148,27 @@ class SyncManager:
         state = self.get_sync_state()
         return state.get("last_sync")
 
-    def perform_sync(self, full_sync: bool = False) -> SyncReport:
+    def perform_sync(
+        self,
+        full_sync: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        client=None
+    ) -> SyncReport:
         """
         执行同步操作
 
+        题目详情由线程池并发获取 (共享同一个连接池)，结果按远程列表的顺序
+        交给单一写入方处理，每 SYNC_COMMIT_CHUNK 题写入一次题库文件。
+
         Args:
             full_sync: 是否执行完整同步
+            concurrency: 同时获取题目详情的请求数
+            client: API 客户端，None 时使用保存的 Cookie 创建
 
         Returns:
             SyncReport: 同步报告
         """
         from .leetcode_api import client_from_saved_cookie
-        from .leetcode import QuestionManager, Question
 
         report = SyncReport(
             timestamp=datetime.now().isoformat(),
@@ -158,15 +176,14 @@ class SyncManager:
         )
 
         # 1. 获取API客户端
-        client = client_from_saved_cookie()
+        client = client or client_from_saved_cookie()
         if not client or not client.is_authenticated():
             click.echo("❌ 未认证或Cookie已失效")
             return report
 
         # 2. 获取本地题目
         qm = QuestionManager(data_dir=str(self.data_dir))
-        local_questions = qm.questions
-        report.total_count = len(local_questions)
+        report.total_count = len(qm.questions)
 
         # 3. 获取远程题目列表
         click.echo("🔄 正在获取远程题目列表...")
@@ -177,79 +194,39 @@ class SyncManager:
             report.status = "success"  # 视为空列表为成功
             return report
 
-        # 4. 对比和同步
+        # 4. 对比: 确定需要获取详情的 slug
         click.echo(f"🔍 发现 {len(remote_problems)} 个最近提交，正在分析差异...")
-        
-        # 构建 slug 到本地题目的映射，用于检测 ID 变化
-        slug_to_local = {}
-        for q in local_questions.values():
-            # url: https://leetcode.com/problems/{slug}/
-            slug = q.url.split("/problems/")[-1].strip("/")
-            slug_to_local[slug] = q
-
-        with click.progressbar(remote_problems, label="同步进度") as bar:
-            for prob in bar:
-                slug = prob.get("slug")
-                if not slug:
-                    continue
-                    
-                # 检查本地是否已存在该题目 (通过 Slug)
-                existing_q = slug_to_local.get(slug)
-                
-                # 如果存在且不是全量同步，且我们假设ID没变，则跳过
-                # 但为了修复ID问题，我们可能需要更激进一点
-                # 如果 existing_q.id 看起来像内部ID (比如很大)，而我们想要前端ID
-                # 这里简单起见，如果不是 full_sync，我们只在 ID 确实不匹配时才更新
-                
-                if existing_q and not full_sync:
-                    # 如果我们无法轻易知道新ID，就只能跳过
-                    # 但为了修复ID，建议用户运行 --full
-                    report.unchanged_count += 1
-                    continue
-
-                # 获取详细信息
-                detail = client.get_question_detail(slug)
-                if not detail:
-                    continue
-
-                qid = detail.get("id")
-                if not qid:
-                    continue
-
-                # 再次检查 ID 是否存在
-                if qid in local_questions and not full_sync:
-                    report.unchanged_count += 1
-                    continue
-
-                # 创建或更新题目
-                question = Question(
-                    id=qid,
-                    title=detail.get("title"),
-                    difficulty=(detail.get("difficulty") or "Unknown").lower(),
-                    tags=detail.get("tags") or [],
-                    url=f"https://leetcode.com/problems/{slug}/",
-                    content=detail.get("content") or ""
-                )
-                
-                # 检查是否需要迁移 ID (Slug 相同但 ID 不同)
-                if existing_q and existing_q.id != qid:
-                    # ID 发生了变化 (例如从内部ID变成了前端ID)
-                    # 删除旧题目
-                    qm.remove_question(existing_q.id)
-                    # 添加新题目
-                    qm.add_question(question)
-                    report.updated_count += 1
-                    # 更新映射以防万一
-                    slug_to_local[slug] = question
-                elif qid in local_questions:
-                    # ID 相同，更新内容
-                    qm.add_question(question) # add_question 会覆盖
-                    report.updated_count += 1
-                else:
-                    # 新增
-                    qm.add_question(question)
-                    report.new_count += 1
-                    slug_to_local[slug] = question
+        slugs = []
+        seen = set()
+        for prob in remote_problems:
+            slug = prob.get("slug")
+            if not slug:
+                continue
+            # 本地已存在 (通过 slug 索引) 且不是全量同步时跳过；
+            # 需要修复 ID (内部ID -> 前端ID) 时请运行 --full
+            if slug in seen or (qm.get_question_by_slug(slug) is not None and not full_sync):
+                report.unchanged_count += 1
+                continue
+            seen.add(slug)
+            slugs.append(slug)
+
+        # 5. 并发获取详情，按顺序写入
+        concurrency = max(1, concurrency)
+        client.configure_pool(concurrency)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = [executor.submit(client.get_question_detail, slug) for slug in slugs]
+        try:
+            with click.progressbar(length=len(slugs), label="同步进度") as bar:
+                for start in range(0, len(slugs), SYNC_COMMIT_CHUNK):
+                    with qm.batch():
+                        for i in range(start, min(start + SYNC_COMMIT_CHUNK, len(slugs))):
+                            self._commit_detail(qm, slugs[i], futures[i].result(), full_sync, report)
+                            bar.update(1)
+        finally:
+            # 中断时取消尚未开始的请求 (shutdown 的 cancel_futures 需要 Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
 
         report.total_count = len(qm.questions)
         report.status = "success"
@@ -259,6 +236,134 @@ class SyncManager:
         
         return report
 
+    def _commit_detail(self, qm, slug: str, detail: Optional[dict], full_sync: bool, report: SyncReport):
+        """
+        把一道题的详情写入题库 (只在写入线程中按顺序调用)
+
+        Args:
+            qm: 题目管理器
+            slug: 题目 slug
+            detail: get_question_detail 的结果，获取失败为 None
+            full_sync: 是否完整同步
+            report: 同步报告
+        """
+        if not detail:
+            return
+
+        qid = detail.get("id")
+        if not qid:
+            return
+
+        # 再次检查 ID 是否存在
+        if qid in qm.questions and not full_sync:
+            report.unchanged_count += 1
+            return
+
+        # 创建或更新题目
+        question = Question(
+            id=qid,
+            title=detail.get("title"),
+            difficulty=(detail.get("difficulty") or "Unknown").lower(),
+            tags=detail.get("tags") or [],
+            url=f"https://leetcode.com/problems/{slug}/",
+            content=detail.get("content") or "",
+            slug=slug
+        )
+
+        # 检查是否需要迁移 ID (Slug 相同但 ID 不同)
+        existing_q = qm.get_question_by_slug(slug)
+        if existing_q and existing_q.id != qid:
+            # ID 发生了变化 (例如从内部ID变成了前端ID)，删除旧题目后添加新题目
+            qm.remove_question(existing_q.id)
+            qm.add_question(question)
+            report.updated_count += 1
+        elif qid in qm.questions:
+            # ID 相同，更新内容 (包括题库模式下只有元数据的题目)
+            qm.update_question(question)
+            report.updated_count += 1
+        else:
+            # 新增
+            qm.add_question(question)
+            report.new_count += 1
+
+    def perform_catalog_sync(self) -> SyncReport:
+        """
+        一次请求导入完整题库的元数据 (题号、标题、slug、难度)
+
+        新题目的描述和标签标记为待获取，在首次显示时通过 fetch_question_detail 获取。
+        本地已有的题目 (按 slug 或题号) 保持不变。
+
+        Returns:
+            SyncReport: 同步报告
+        """
+        from .leetcode_api import LeetCodeAPIClient, client_from_saved_cookie
+
+        report = SyncReport(
+            timestamp=datetime.now().isoformat(),
+            status="failed"
+        )
+
+        # 题库列表不需要登录，有 Cookie 时一并带上
+        client = client_from_saved_cookie() or LeetCodeAPIClient()
+        qm = QuestionManager(data_dir=str(self.data_dir))
+
+        click.echo("🔄 正在获取完整题库...")
+        catalog = client.get_problem_catalog()
+        if not catalog:
+            return report
+
+        new_questions = []
+        for prob in catalog:
+            if qm.get_question_by_slug(prob["slug"]) is not None or prob["id"] in qm.questions:
+                report.unchanged_count += 1
+                continue
+            new_questions.append(Question(
+                id=prob["id"],
+                title=prob["title"],
+                difficulty=prob["difficulty"],
+                tags=[],
+                url="",
+                slug=prob["slug"],
+                needs_detail=True
+            ))
+
+        report.new_count = qm.add_questions(new_questions)
+        report.total_count = len(qm.questions)
+        report.status = "success"
+        self.add_sync_record(report)
+        return report
+
+    def fetch_question_detail(self, question_manager, question, client=None):
+        """
+        获取题库模式导入的题目的描述和标签并保存
+
+        Args:
+            question_manager: 题目管理器
+            question: needs_detail 为 True 的题目
+            client: API 客户端，None 时使用保存的 Cookie 创建
+
+        Returns:
+            Optional[Question]: 更新后的题目，获取失败时返回 None
+        """
+        from .leetcode_api import LeetCodeAPIClient, client_from_saved_cookie
+
+        client = client or client_from_saved_cookie() or LeetCodeAPIClient()
+        detail = client.get_question_detail(question.slug)
+        if not detail:
+            return None
+
+        updated = Question(
+            id=question.id,
+            title=detail.get("title") or question.title,
+            difficulty=(detail.get("difficulty") or question.difficulty).lower(),
+            tags=detail.get("tags") or [],
+            url="",
+            content=detail.get("content") or "",
+            slug=question.slug
+        )
+        question_manager.update_question(updated)
+        return updated
+
     def compare_remote_and_local(self, remote_questions: List[dict], 
                                  local_questions: Dict[int, dict]) -> tuple:
         """
@@ -0,0 +1,172 @@
+"""
+合成数据生成器
+按给定规模生成确定性的 questions.json / reviews.json，用于性能基准和大规模测试
+"""
+
+import json
+import math
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Tuple
+
+from .fsrs import FSRS, ReviewRecord
+from .leetcode import Question
+
+# 常见 LeetCode 标签
+TAG_POOL = [
+    "array", "string", "hash-table", "dynamic-programming", "math", "sorting",
+    "greedy", "depth-first-search", "binary-search", "database", "breadth-first-search",
+    "tree", "matrix", "two-pointers", "binary-tree", "bit-manipulation", "heap-priority-queue",
+    "stack", "prefix-sum", "simulation", "graph", "design", "counting", "sliding-window",
+    "backtracking", "union-find", "linked-list", "ordered-set", "monotonic-stack", "trie",
+    "recursion", "divide-and-conquer", "queue", "memoization", "topological-sort",
+    "segment-tree", "geometry", "shortest-path", "bitmask", "combinatorics"
+]
+
+TITLE_WORDS = [
+    "Two", "Sum", "Longest", "Substring", "Median", "Sorted", "Arrays", "Valid", "Parentheses",
+    "Merge", "Intervals", "Maximum", "Minimum", "Path", "Binary", "Tree", "Search", "Number",
+    "Islands", "Product", "Subarray", "Palindrome", "Partition", "Kth", "Largest", "Element",
+    "Window", "Distinct", "Subsequence", "Course", "Schedule", "Word", "Ladder", "Jump", "Game",
+    "Edit", "Distance", "Coin", "Change", "Rotate", "Image", "Linked", "List", "Cycle", "Graph",
+    "Clone", "Trapping", "Rain", "Water", "Serialize", "Matrix", "Spiral", "Stock", "Profit"
+]
+
+# 难度分布 (与 LeetCode 题库大致相同)
+DIFFICULTY_WEIGHTS = {"easy": 0.25, "medium": 0.52, "hard": 0.23}
+
+
+def _slugify(title: str) -> str:
+    return "-".join(title.lower().split())
+
+
+def generate_questions(n_questions: int, rng: random.Random) -> Dict[int, Question]:
+    """生成 n_questions 道题目"""
+    difficulties = list(DIFFICULTY_WEIGHTS)
+    weights = list(DIFFICULTY_WEIGHTS.values())
+    questions = {}
+    for qid in range(1, n_questions + 1):
+        title = " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 5))) + f" {qid}"
+        slug = _slugify(title)
+        paragraphs = " ".join(rng.choices(TITLE_WORDS, k=rng.randint(40, 120))).lower()
+        questions[qid] = Question(
+            id=qid,
+            title=title,
+            difficulty=rng.choices(difficulties, weights)[0],
+            tags=rng.sample(TAG_POOL, rng.randint(1, 4)),
+            url=f"https://leetcode.com/problems/{slug}/",
+            content=f"<p>{paragraphs}</p>\n<pre><code>Input: nums = [1,2,3]\nOutput: 6</code></pre>"
+        )
+    return questions
+
+
+def _draw_rating(recall_probability: float, rng: random.Random) -> int:
+    """按回忆概率抽取评分：失败为 1，成功时在 2-5 中按常见比例抽取"""
+    if rng.random() > recall_probability:
+        return 1
+    return rng.choices([2, 3, 4, 5], [0.15, 0.55, 0.2, 0.1])[0]
+
+
+def generate_reviews(
+    questions: Dict[int, Question],
+    n_reviews: int,
+    rng: random.Random,
+    end: datetime,
+    days: int = 365,
+    fsrs: FSRS = None
+) -> Dict[int, ReviewRecord]:
+    """
+    为题目生成共约 n_reviews 条复习记录
+
+    每道练习过的题目的复习时间在 [end - days, end] 内随机分布，评分按
+    FSRS 当前状态下的回忆概率抽取 (间隔越久越容易忘记)，再通过
+    ReviewRecord.add_review 回放得到与真实数据一致的状态字段。
+    """
+    fsrs = fsrs or FSRS()
+    if n_reviews <= 0 or not questions:
+        return {}
+
+    qids = sorted(questions)
+    # 大约 60% 的题目被练习过，但至少保证每题平均复习 2 次以上
+    n_cards = max(1, min(len(qids), int(len(qids) * 0.6), n_reviews // 2 or 1))
+    practiced = sorted(rng.sample(qids, n_cards))
+
+    start = end - timedelta(days=days)
+    span = days * 86400
+    base, extra = divmod(n_reviews, n_cards)
+
+    records = {}
+    for i, qid in enumerate(practiced):
+        count = base + (1 if i < extra else 0)
+        if count == 0:
+            continue
+        offsets = sorted(rng.random() * span for _ in range(count))
+        record = ReviewRecord(qid)
+        for offset in offsets:
+            timestamp = start + timedelta(seconds=offset)
+            if record.review_history:
+                last = record.review_history[-1]["timestamp"]
+                elapsed = (timestamp - last).total_seconds() / 86400
+                recall = math.pow(1 + elapsed / (9 * record.stability), -1)
+            else:
+                recall = 0.7
+            record.add_review(timestamp, _draw_rating(recall, rng), fsrs)
+        records[qid] = record
+    return records
+
+
+def generate_dataset(
+    n_questions: int,
+    n_reviews: int,
+    seed: int = 0,
+    end: datetime = None,
+    days: int = 365
+) -> Tuple[Dict[int, Question], Dict[int, ReviewRecord]]:
+    """
+    生成确定性的题目和复习数据集
+
+    Args:
+        n_questions: 题目数量
+        n_reviews: 复习记录总数
+        seed: 随机种子，相同参数和种子得到完全相同的数据
+        end: 复习时间范围的结束时间 (默认 2025-01-01)
+        days: 复习时间范围的天数
+
+    Returns:
+        Tuple[Dict[int, Question], Dict[int, ReviewRecord]]: (题目字典, 复习记录字典)
+    """
+    rng = random.Random(seed)
+    end = end or datetime(2025, 1, 1)
+    questions = generate_questions(n_questions, rng)
+    reviews = generate_reviews(questions, n_reviews, rng, end, days)
+    return questions, reviews
+
+
+def write_dataset(
+    data_dir: str,
+    n_questions: int,
+    n_reviews: int,
+    seed: int = 0,
+    end: datetime = None,
+    days: int = 365
+) -> Tuple[int, int]:
+    """
+    生成数据集并写入 data_dir 下的 questions.json / reviews.json
+
+    文件格式与 QuestionManager / StorageManager 的持久化格式一致。
+
+    Returns:
+        Tuple[int, int]: (写入的题目数, 写入的复习记录条数)
+    """
+    questions, reviews = generate_dataset(n_questions, n_reviews, seed, end, days)
+    path = Path(data_dir)
+    path.mkdir(parents=True, exist_ok=True)
+
+    with open(path / "questions.json", 'w', encoding='utf-8') as f:
+        json.dump({str(qid): q.to_dict() for qid, q in questions.items()}, f, ensure_ascii=False, indent=2)
+
+    with open(path / "reviews.json", 'w', encoding='utf-8') as f:
+        json.dump({str(qid): r.to_dict() for qid, r in reviews.items()}, f, ensure_ascii=False, indent=2)
+
+    return len(questions), sum(len(r.review_history) for r in reviews.values())
@@ -0,0 +1,161 @@
+"""
+调度超参数调优
+在复习历史上回放不同的 easy_bonus / hard_factor / maximum_interval 组合，
+按预测留存率和复习负担评分
+"""
+
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+from .fsrs import FSRS
+from .optimizer import prepare_cards, pad_weights
+
+# 默认搜索网格
+DEFAULT_GRID = {
+    "easy_bonus": [1.1, 1.3, 1.5, 1.8],
+    "hard_factor": [0.8, 1.0, 1.2, 1.4],
+    "maximum_interval": [180, 365, 36500]
+}
+
+# 缓存保留的最大条目数
+CACHE_MAX_ENTRIES = 20
+
+
+def simulate_schedule(params: dict, cards: List[Tuple[List[int], List[float]]]) -> Dict[str, float]:
+    """
+    按给定参数回放所有题目的评分序列
+
+    假设用户总是在到期当天复习且评分与历史一致：每次复习的间隔由上一次
+    计算出的间隔决定，记录到期时的预测留存率和每天需要复习的次数 (1/间隔)。
+
+    Returns:
+        Dict[str, float]: retention (平均预测留存率), workload (每题每天平均复习次数)
+    """
+    fsrs = FSRS(params)
+    total_retention = 0.0
+    total_workload = 0.0
+    steps = 0
+
+    for ratings, _ in cards:
+        stability, difficulty = fsrs.get_initial_state()
+        elapsed = 0.0
+        for rating in ratings:
+            stability, difficulty, interval = fsrs.next_interval(stability, difficulty, rating, elapsed)
+            total_retention += (1 + interval / (9 * stability)) ** -1
+            total_workload += 1 / interval
+            elapsed = interval
+            steps += 1
+
+    if steps == 0:
+        return {"retention": 0.0, "workload": 0.0}
+    return {"retention": total_retention / steps, "workload": total_workload / steps}
+
+
+# 工作进程中的数据集，由进程池 initializer 设置
+_WORKER_CARDS: List[Tuple[List[int], List[float]]] = []
+
+
+def _init_worker(cards):
+    global _WORKER_CARDS
+    _WORKER_CARDS = cards
+
+
+def _evaluate_combination(params: dict) -> Dict[str, float]:
+    return simulate_schedule(params, _WORKER_CARDS)
+
+
+def dataset_hash(cards, base_params: dict, grid: Dict[str, List[float]], workload_weight: float) -> str:
+    """复习数据、基础参数和搜索网格的哈希，作为结果缓存的键"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([base_params, grid, workload_weight], sort_keys=True).encode())
+    for card in cards:
+        digest.update(json.dumps(card).encode())
+    return digest.hexdigest()
+
+
+def _load_cache(cache_path: Optional[str]) -> Dict:
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def _save_cache(cache_path: str, cache: Dict):
+    # 只保留最近的条目
+    entries = sorted(cache.items(), key=lambda item: item[1].get("created_at", ""))[-CACHE_MAX_ENTRIES:]
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(entries), f, ensure_ascii=False)
+
+
+def tune_hyperparameters(
+    reviews: List[Dict],
+    base_params: dict,
+    grid: Optional[Dict[str, List[float]]] = None,
+    workload_weight: float = 1.0,
+    workers: Optional[int] = None,
+    cache_path: Optional[str] = None
+) -> Dict:
+    """
+    网格搜索调度超参数
+
+    每个组合在进程池中独立回放，得分 = 平均预测留存率 - workload_weight * 平均复习负担。
+    结果按数据集哈希缓存，相同数据和网格再次调优时直接返回缓存。
+
+    Args:
+        reviews: 复习记录列表 (扁平化)
+        base_params: 当前 FSRS 参数 (网格之外的参数保持不变)
+        grid: 参数名 -> 候选值列表，默认使用 DEFAULT_GRID
+        workload_weight: 复习负担在得分中的权重
+        workers: 进程池大小，None 表示使用 CPU 核数
+        cache_path: 缓存文件路径，None 表示不使用缓存
+
+    Returns:
+        Dict: {"results": 按得分降序的组合列表, "cached": 是否命中缓存, ...}
+    """
+    if not reviews:
+        raise ValueError("没有复习记录可供调优")
+
+    grid = grid or DEFAULT_GRID
+    base_params = dict(base_params, w=pad_weights(base_params.get("w", FSRS.get_default_params()["w"])))
+    cards = prepare_cards(reviews)
+    key = dataset_hash(cards, base_params, grid, workload_weight)
+
+    cache = _load_cache(cache_path)
+    if key in cache:
+        return dict(cache[key], cached=True)
+
+    names = [name for name in grid]
+    combinations = [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cards,)) as pool:
+        scores = pool.map(_evaluate_combination, [dict(base_params, **c) for c in combinations],
+                          chunksize=max(1, len(combinations) // 32))
+        results = []
+        for combination, score in zip(combinations, scores):
+            results.append(dict(
+                params=combination,
+                score=score["retention"] - workload_weight * score["workload"],
+                **score
+            ))
+
+    results.sort(key=lambda r: r["score"], reverse=True)
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "n_reviews": len(reviews),
+        "workload_weight": workload_weight,
+        "results": results
+    }
+
+    if cache_path:
+        cache[key] = report
+        _save_cache(cache_path, cache)
+
+    return dict(report, cached=False)
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+from leetcode_fsrs_cli import background
+from leetcode_fsrs_cli.fsrs import FSRS
+from leetcode_fsrs_cli.optimizer import HAS_SCIPY
+from leetcode_fsrs_cli.storage import StorageManager
+from leetcode_fsrs_cli.synthetic import write_dataset
+
+
+class TestBackgroundOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(data_dir=self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    @patch('leetcode_fsrs_cli.background.subprocess.Popen')
+    def test_launch_is_throttled(self, mock_popen):
+        config = {"auto_optimize": True}
+        self.assertTrue(background.maybe_launch(self.storage, config))
+        mock_popen.assert_called_once()
+
+        with open(self.storage.auto_optimize_stamp_file, 'w') as f:
+            f.write("now")
+        self.assertFalse(background.maybe_launch(self.storage, config))
+        self.assertFalse(background.maybe_launch(StorageManager(data_dir=self.data_dir), {"auto_optimize": False}))
+        self.assertEqual(mock_popen.call_count, 1)
+
+    def test_below_threshold_writes_no_candidate(self):
+        write_dataset(self.data_dir, 10, 20)
+        self.storage.save_config({"auto_optimize_min_reviews": 1000})
+        self.assertIsNone(background.run(self.data_dir))
+        self.assertIsNone(background.load_candidate(self.storage))
+        self.assertFalse(os.path.exists(self.storage.auto_optimize_lock_file))
+
+    @unittest.skipUnless(HAS_SCIPY, "需要 scipy")
+    def test_candidate_written_and_applied(self):
+        write_dataset(self.data_dir, 10, 60)
+        self.storage.save_config({"auto_optimize_min_reviews": 10})
+        background.run(self.data_dir)
+
+        candidate = background.load_candidate(self.storage)
+        self.assertIsNotNone(candidate)
+        self.assertEqual(candidate["new_reviews"], 60)
+
+        background.apply_candidate(self.storage, candidate)
+        self.assertEqual(self.storage.load_config()["fsrs_params"]["w"], candidate["w"])
+        self.assertIsNotNone(self.storage.load_optimizer_state())
+        self.assertIsNone(background.load_candidate(self.storage))
+
+    def add_reviews(self, count):
+        """在最后一条复习之后为已有题目追加 count 条复习"""
+        reviews = self.storage.load_reviews()
+        latest = max(r.review_history[-1]["timestamp"] for r in reviews.values())
+        fsrs = FSRS()
+        records = list(reviews.values())
+        for i in range(count):
+            records[i % len(records)].add_review(latest + timedelta(hours=i + 1), 3, fsrs)
+        self.storage.save_reviews(reviews)
+
+    @unittest.skipUnless(HAS_SCIPY, "需要 scipy")
+    def test_stale_candidate_is_dropped(self):
+        write_dataset(self.data_dir, 10, 60)
+        self.storage.save_config({"auto_optimize_min_reviews": 10})
+        background.run(self.data_dir)
+        self.assertIsNotNone(background.load_candidate(self.storage))
+
+        # 之后手动设置了权重：候选基于旧权重拟合，不应再应用
+        config = self.storage.load_config()
+        config.setdefault("fsrs_params", {})["w"] = [w * 1.01 for w in FSRS.get_default_params()["w"]]
+        self.storage.save_config(config)
+        self.assertIsNone(background.load_candidate(self.storage))
+        self.assertFalse(os.path.exists(self.storage.candidate_params_file))
+
+    @unittest.skipUnless(HAS_SCIPY, "需要 scipy")
+    def test_declined_candidate_waits_for_new_reviews(self):
+        write_dataset(self.data_dir, 10, 60)
+        self.storage.save_config({"auto_optimize_min_reviews": 10})
+        background.run(self.data_dir)
+        background.decline_candidate(self.storage, background.load_candidate(self.storage))
+
+        # 水位线未移动，但被拒绝的候选已覆盖这些复习
+        self.assertIsNone(background.run(self.data_dir))
+        self.add_reviews(5)
+        self.assertIsNone(background.run(self.data_dir))
+        self.add_reviews(5)
+        candidate = background.run(self.data_dir)
+        self.assertIsNotNone(candidate)
+        self.assertEqual(candidate["new_reviews"], 70)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -58,5 +58,58 @@ class TestCLI(unittest.TestCase):
         self.assertNotEqual(result.exit_code, 0) # Should fail or print error
         self.assertIn("错误", result.output)
 
+    @patch('leetcode_fsrs_cli.cli.background.discard_candidate')
+    @patch('leetcode_fsrs_cli.cli.StorageManager')
+    def test_setting_weights_discards_background_candidate(self, MockStorage, mock_discard):
+        MockStorage.return_value.load_config.return_value = {"fsrs_params": {}}
+
+        result = self.runner.invoke(cli, ['config', 'set-weights', ','.join(['1.0'] * 17)])
+        self.assertEqual(result.exit_code, 0, result.output)
+        mock_discard.assert_called_once_with(MockStorage.return_value)
+
+        self.runner.invoke(cli, ['config', 'set', 'daily_review_limit', '30'])
+        self.assertEqual(mock_discard.call_count, 1)
+
+    @patch('leetcode_fsrs_cli.cli.StorageManager')
+    @patch('leetcode_fsrs_cli.cli.QuestionManager')
+    def test_suggest_resolves_tagged_questions_from_index(self, MockQuestions, MockStorage):
+        questions = {
+            3: Question(3, "Q3", "hard", ["graph", "dp"], ""),
+            4: Question(4, "Q4", "medium", ["graph"], ""),
+            5: Question(5, "Q5", "medium", ["dp"], ""),
+        }
+        manager = MockQuestions.return_value
+        manager.get_ids_by_tags.return_value = [3, 4, 5]
+        manager.get_question.side_effect = questions.get
+        MockStorage.return_value.load_config.return_value = {"fsrs_params": {}}
+        MockStorage.return_value.load_reviews.return_value = {4: ReviewRecord(4)}
+
+        result = self.runner.invoke(cli, ['suggest', '--tag', 'graph', '--tag', 'dp', '--max-hard', '0'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        manager.get_ids_by_tags.assert_called_once_with(["graph", "dp"])
+        manager.list_questions.assert_not_called()
+        self.assertIn("5. Q5", result.output)
+        self.assertNotIn("3. Q3", result.output)
+        self.assertNotIn("4. Q4", result.output)
+
+    @patch('leetcode_fsrs_cli.cli.LeetCodeFSRSCLI')
+    def test_eval_without_scored_reviews(self, MockCLI):
+        from leetcode_fsrs_cli.fsrs import FSRS
+        mock_instance = MockCLI.return_value
+        mock_instance.fsrs.params = FSRS.get_default_params()
+        records = {}
+        for qid in range(1, 13):
+            record = ReviewRecord(qid)
+            record.review_history = [{"timestamp": datetime(2024, 1, qid), "rating": 3}]
+            records[qid] = record
+        mock_instance.storage_manager.load_reviews.return_value = records
+
+        result = self.runner.invoke(cli, ['eval', '--no-optimize', '--workers', '1'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Log Loss", result.output)
+        self.assertNotIn("nan", result.output)
+
 if __name__ == '__main__':
     unittest.main()
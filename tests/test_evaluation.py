@@ -0,0 +1,59 @@
+import math
+import unittest
+from datetime import datetime, timedelta
+from leetcode_fsrs_cli.fsrs import FSRS
+from leetcode_fsrs_cli.evaluation import compute_metrics, evaluate_parameters, _assign_chunks, _fold_data
+
+
+def make_reviews(n_cards=10, n_reviews=5):
+    start = datetime(2024, 1, 1)
+    return [
+        {"question_id": qid, "timestamp": (start + timedelta(days=i * 3 + qid)).isoformat(),
+         "rating": 1 if (qid + i) % 4 == 0 else 3}
+        for qid in range(1, n_cards + 1)
+        for i in range(n_reviews)
+    ]
+
+
+class TestEvaluation(unittest.TestCase):
+    def test_compute_metrics(self):
+        metrics = compute_metrics([0.9, 0.9, 0.2], [1, 0, 0])
+        self.assertEqual(metrics["count"], 3)
+        expected = -(math.log(0.9) + math.log(0.1) + math.log(0.8)) / 3
+        self.assertAlmostEqual(metrics["log_loss"], expected)
+        # 0.9 分箱: 预测 0.9 实际 0.5；0.2 分箱: 预测 0.2 实际 0
+        expected_rmse = math.sqrt((2 * 0.4 ** 2 + 0.2 ** 2) / 3)
+        self.assertAlmostEqual(metrics["rmse_bins"], expected_rmse)
+        self.assertEqual([row["count"] for row in metrics["calibration"]], [1, 2])
+
+    def test_folds_only_use_past_for_training(self):
+        cards = _assign_chunks(make_reviews(), 4)
+        for fold in range(1, 4):
+            train, test_cards = _fold_data(cards, fold)
+            latest_train = max(r["timestamp"] for r in train)
+            test_start = min(t for entries in cards.values() for t, _, chunk in entries if chunk == fold)
+            self.assertLessEqual(latest_train, test_start)
+            self.assertTrue(test_cards)
+
+    def test_evaluate_parameters_report(self):
+        report = evaluate_parameters(
+            make_reviews(), {"default": FSRS.get_default_params()["w"]}, folds=3, workers=1
+        )
+        self.assertEqual(report["folds"], 3)
+        self.assertEqual(len(report["per_fold"]), 3)
+        self.assertGreater(report["metrics"]["default"]["count"], 0)
+        self.assertNotIn("optimized", report["metrics"])
+
+    def test_no_scored_test_reviews(self):
+        # 每道题只有首次复习，测试段没有可评分的预测
+        reviews = make_reviews(n_cards=12, n_reviews=1)
+        report = evaluate_parameters(reviews, {"default": FSRS.get_default_params()["w"]}, folds=5, workers=1)
+        metrics = report["metrics"]["default"]
+        self.assertEqual(metrics["count"], 0)
+        self.assertIsNone(metrics["log_loss"])
+        self.assertIsNone(metrics["rmse_bins"])
+        self.assertEqual(metrics["calibration"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
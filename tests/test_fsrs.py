@@ -1,10 +1,7 @@
-import sys
-from unittest.mock import MagicMock
-sys.modules["click"] = MagicMock()
-
 import unittest
 from datetime import datetime, timedelta
-from leetcode_fsrs_cli.fsrs import FSRS, ReviewRecord
+from leetcode_fsrs_cli.fsrs import FSRS, FSRSParamGroups, ReviewRecord
+from leetcode_fsrs_cli.leetcode import Question
 
 class TestFSRS(unittest.TestCase):
     def setUp(self):
@@ -86,5 +83,39 @@ class TestReviewRecord(unittest.TestCase):
         self.assertEqual(loaded_record.stability, self.record.stability)
         self.assertEqual(len(loaded_record.review_history), 1)
 
+    def test_serialization_keeps_duration(self):
+        now = datetime.now()
+        self.record.add_review(now, 3, self.fsrs)
+        self.record.add_review(now + timedelta(days=2), 4, self.fsrs, duration=95.04)
+
+        loaded_record = ReviewRecord.from_dict(self.record.to_dict())
+        self.assertNotIn("duration", loaded_record.review_history[0])
+        self.assertEqual(loaded_record.review_history[1]["duration"], 95.0)
+
+class TestFSRSParamGroups(unittest.TestCase):
+    def setUp(self):
+        self.w = FSRS.get_default_params()["w"]
+        self.dp_w = [x * 1.1 for x in self.w]
+        self.hard_w = [x * 0.9 for x in self.w]
+        self.groups = FSRSParamGroups(
+            {"request_retention": 0.85},
+            {"tag:dynamic-programming": self.dp_w, "difficulty:hard": self.hard_w}
+        )
+
+    def test_resolution_order_and_fallback(self):
+        dp = Question(1, "Q1", "Hard", ["array", "dynamic-programming"], "url")
+        hard = Question(2, "Q2", "Hard", ["array"], "url")
+        easy = Question(3, "Q3", "Easy", ["array"], "url")
+
+        self.assertEqual(self.groups.for_question(dp).params["w"], self.dp_w)
+        self.assertEqual(self.groups.for_question(hard).params["w"], self.hard_w)
+        self.assertIs(self.groups.for_question(easy), self.groups.default)
+        self.assertEqual(self.groups.for_question(dp).params["request_retention"], 0.85)
+
+    def test_instances_are_cached(self):
+        q = Question(1, "Q1", "Hard", [], "url")
+        self.assertIs(self.groups.for_question(q), self.groups.for_question(q))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,241 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from leetcode_fsrs_cli.leetcode import QuestionManager, Question, SAMPLE_QUESTIONS
+from leetcode_fsrs_cli import search_index
+
+
+class TestCompactQuestion(unittest.TestCase):
+    def test_tags_and_url_round_trip(self):
+        question = Question(1, "Two Sum", "easy", ["array", "hash-table"],
+                            "https://leetcode.com/problems/two-sum/", "content")
+        other = Question.from_dict(question.to_dict())
+        self.assertEqual(other, question)
+        self.assertEqual(other.tags, ["array", "hash-table"])
+        self.assertEqual(other.url, "https://leetcode.com/problems/two-sum/")
+        self.assertFalse(hasattr(question, "__dict__"))
+        # 同名标签在共享标签表中只有一份，规范链接只保存 slug
+        self.assertEqual(question._tag_ids, other._tag_ids)
+        self.assertIsNone(question._url)
+        self.assertEqual(question.slug, "two-sum")
+
+    def test_non_canonical_url_kept(self):
+        question = Question(2, "Q2", "medium", [], "url")
+        self.assertEqual(question.url, "url")
+        question.tags = ["graph"]
+        self.assertEqual(question.tags, ["graph"])
+        self.assertNotEqual(question, Question(2, "Q2", "medium", [], "url"))
+
+
+class TestQuestionManagerTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = QuestionManager(data_dir=self.tmp_dir)
+        for question in SAMPLE_QUESTIONS:
+            self.manager.add_question(question)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_index_follows_add_and_remove(self):
+        self.assertEqual(self.manager.get_ids_by_tags(["array"]), [1, 4])
+        self.manager.remove_question(4)
+        self.assertEqual(self.manager.get_ids_by_tags(["array"]), [1])
+        self.assertNotIn("divide-and-conquer", self.manager.tag_bits)
+        self.assertNotIn("hard", self.manager.difficulty_bits)
+        self.manager.add_question(Question(10, "Regular Expression Matching", "hard", ["string"], ""))
+        self.assertEqual([q.id for q in self.manager.list_questions(difficulty="hard")], [10])
+
+    def test_index_rebuilt_on_load(self):
+        reloaded = QuestionManager(data_dir=self.tmp_dir)
+        self.assertEqual(reloaded.tag_bits, self.manager.tag_bits)
+        self.assertEqual(reloaded.difficulty_bits, self.manager.difficulty_bits)
+        self.assertEqual(reloaded.all_bits, self.manager.all_bits)
+
+    def test_tag_queries_and_or(self):
+        self.assertEqual(self.manager.get_ids_by_tags(["array", "hash-table"]), [1, 3, 4])
+        self.assertEqual(self.manager.get_ids_by_tags(["array", "hash-table"], match_all=True), [1])
+        self.assertEqual(self.manager.get_ids_by_tags(["array", "unknown"], match_all=True), [])
+        ids = [q.id for q in self.manager.list_questions(tags=["string"], match_all=True)]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_list_questions_by_tag_uses_index(self):
+        ids = [q.id for q in self.manager.list_questions(tags=["hash-table", "math"])]
+        self.assertEqual(ids, [1, 2, 3])
+        ids = [q.id for q in self.manager.list_questions(difficulty="medium", tags=["hash-table"])]
+        self.assertEqual(ids, [3])
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = QuestionManager(data_dir=self.tmp_dir)
+        for question in SAMPLE_QUESTIONS:
+            self.manager.add_question(question)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_ranked_search_over_all_fields(self):
+        self.assertEqual(self.manager.search_questions("two")[0].id, 1)
+        self.assertEqual([q.id for q in self.manager.search_questions("median sorted arrays")][0], 4)
+        # 标签、slug 和题目描述
+        self.assertEqual({q.id for q in self.manager.search_questions("divide conquer")}, {4})
+        self.assertEqual({q.id for q in self.manager.search_questions("链表")}, {2})
+        self.assertEqual(self.manager.search_questions("3")[0].id, 3)
+        # 未输入完整的单词按前缀匹配
+        self.assertEqual(self.manager.search_questions("substr")[0].id, 3)
+        self.assertEqual(self.manager.search_questions("nothing-matches"), [])
+
+    def test_incremental_updates_are_persisted(self):
+        self.manager.search_questions("two")
+        self.manager.add_question(Question(5, "Two Pointers Trick", "easy", ["two-pointers"],
+                                           "https://leetcode.com/problems/two-pointers-trick/"))
+        self.manager.remove_question(1)
+
+        reloaded = QuestionManager(data_dir=self.tmp_dir)
+        index = reloaded.get_search_index()
+        self.assertEqual(set(index.doc_lengths), {2, 3, 4, 5})
+        self.assertEqual(reloaded.search_questions("trick")[0].id, 5)
+
+    def test_prefix_expansion_uses_sorted_terms(self):
+        index = self.manager.get_search_index()
+        self.manager.add_question(Question(5, "Substring Puzzle", "easy", ["string"], ""))
+        self.manager.remove_question(2)
+        self.assertEqual(index.terms, sorted(index.postings))
+        self.assertNotIn("链", index.terms)
+
+        expansions = index.expand("subst zzqx two")
+        self.assertEqual(expansions["subst"], ["substring"])
+        self.assertEqual(expansions["zzqx"], [])
+        self.assertEqual(expansions["two"], ["two"])
+        self.assertEqual(index.unknown_tokens("subst zzqx two", expansions), ["zzqx"])
+
+        # 超过上限时只保留最常见的补全
+        with patch.object(search_index, "PREFIX_EXPANSION_LIMIT", 1):
+            self.assertEqual(index.expand("s")["s"], ["string"])
+
+    def test_stale_index_is_rebuilt(self):
+        self.manager.search_questions("two")
+        # 索引未加载的管理器修改题库后，持久化的索引失效
+        other = QuestionManager(data_dir=self.tmp_dir)
+        other.add_question(Question(6, "Zigzag Conversion", "medium", ["string"], ""))
+
+        reloaded = QuestionManager(data_dir=self.tmp_dir)
+        self.assertEqual(reloaded.search_questions("zigzag")[0].id, 6)
+
+
+class TestFuzzySearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = QuestionManager(data_dir=self.tmp_dir)
+        for question in SAMPLE_QUESTIONS:
+            self.manager.add_question(question)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_typos_match_titles_and_slugs(self):
+        self.assertEqual(self.manager.fuzzy_search("longest substrng")[0][0], 3)
+        self.assertEqual(self.manager.fuzzy_search("medain sorted")[0][0], 4)
+        self.assertEqual(self.manager.fuzzy_search("add-two-numbrs")[0][0], 2)
+        self.assertEqual(self.manager.fuzzy_search("qqqq zzzz"), [])
+
+    def test_search_falls_back_to_fuzzy_matches(self):
+        self.assertEqual(self.manager.search_questions("medain sorted")[0].id, 4)
+        self.manager.add_question(Question(5, "Median Finder", "hard", ["heap-priority-queue"], ""))
+        self.assertEqual(self.manager.search_questions("median findr", 1)[0].id, 5)
+
+    def test_find_question_by_id_slug_or_title(self):
+        self.assertEqual(self.manager.find_question("2").id, 2)
+        self.assertEqual(self.manager.find_question("two-sum").id, 1)
+        self.assertEqual(self.manager.find_question("median of two sorted arrays").id, 4)
+        self.assertIsNone(self.manager.find_question("medain sorted"))
+
+
+
+class TestSlugIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_legacy_catalog_migrated(self):
+        legacy = {str(q.id): {k: v for k, v in q.to_dict().items() if k != "slug"} for q in SAMPLE_QUESTIONS}
+        with open(os.path.join(self.tmp_dir, "questions.json"), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        manager = QuestionManager(data_dir=self.tmp_dir)
+        self.assertEqual(manager.get_question_by_slug("add-two-numbers").id, 2)
+        with open(os.path.join(self.tmp_dir, "questions.json"), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["2"]["slug"], "add-two-numbers")
+
+    def test_index_persisted_and_maintained(self):
+        manager = QuestionManager(data_dir=self.tmp_dir)
+        for question in SAMPLE_QUESTIONS:
+            manager.add_question(question)
+        manager.remove_question(4)
+        manager.add_question(Question(50, "Pow(x, n)", "medium", ["math"], "", slug="powx-n"))
+        self.assertEqual(manager.get_question(50).url, "https://leetcode.com/problems/powx-n/")
+
+        with patch.object(QuestionManager, "_build_slug_index", side_effect=AssertionError("rebuilt")):
+            reloaded = QuestionManager(data_dir=self.tmp_dir)
+        self.assertEqual(reloaded.slug_index, manager.slug_index)
+        self.assertNotIn("median-of-two-sorted-arrays", reloaded.slug_index)
+        self.assertEqual(reloaded.find_question("powx-n").id, 50)
+        self.assertEqual(reloaded.find_question("pow(x, n)").id, 50)
+        self.assertEqual(reloaded.search_questions("add-two-numbers")[0].id, 2)
+
+        # 题库文件在外部被修改后索引重建
+        with open(os.path.join(self.tmp_dir, "questions.json"), 'a', encoding='utf-8') as f:
+            f.write("\n")
+        self.assertEqual(QuestionManager(data_dir=self.tmp_dir).slug_index, manager.slug_index)
+
+
+class TestImportExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = QuestionManager(data_dir=os.path.join(self.tmp_dir, "src"))
+        for question in SAMPLE_QUESTIONS:
+            self.manager.add_question(question)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_ndjson_round_trip_in_chunks(self):
+        path = os.path.join(self.tmp_dir, "catalog.ndjson")
+        stats = self.manager.export_questions(path)
+        self.assertEqual(stats.count, 4)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)["id"] for line in f], [1, 2, 3, 4])
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write("not json\n\n[1]\n")
+        target = QuestionManager(data_dir=os.path.join(self.tmp_dir, "dst"))
+        with patch.object(target, "_save_questions", wraps=target._save_questions) as save:
+            stats = target.import_questions(path, chunk_size=3)
+        # 3 题一块写入，剩余 1 题在结束时写入
+        self.assertEqual(save.call_count, 2)
+        self.assertEqual((stats.count, stats.skipped, stats.failed), (4, 0, 2))
+        reloaded = QuestionManager(data_dir=os.path.join(self.tmp_dir, "dst"))
+        self.assertEqual(reloaded.questions, self.manager.questions)
+
+        stats = target.import_questions(path)
+        self.assertEqual((stats.count, stats.skipped), (0, 4))
+
+    def test_json_array_compatibility(self):
+        path = os.path.join(self.tmp_dir, "catalog.json")
+        self.assertTrue(self.manager.export_to_file(path))
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 4)
+        target = QuestionManager(data_dir=os.path.join(self.tmp_dir, "dst"))
+        self.assertEqual(target.import_from_file(path), 4)
+        self.assertEqual(target.import_from_file(os.path.join(self.tmp_dir, "missing.json")), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
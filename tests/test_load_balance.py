@@ -0,0 +1,66 @@
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta
+from leetcode_fsrs_cli.fsrs import FSRS, ReviewRecord
+from leetcode_fsrs_cli.load_balance import LoadBalancer, fuzz_range
+
+
+class TestLoadBalancer(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2025, 1, 1, 9)
+
+    def test_fuzz_range(self):
+        self.assertEqual(fuzz_range(1), 0)
+        self.assertEqual(fuzz_range(10), 1)
+        self.assertEqual(fuzz_range(40), 4)
+        self.assertEqual(fuzz_range(1000), 7)
+
+    def test_spreads_cards_learned_together(self):
+        balancer = LoadBalancer()
+        days = Counter(
+            balancer.schedule(qid, self.now, 10, 36500).date() for qid in range(30)
+        )
+        self.assertEqual(sorted(days.values()), [10, 10, 10])
+        self.assertEqual(set(days), {(self.now + timedelta(days=d)).date() for d in (9, 10, 11)})
+        self.assertEqual(balancer.due_counts, {d.isoformat(): 10 for d in days})
+
+    def test_target_prefers_ideal_day_until_full(self):
+        balancer = LoadBalancer(target=3)
+        days = [balancer.schedule(qid, self.now, 20, 36500) for qid in range(5)]
+        ideal = self.now + timedelta(days=20)
+        self.assertEqual(days[:3], [ideal] * 3)
+        self.assertNotEqual(days[3], ideal)
+
+    def test_reschedule_moves_card_between_days(self):
+        balancer = LoadBalancer()
+        balancer.reschedule(1, self.now)
+        balancer.reschedule(1, self.now + timedelta(days=5))
+        self.assertEqual(balancer.due_counts, {(self.now + timedelta(days=5)).date().isoformat(): 1})
+        restored = LoadBalancer.from_dict(balancer.to_dict())
+        self.assertEqual(restored.due_counts, balancer.due_counts)
+        self.assertEqual(restored.card_days, balancer.card_days)
+
+    def test_drop_before(self):
+        balancer = LoadBalancer()
+        for qid, days in enumerate((-2, 0, 3)):
+            balancer.reschedule(qid, self.now + timedelta(days=days))
+        balancer.drop_before(self.now.date())
+        self.assertEqual(set(balancer.card_days), {1, 2})
+        self.assertEqual(sum(balancer.due_counts.values()), 2)
+
+    def test_fsrs_uses_balancer(self):
+        fsrs = FSRS()
+        fsrs.load_balancer = LoadBalancer()
+        records = [ReviewRecord(qid) for qid in range(20)]
+        for record in records:
+            record.add_review(self.now, 3, fsrs)
+        for record in records:
+            record.add_review(self.now + timedelta(days=10), 3, fsrs)
+
+        due_days = Counter(r.next_review.date() for r in records)
+        self.assertGreater(len(due_days), 1)
+        self.assertEqual(sum(fsrs.load_balancer.due_counts.values()), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
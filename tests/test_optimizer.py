@@ -0,0 +1,207 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from leetcode_fsrs_cli.fsrs import FSRS
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from leetcode_fsrs_cli.optimizer import (
+    FSRSOptimizer, HAS_SCIPY, PARAM_BOUNDS, prepare_cards, _loss, spool_cards, iter_card_batches,
+    _init_worker, _minimize_start
+)
+
+
+def make_reviews(n_cards=20, n_reviews=6, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    reviews = []
+    for qid in range(1, n_cards + 1):
+        t = start
+        for _ in range(n_reviews):
+            reviews.append({"question_id": qid, "timestamp": t.isoformat(), "rating": rng.choice([1, 3, 3, 4])})
+            t += timedelta(days=rng.randint(1, 10))
+    return reviews
+
+
+class TestPrepareCards(unittest.TestCase):
+    def test_accepts_datetime_and_string_timestamps(self):
+        t0 = datetime(2024, 1, 1)
+        reviews = [
+            {"question_id": 1, "timestamp": (t0 + timedelta(days=3)).isoformat(), "rating": 3},
+            {"question_id": 1, "timestamp": t0, "rating": 4},
+        ]
+        cards = prepare_cards(reviews)
+        self.assertEqual(cards, [([4, 3], [0.0, 3.0])])
+
+    def test_loss_with_short_weights_does_not_fail(self):
+        optimizer = FSRSOptimizer(FSRS({"w": FSRS.get_default_params()["w"][:17]}))
+        w = optimizer._initial_weights()
+        self.assertEqual(len(w), len(PARAM_BOUNDS))
+        self.assertGreater(_loss(w, prepare_cards(make_reviews())), 0)
+
+
+@unittest.skipUnless(HAS_SCIPY, "需要 scipy")
+class TestMultiStart(unittest.TestCase):
+    def test_multistart_not_worse_than_single(self):
+        reviews = make_reviews()
+        optimizer = FSRSOptimizer(FSRS())
+        _, single_loss = optimizer.optimize(reviews)
+        result = optimizer.optimize_multistart(reviews, restarts=3, workers=2, seed=1, grace_iters=20)
+
+        self.assertEqual(len(result.losses), 3)
+        self.assertEqual(len(result.weights), len(PARAM_BOUNDS))
+        self.assertLessEqual(result.loss, single_loss + 1e-6)
+        spread = result.loss_spread()
+        self.assertLessEqual(spread["min"], spread["max"])
+        self.assertEqual(spread["min"], result.loss)
+
+    def test_start_abandoned_by_callback_keeps_best_point(self):
+        cards = prepare_cards(make_reviews())
+        x0 = FSRSOptimizer(FSRS())._initial_weights()
+        # 共享最优值远低于本起点可达的 Loss，宽限期后即被中止
+        best = multiprocessing.Value('d', 0.01)
+        _init_worker(cards, best)
+        try:
+            weights, loss, status = _minimize_start(x0, 1000, 2, 0.05)
+        finally:
+            _init_worker([])
+        self.assertEqual(status, "abandoned")
+        self.assertAlmostEqual(loss, _loss(weights, cards))
+        self.assertLessEqual(loss, _loss(x0, cards))
+        self.assertEqual(best.value, 0.01)
+
+        # 没有更优的起点时运行到收敛，并发布自己的最优值
+        best = multiprocessing.Value('d', float("inf"))
+        _init_worker(cards, best)
+        try:
+            _, loss, status = _minimize_start(x0, 1000, 2, 0.05)
+        finally:
+            _init_worker([])
+        self.assertEqual(status, "converged")
+        self.assertAlmostEqual(best.value, loss, places=6)
+
+
+@unittest.skipUnless(HAS_SCIPY, "需要 scipy")
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.optimizer = FSRSOptimizer(FSRS())
+        self.reviews = make_reviews(n_cards=30)
+        weights, loss = self.optimizer.optimize(self.reviews)
+        self.state = self.optimizer.build_fit_state(self.reviews, weights, loss)
+        # 与应用拟合结果后一致：当前权重即上次拟合的权重
+        self.optimizer.fsrs.params["w"] = weights
+
+    def test_no_new_reviews_is_unchanged(self):
+        result = self.optimizer.optimize_incremental(self.reviews, self.state)
+        self.assertEqual(result.mode, "unchanged")
+        self.assertEqual(result.weights, self.state["w"])
+
+    def test_small_batch_uses_cached_states(self):
+        watermark = datetime.fromisoformat(self.state["watermark"])
+        extra = [
+            {"question_id": qid, "timestamp": (watermark + timedelta(days=qid)).isoformat(), "rating": 3}
+            for qid in range(1, 6)
+        ]
+        result = self.optimizer.optimize_incremental(self.reviews + extra, self.state)
+
+        self.assertEqual(result.mode, "incremental")
+        self.assertEqual(result.new_reviews, 5)
+        # 每道题的首次复习不参与评分，新复习都接在缓存状态之后
+        self.assertEqual(self.state["n_scored"], len(self.reviews) - 30)
+        self.assertEqual(result.state["n_scored"], self.state["n_scored"] + 5)
+        self.assertGreater(datetime.fromisoformat(result.state["watermark"]), watermark)
+        self.assertEqual(result.state["card_states"]["1"][2], extra[0]["timestamp"])
+
+    def test_large_batch_falls_back_to_full(self):
+        watermark = datetime.fromisoformat(self.state["watermark"])
+        extra = [
+            {"question_id": 100 + i, "timestamp": (watermark + timedelta(days=1)).isoformat(), "rating": 3}
+            for i in range(len(self.reviews))
+        ]
+        result = self.optimizer.optimize_incremental(self.reviews + extra, self.state)
+        self.assertEqual(result.mode, "full")
+
+    def test_weights_changed_since_fit_falls_back_to_full(self):
+        # 手动设置过权重后，上次的拟合状态不再对应当前权重
+        self.optimizer.fsrs.params["w"] = FSRS.get_default_params()["w"]
+        result = self.optimizer.optimize_incremental(self.reviews, self.state)
+        self.assertEqual(result.mode, "full")
+        self.assertEqual(result.state["n_scored"], self.state["n_scored"])
+
+
+@unittest.skipUnless(HAS_SCIPY, "需要 scipy")
+class TestGroups(unittest.TestCase):
+    def test_groups_are_shrunk_toward_global(self):
+        reviews = make_reviews(n_cards=20)
+        question_groups = {qid: ["tag:even" if qid % 2 == 0 else "tag:odd"] for qid in range(1, 21)}
+        question_groups[1].append("tag:rare")
+        result = FSRSOptimizer(FSRS()).optimize_groups(reviews, question_groups, min_reviews=10,
+                                                       shrinkage_reviews=50, workers=2)
+
+        self.assertEqual(set(result.groups), {"tag:even", "tag:odd"})
+        self.assertEqual(result.skipped, {"tag:rare": 5})
+        group = result.groups["tag:even"]
+        self.assertEqual(group["reviews"], 50)
+        self.assertAlmostEqual(group["shrinkage"], 0.5)
+        self.assertEqual(len(group["w"]), len(PARAM_BOUNDS))
+
+
+@unittest.skipUnless(HAS_SCIPY, "需要 scipy")
+class TestStochastic(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.card_file = os.path.join(self.tmp_dir, "cards.ndjson")
+        self.checkpoint = os.path.join(self.tmp_dir, "checkpoint.json")
+        self.reviews = make_reviews(n_cards=40)
+        spool_cards(self.reviews, self.card_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_batches_cover_all_cards_once(self):
+        batches = list(iter_card_batches(self.card_file, 7, random.Random(0)))
+        self.assertTrue(all(len(b) <= 7 for b in batches))
+        cards = sorted(c for b in batches for c in b)
+        self.assertEqual(cards, sorted((r, e) for r, e in prepare_cards(self.reviews)))
+
+    def test_stochastic_improves_loss_within_bounds(self):
+        optimizer = FSRSOptimizer(FSRS())
+        initial = _loss(optimizer._initial_weights(), prepare_cards(self.reviews))
+        weights, loss = optimizer.optimize_stochastic(self.card_file, batch_size=10, epochs=3,
+                                                      learning_rate=0.05)
+        self.assertLess(loss, initial)
+        for w, (low, high) in zip(weights, PARAM_BOUNDS):
+            self.assertTrue(low <= w <= high)
+
+    def test_resume_from_checkpoint(self):
+        optimizer = FSRSOptimizer(FSRS())
+        full_w, _ = optimizer.optimize_stochastic(self.card_file, batch_size=10, epochs=2)
+
+        optimizer.optimize_stochastic(self.card_file, batch_size=10, epochs=1,
+                                      checkpoint_path=self.checkpoint)
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)["epoch"], 1)
+        resumed_w, _ = optimizer.optimize_stochastic(self.card_file, batch_size=10, epochs=2,
+                                                     checkpoint_path=self.checkpoint, resume=True)
+        for a, b in zip(full_w, resumed_w):
+            self.assertAlmostEqual(a, b)
+
+    def test_resume_rejects_mismatched_checkpoint(self):
+        optimizer = FSRSOptimizer(FSRS())
+        optimizer.optimize_stochastic(self.card_file, batch_size=10, epochs=1,
+                                      checkpoint_path=self.checkpoint)
+        # 批大小不同时检查点中的批次位置指向不同的小批量
+        with self.assertRaises(ValueError):
+            optimizer.optimize_stochastic(self.card_file, batch_size=7, epochs=2,
+                                          checkpoint_path=self.checkpoint, resume=True)
+        # 题目文件重新生成后同样拒绝继续
+        spool_cards(make_reviews(n_cards=30), self.card_file)
+        with self.assertRaises(ValueError):
+            optimizer.optimize_stochastic(self.card_file, batch_size=10, epochs=2,
+                                          checkpoint_path=self.checkpoint, resume=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import importlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from click.testing import CliRunner
+from leetcode_fsrs_cli.plan_cache import PlanCache, plan_key, read_generation
+from leetcode_fsrs_cli.storage import StorageManager
+from leetcode_fsrs_cli.leetcode import QuestionManager, Question, SAMPLE_QUESTIONS
+from leetcode_fsrs_cli.fsrs import ReviewRecord
+
+# 包的 __init__ 导出了同名的 cli 命令组，这里取模块本身
+cli_module = importlib.import_module("leetcode_fsrs_cli.cli")
+
+
+class _FrozenDatetime(datetime):
+    """now() 返回 current 的 datetime，用于模拟计划缓存之后的时间"""
+    current = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+class TestPlanCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(self.tmp_dir)
+        self.cache = PlanCache(self.tmp_dir)
+        self.today = date.today()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_writes_bump_generation(self):
+        self.assertEqual(read_generation(self.tmp_dir), 0)
+        self.storage.save_config(self.storage.load_config())
+        self.storage.save_review_record(ReviewRecord(1))
+        QuestionManager(data_dir=self.tmp_dir).add_question(SAMPLE_QUESTIONS[0])
+        self.assertEqual(read_generation(self.tmp_dir), 3)
+
+    def test_hit_until_data_changes(self):
+        key = plan_key(10, None)
+        self.cache.put(self.today, key, [(3, 2.5), (1, 1.0)])
+        self.assertEqual(self.cache.get(self.today, key), [(3, 2.5), (1, 1.0)])
+        self.assertIsNone(self.cache.get(self.today, plan_key(10, 30)))
+        self.assertIsNone(self.cache.get(self.today + timedelta(days=1), key))
+
+        self.storage.save_review_record(ReviewRecord(1))
+        self.assertIsNone(self.cache.get(self.today, key))
+
+    def test_expires_when_a_card_comes_due(self):
+        key = plan_key(10, None)
+        built_at = datetime.combine(self.today, datetime.min.time()) + timedelta(hours=8)
+        self.cache.put(self.today, key, [(1, 1.0)], valid_until=built_at + timedelta(hours=4))
+        self.assertEqual(self.cache.get(self.today, key, built_at + timedelta(hours=3)), [(1, 1.0)])
+        self.assertIsNone(self.cache.get(self.today, key, built_at + timedelta(hours=4)))
+
+    def test_practice_plan_includes_cards_due_after_caching(self):
+        data_dir = os.path.join(self.tmp_dir, "leetcode-fsrs-cli")
+        questions = QuestionManager(data_dir=data_dir)
+        questions.add_question(Question(1, "Overdue Card", "easy", [], ""))
+        questions.add_question(Question(2, "Later Card", "easy", [], ""))
+        storage = StorageManager(data_dir)
+        morning = datetime.combine(self.today, datetime.min.time()) + timedelta(hours=8)
+        for qid, due in ((1, morning - timedelta(days=1)), (2, morning + timedelta(hours=6))):
+            record = ReviewRecord(qid)
+            record.review_history = [{"timestamp": due - timedelta(days=3), "rating": 3, "stability": 2.5,
+                                      "difficulty": 5.0, "interval": 3}]
+            record.next_review = due
+            storage.save_review_record(record)
+
+        runner = CliRunner()
+        with patch.dict(os.environ, {"XDG_CONFIG_HOME": self.tmp_dir}), \
+                patch.object(cli_module, "datetime", _FrozenDatetime):
+            _FrozenDatetime.current = morning
+            result = runner.invoke(cli_module.cli, ['practice', '--plan'])
+            self.assertNotIn("Later Card", result.output)
+
+            # 没有任何写入，但题 2 已在晚上到期
+            _FrozenDatetime.current = morning + timedelta(hours=14)
+            result = runner.invoke(cli_module.cli, ['practice', '--plan'])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn("Later Card", result.output)
+
+    def test_prunes_past_days(self):
+        key = plan_key(5, None)
+        self.cache.put(self.today - timedelta(days=1), key, [(1, 1.0)])
+        self.cache.put(self.today + timedelta(days=1), key, [(2, 1.0)])
+        with open(self.cache.cache_file) as f:
+            days = json.load(f)["days"]
+        self.assertEqual(set(days), {(self.today + timedelta(days=1)).isoformat()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from leetcode_fsrs_cli import priority
+from leetcode_fsrs_cli.priority import PriorityExpression, build_columns
+from leetcode_fsrs_cli.fsrs import FSRS, ReviewRecord
+from leetcode_fsrs_cli.leetcode import Question
+
+
+class TestPriorityExpression(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2025, 1, 10)
+        fsrs = FSRS()
+        self.reviews = []
+        self.questions = []
+        for i, difficulty in enumerate(["easy", "medium", "hard", "unknown"]):
+            record = ReviewRecord(i)
+            for day in range(i):
+                record.add_review(datetime(2025, 1, 1) + timedelta(days=day), 3, fsrs)
+            record.next_review = self.now - timedelta(days=i)
+            self.reviews.append(record)
+            self.questions.append(Question(i, f"Q{i}", difficulty, [], ""))
+
+    def expected_default(self, review, question):
+        overdue = max(0, (self.now - review.next_review).total_seconds() / 86400)
+        weight = {"easy": 1.0, "medium": 1.5, "hard": 2.0}.get(question.difficulty, 1.0)
+        return (overdue * 2.0 + weight * 1.5 + max(0.1, 5.0 - review.stability)
+                + max(0.5, 1.0 - len(review.review_history) * 0.1) * 0.5)
+
+    def test_default_matches_original_formula(self):
+        scores = PriorityExpression().evaluate(build_columns(self.reviews, self.questions, self.now))
+        for score, review, question in zip(scores, self.reviews, self.questions):
+            self.assertAlmostEqual(score, self.expected_default(review, question))
+
+    def test_scalar_fallback_matches_vectorized(self):
+        expression = PriorityExpression("overdue * (1 - retrievability) + sqrt(reviews) - min(stability, 3)")
+        columns = build_columns(self.reviews, self.questions, self.now)
+        vectorized = expression.evaluate(columns)
+        with patch.object(priority, "HAS_NUMPY", False):
+            scalar = expression.evaluate(columns)
+        for a, b in zip(vectorized, scalar):
+            self.assertAlmostEqual(a, b)
+
+    def test_constant_expression_broadcasts(self):
+        columns = build_columns(self.reviews, self.questions, self.now)
+        self.assertEqual(PriorityExpression("1").evaluate(columns), [1.0] * 4)
+
+    def test_rejects_unsafe_expressions(self):
+        for expression in ["__import__('os')", "overdue.real", "unknown_var", "[1]", "overdue if 1 else 2", "1 +"]:
+            with self.assertRaises(ValueError):
+                PriorityExpression(expression)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from leetcode_fsrs_cli import query
+from leetcode_fsrs_cli.query import Query
+from leetcode_fsrs_cli.fsrs import ReviewRecord
+from leetcode_fsrs_cli.leetcode import QuestionManager, Question
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = QuestionManager(data_dir=self.tmp_dir)
+        specs = [
+            (1, "easy", ["array", "hash-table"]),
+            (2, "medium", ["dynamic-programming"]),
+            (3, "hard", ["dynamic-programming", "string"]),
+            (4, "hard", ["dynamic-programming", "array"]),
+            (5, "hard", ["graph"]),
+        ]
+        for qid, difficulty, tags in specs:
+            self.manager.add_question(Question(qid, f"Question {qid}", difficulty, tags, ""))
+
+        self.now = datetime(2025, 3, 1, 12)
+        self.reviews = {}
+        # (题目ID, 稳定性, 距离下次复习的天数)
+        for qid, stability, due_in in [(2, 1.0, -5), (3, 2.0, -3), (4, 2.5, -1), (5, 8.0, 4)]:
+            record = ReviewRecord(qid)
+            record.review_history = [{"timestamp": self.now - timedelta(days=10), "rating": 3,
+                                      "stability": 2.5, "difficulty": 5.0, "interval": 10}]
+            record.stability = stability
+            record.next_review = self.now + timedelta(days=due_in)
+            self.reviews[qid] = record
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_query(self, text):
+        return Query(text).execute(self.manager, self.reviews, self.now)
+
+    def test_combined_filters_with_index_pushdown(self):
+        text = "tag:dp and difficulty:hard and stability<3 and overdue>2d"
+        # 标签缩写 dp 解析为 dynamic-programming，候选只剩索引交集
+        self.assertEqual(Query(text).candidate_ids(self.manager), [3, 4])
+        self.assertEqual(self.run_query(text), [3])
+
+    def test_boolean_operators_and_status(self):
+        self.assertEqual(self.run_query("status:new or stability>=8"), [1, 5])
+        self.assertEqual(self.run_query("not tag:array (difficulty:hard or reviews=0)"), [3, 5])
+        self.assertEqual(self.run_query("status:due and due>-36h"), [4])
+        self.assertEqual(self.run_query("status:done"), [5])
+        self.assertEqual(self.run_query("title:\"question 2\""), [2])
+        # 新题没有稳定性，比较不成立
+        self.assertEqual(self.run_query("stability<100"), [2, 3, 4, 5])
+
+    def test_scalar_fallback_matches_numpy(self):
+        text = "(tag:array or tag:graph) and not status:new or overdue>=4"
+        expected = self.run_query(text)
+        with patch.object(query, "HAS_NUMPY", False):
+            self.assertEqual(self.run_query(text), expected)
+        self.assertEqual(expected, [2, 4, 5])
+
+    def test_invalid_queries(self):
+        for text in ["", "tag:", "color:red", "stability<abc", "status:later", "(tag:dp", "tag:dp and", "id!3"]:
+            with self.assertRaises(ValueError, msg=text):
+                Query(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
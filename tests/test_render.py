@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from leetcode_fsrs_cli import render
+from leetcode_fsrs_cli.render import RenderCache, render_html
+from leetcode_fsrs_cli.leetcode import QuestionManager, Question
+
+SAMPLE_HTML = """<p>Given&nbsp;<code>nums</code>, return <em>indices</em>.</p>
+<pre>
+<strong>Input:</strong> nums = [2,7]
+
+<strong>Output:</strong> [0,1]
+</pre>
+<ul>
+	<li><code>2 &lt;= n &lt;= 10<sup>4</sup></code></li>
+	<li><p>x<sub>i</sub> &amp; y</p>
+	<ol><li>first</li><li>second</li></ol></li>
+</ul>"""
+
+
+class TestRenderHtml(unittest.TestCase):
+    def test_blocks_lists_and_superscripts(self):
+        self.assertEqual(render_html(SAMPLE_HTML), "\n".join([
+            "Given nums, return indices.",
+            "",
+            "    Input: nums = [2,7]",
+            "",
+            "    Output: [0,1]",
+            "",
+            "- 2 <= n <= 10^4",
+            "- x_i & y",
+            "",
+            "  1. first",
+            "  2. second",
+        ]))
+
+    def test_empty_content(self):
+        self.assertEqual(render_html(""), "")
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_rendered_once_when_question_added(self):
+        manager = QuestionManager(data_dir=self.tmp_dir)
+        question = Question(1, "Two Sum", "easy", [], "", SAMPLE_HTML)
+        manager.add_question(question)
+        self.assertEqual(RenderCache(self.tmp_dir).get(SAMPLE_HTML), render_html(SAMPLE_HTML))
+
+        # 显示时只读取缓存，不再渲染
+        with patch.object(render, "render_html", side_effect=AssertionError("rendered again")):
+            reloaded = QuestionManager(data_dir=self.tmp_dir)
+            self.assertTrue(reloaded.get_rendered_content(reloaded.get_question(1)).startswith("Given nums"))
+
+    def test_miss_renders_and_stores(self):
+        cache = RenderCache(self.tmp_dir)
+        self.assertIsNone(cache.get("<p>a</p>"))
+        self.assertEqual(cache.put("<p>a</p>"), "a")
+        self.assertEqual(cache.get("<p>a</p>"), "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
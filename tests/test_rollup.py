@@ -0,0 +1,77 @@
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from leetcode_fsrs_cli.fsrs import FSRS, ReviewRecord
+from leetcode_fsrs_cli.rollup import DailyRollup
+from leetcode_fsrs_cli.storage import StorageManager
+
+
+class TestDailyRollup(unittest.TestCase):
+    def setUp(self):
+        self.fsrs = FSRS()
+        self.today = date(2025, 3, 31)
+        self.records = []
+        for qid, ratings in enumerate([[3, 4, 1], [1, 3], [5]], 1):
+            record = ReviewRecord(qid)
+            for i, rating in enumerate(ratings):
+                record.add_review(datetime(2025, 3, 31, 10) - timedelta(days=10 * (len(ratings) - 1 - i)),
+                                  rating, self.fsrs)
+            self.records.append(record)
+
+    def test_incremental_matches_rebuild(self):
+        incremental = DailyRollup()
+        replayed = [ReviewRecord(r.question_id) for r in self.records]
+        for record, replay in zip(self.records, replayed):
+            for entry in record.review_history:
+                replay.add_review(entry["timestamp"], entry["rating"], self.fsrs)
+                incremental.add_latest(replay)
+
+        rebuilt = DailyRollup.from_reviews(self.records)
+        self.assertEqual(set(incremental.days), set(rebuilt.days))
+        for key, day in rebuilt.days.items():
+            self.assertEqual(incremental.days[key]["ratings"], day["ratings"])
+            self.assertAlmostEqual(incremental.days[key]["stability_sum"], day["stability_sum"])
+
+    def test_summary_counts_every_review_in_window(self):
+        rollup = DailyRollup.from_reviews(self.records)
+        week = rollup.summary(7, self.today)
+        self.assertEqual(week["total_reviews"], 3)
+        self.assertEqual(week["rating_histogram"], {1: 1, 2: 0, 3: 1, 4: 0, 5: 1})
+        self.assertAlmostEqual(week["success_rate"], 2 / 3)
+
+        month = rollup.summary(30, self.today)
+        self.assertEqual(month["total_reviews"], 6)
+        self.assertAlmostEqual(month["avg_rating"], 17 / 6)
+
+    def test_heatmap(self):
+        heatmap = DailyRollup.from_reviews(self.records).heatmap(21, self.today)
+        self.assertEqual(len(heatmap), 21)
+        self.assertEqual(heatmap[-1], (self.today, 3))
+        self.assertEqual(heatmap[-11], (self.today - timedelta(days=10), 2))
+        self.assertEqual(sum(count for _, count in heatmap), 6)
+
+
+class TestStorageRollup(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_record_daily_review_and_invalidate_on_delete(self):
+        fsrs = FSRS()
+        for qid in (1, 2):
+            record = ReviewRecord(qid)
+            record.add_review(datetime.now(), 3, fsrs)
+            self.storage.save_review_record(record)
+            self.storage.record_daily_review(record)
+        self.assertEqual(self.storage.load_daily_rollup().summary(1)["total_reviews"], 2)
+
+        self.storage.delete_review_record(1)
+        self.assertEqual(self.storage.load_daily_rollup().summary(1)["total_reviews"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
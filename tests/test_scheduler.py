@@ -1,10 +1,7 @@
-import sys
-from unittest.mock import MagicMock
-sys.modules["click"] = MagicMock()
-
 import unittest
+from unittest.mock import patch
 from datetime import datetime, timedelta
-from leetcode_fsrs_cli.scheduler import ReviewScheduler, ReviewSession
+from leetcode_fsrs_cli.scheduler import ReviewScheduler, ReviewSession, ReviewQueue, DurationEstimator
 from leetcode_fsrs_cli.fsrs import FSRS, ReviewRecord
 from leetcode_fsrs_cli.leetcode import Question
 
@@ -70,5 +67,138 @@ class TestReviewScheduler(unittest.TestCase):
         self.assertAlmostEqual(progress['completion_rate'], 0.3)
         self.assertEqual(progress['remaining_count'], 7)
 
+    def test_plan_matches_full_sort(self):
+        questions = {i: Question(i, f"Q{i}", "Medium", [], "url") for i in range(1, 51)}
+        reviews = []
+        for i in range(1, 51):
+            record = ReviewRecord(i)
+            record.next_review = datetime.now() - timedelta(days=i % 7)
+            reviews.append(record)
+
+        sessions = self.scheduler.generate_daily_review_plan(reviews, questions, limit=10)
+        priorities = [s.priority for s in sessions]
+        self.assertEqual(len(sessions), 10)
+        self.assertEqual(priorities, sorted(priorities, reverse=True))
+        # 逾期 6 天的 7 道题排在最前
+        self.assertEqual({s.question.id for s in sessions[:7]}, {i for i in range(1, 51) if i % 7 == 6})
+
+
+class TestReviewQueue(unittest.TestCase):
+    def setUp(self):
+        self.fsrs = FSRS()
+        self.scheduler = ReviewScheduler(self.fsrs)
+        self.sessions = [
+            ReviewSession(Question(i, f"Q{i}", "Easy", [], ""), ReviewRecord(i), 10 - i) for i in range(5)
+        ]
+
+    def test_pops_in_priority_order(self):
+        queue = ReviewQueue(self.scheduler, list(reversed(self.sessions)))
+        order = []
+        while True:
+            session = queue.pop()
+            if session is None:
+                break
+            order.append(session.question.id)
+            queue.record_rating(session, 3)
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+
+    def test_failed_card_resurfaces_after_gap(self):
+        queue = ReviewQueue(self.scheduler, self.sessions, relearn_gap=2, max_relearns=1)
+        order = []
+        while True:
+            session = queue.pop()
+            if session is None:
+                break
+            order.append(session.question.id)
+            session.review_record.add_review(datetime.now(), 1 if session.question.id == 0 else 3, self.fsrs)
+            queue.record_rating(session, 1 if session.question.id == 0 else 3)
+
+        # 题 0 失败后在再做两题之后重新出现，且只重新出现一次
+        self.assertEqual(order, [0, 1, 2, 0, 3, 4])
+        self.assertEqual(queue.total, 6)
+
+    def test_relearn_cards_return_by_new_priority(self):
+        sessions = self.sessions[:3]
+        queue = ReviewQueue(self.scheduler, sessions, relearn_gap=3, max_relearns=1)
+        # 重新计算后题 1 的优先级高于题 0
+        new_priorities = {0: 1.0, 1: 5.0}
+        order = []
+        with patch.object(self.scheduler, "_calculate_priority",
+                          side_effect=lambda record, question: new_priorities[question.id]):
+            while True:
+                session = queue.pop()
+                if session is None:
+                    break
+                order.append(session.question.id)
+                queue.record_rating(session, 1 if session.question.id in new_priorities else 3)
+
+        self.assertEqual(order, [0, 1, 2, 1, 0])
+
+
+class TestReviewSuggestions(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = ReviewScheduler(FSRS())
+        self.questions = [
+            Question(1, "Q1", "easy", ["array"], ""),
+            Question(2, "Q2", "easy", ["array", "hash-table"], ""),
+            Question(3, "Q3", "hard", ["graph", "dp", "tree", "heap"], ""),
+            Question(4, "Q4", "medium", ["graph"], ""),
+            Question(5, "Q5", "medium", ["string", "dp"], ""),
+        ]
+
+    def test_greedy_cover_prefers_coverage_per_cost(self):
+        suggestions = self.scheduler.get_review_suggestions(self.questions, [], limit=3)
+        # Q2 (2 / 1) > Q3 (4 / 3)，之后 Q5 只新增 string (1 / 2)，仍优于已无新标签的 Q1、Q4
+        self.assertEqual([q.id for q in suggestions], [2, 3, 5])
+
+    def test_skips_reviewed_and_fills_by_cost(self):
+        suggestions = self.scheduler.get_review_suggestions(self.questions, [2, 3, 5], limit=5)
+        self.assertEqual([q.id for q in suggestions], [1, 4])
+
+    def test_focus_tags_and_budget(self):
+        candidates = [q for q in self.questions if {"graph", "dp"} & set(q.tags)]
+        suggestions = self.scheduler.get_review_suggestions(
+            candidates, [], limit=5, focus_tags=["graph", "dp"], difficulty_budget={"hard": 0}
+        )
+        self.assertEqual([q.id for q in suggestions], [4, 5])
+
+
+class TestTimeBudget(unittest.TestCase):
+    def setUp(self):
+        self.fsrs = FSRS()
+        self.scheduler = ReviewScheduler(self.fsrs)
+        self.questions = {i: Question(i, f"Q{i}", "medium", [], "") for i in range(1, 5)}
+        self.questions[4] = Question(4, "Q4", "hard", [], "")
+        self.records = []
+        start = datetime.now() - timedelta(days=60)
+        for qid, duration in [(1, 600), (2, 120), (3, 180)]:
+            record = ReviewRecord(qid)
+            record.add_review(start, 3, self.fsrs, duration=duration)
+            self.records.append(record)
+
+    def test_estimator_falls_back_per_difficulty(self):
+        estimator = DurationEstimator(self.records, self.questions)
+        self.assertEqual(estimator.estimate(self.questions[1]), 600)
+        self.assertEqual(estimator.estimate(Question(9, "Q9", "medium", [], "")), 180)
+        self.assertEqual(estimator.estimate(self.questions[4]), 300)
+
+        progress = self.scheduler.calculate_review_progress(
+            [ReviewSession(self.questions[i], ReviewRecord(i), 0) for i in (1, 2, 3)], 1, estimator
+        )
+        self.assertAlmostEqual(progress["estimated_time"], 5.0)
+
+    def test_knapsack_respects_budget_and_order(self):
+        estimator = DurationEstimator(self.records, self.questions)
+        sessions = self.scheduler.generate_time_budget_plan(self.records, self.questions, 6, estimator)
+
+        # 10 分钟的题 1 放不进 6 分钟预算，题 2 和题 3 共 5 分钟
+        self.assertEqual({s.question.id for s in sessions}, {2, 3})
+        priorities = [s.priority for s in sessions]
+        self.assertEqual(priorities, sorted(priorities, reverse=True))
+        total = sum(estimator.estimate(s.question) for s in sessions)
+        self.assertLessEqual(total, 6 * 60)
+        self.assertEqual(self.scheduler.generate_time_budget_plan(self.records, self.questions, 0, estimator), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,10 @@
-import sys
-from unittest.mock import MagicMock
-sys.modules["click"] = MagicMock()
-
 import unittest
 from unittest.mock import patch, mock_open, MagicMock
 import json
 import os
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta
 from leetcode_fsrs_cli.storage import StorageManager
 from leetcode_fsrs_cli.fsrs import ReviewRecord
 
@@ -91,5 +90,41 @@ class TestStorageManager(unittest.TestCase):
         mock_load.assert_called_once()
         mock_file.assert_called_with(storage.reviews_file, 'w', encoding='utf-8')
 
+class TestDueIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(data_dir=self.tmp_dir)
+        self.tomorrow = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def save_record(self, qid, next_review):
+        record = ReviewRecord(qid)
+        record.next_review = next_review
+        self.storage.save_review_record(record)
+
+    def test_rebuilds_after_reviews_change_elsewhere(self):
+        self.save_record(1, self.tomorrow)
+        self.assertEqual(self.storage.load_due_index().card_days, {1: self.tomorrow.date().isoformat()})
+
+        # 复习记录被其他途径修改 (未更新索引)
+        self.save_record(2, self.tomorrow + timedelta(days=2))
+        balancer = self.storage.load_due_index()
+        self.assertEqual(set(balancer.card_days), {1, 2})
+
+        # 与复习记录同步保存的索引直接使用
+        balancer.reschedule(3, self.tomorrow)
+        self.storage.save_due_index(balancer)
+        self.assertIn(3, self.storage.load_due_index().card_days)
+
+    def test_drops_past_days_on_load(self):
+        self.save_record(1, self.tomorrow - timedelta(days=3))
+        self.save_record(2, self.tomorrow)
+        balancer = self.storage.load_due_index()
+        self.assertEqual(set(balancer.card_days), {2})
+        self.assertEqual(balancer.due_counts, {self.tomorrow.date().isoformat(): 1})
+
+
 if __name__ == '__main__':
     unittest.main()
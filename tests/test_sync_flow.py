@@ -3,13 +3,16 @@ from unittest.mock import MagicMock, patch
 import os
 import sys
 import shutil
+import threading
+import time
 from pathlib import Path
 
 # Add root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from leetcode_fsrs_cli.sync import SyncManager
-from leetcode_fsrs_cli.leetcode import QuestionManager
+from leetcode_fsrs_cli.leetcode import QuestionManager, Question
+from leetcode_fsrs_cli.plan_cache import read_generation
 from leetcode_fsrs_cli.auth import AuthManager
 import leetcode_fsrs_cli.leetcode_api  # Ensure module is loaded for patch
 
@@ -141,5 +144,139 @@ class TestSyncFlow(unittest.TestCase):
             self.assertIsNotNone(q2)
             self.assertEqual(q2.title, "Add Two Numbers")
 
+
+class TestCatalogSync(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path("test_catalog_dir")
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.test_dir.mkdir()
+        self.sync_manager = SyncManager(data_dir=str(self.test_dir))
+        question_manager = QuestionManager(data_dir=str(self.test_dir))
+        question_manager.add_question(Question(1, "Two Sum", "easy", ["array"],
+                                               "https://leetcode.com/problems/two-sum/", "<p>local</p>"))
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def make_client(self):
+        from leetcode_fsrs_cli.leetcode_api import LeetCodeAPIClient
+        client = LeetCodeAPIClient()
+        client.session = MagicMock()
+        catalog = MagicMock(status_code=200)
+        catalog.json.return_value = {"stat_status_pairs": [
+            {"stat": {"question_id": 2, "frontend_question_id": 2, "question__title": "Add Two Numbers",
+                      "question__title_slug": "add-two-numbers"}, "difficulty": {"level": 2}, "status": None},
+            {"stat": {"question_id": 1, "frontend_question_id": 1, "question__title": "Two Sum",
+                      "question__title_slug": "two-sum"}, "difficulty": {"level": 1}, "status": "ac"},
+            {"stat": {"question_id": 4, "frontend_question_id": 4, "question__title": "Median of Two Sorted Arrays",
+                      "question__title_slug": "median-of-two-sorted-arrays"}, "difficulty": {"level": 3},
+             "paid_only": True},
+        ]}
+        client.session.get.return_value = catalog
+        detail = MagicMock(status_code=200)
+        detail.json.return_value = {"data": {"question": {
+            "questionId": "2", "questionFrontendId": "2", "title": "Add Two Numbers",
+            "titleSlug": "add-two-numbers", "content": "<p>Two linked lists</p>", "difficulty": "Medium",
+            "topicTags": [{"name": "Linked List"}]
+        }}}
+        client.session.post.return_value = detail
+        return client
+
+    def test_catalog_ingested_with_one_request(self):
+        client = self.make_client()
+        with patch('leetcode_fsrs_cli.leetcode_api.client_from_saved_cookie', return_value=client):
+            report = self.sync_manager.perform_catalog_sync()
+
+        self.assertEqual(client.session.get.call_count, 1)
+        client.session.post.assert_not_called()
+        self.assertEqual((report.status, report.new_count, report.unchanged_count), ("success", 2, 1))
+
+        question_manager = QuestionManager(data_dir=str(self.test_dir))
+        stub = question_manager.get_question_by_slug("median-of-two-sorted-arrays")
+        self.assertEqual((stub.id, stub.difficulty, stub.needs_detail), (4, "hard", True))
+        self.assertFalse(question_manager.get_question(1).needs_detail)
+        self.assertEqual(question_manager.get_question(1).content, "<p>local</p>")
+
+    def test_detail_fetched_lazily(self):
+        client = self.make_client()
+        with patch('leetcode_fsrs_cli.leetcode_api.client_from_saved_cookie', return_value=client):
+            self.sync_manager.perform_catalog_sync()
+        question_manager = QuestionManager(data_dir=str(self.test_dir))
+
+        updated = self.sync_manager.fetch_question_detail(question_manager, question_manager.get_question(2), client)
+        self.assertFalse(updated.needs_detail)
+        self.assertEqual(updated.tags, ["Linked List"])
+        reloaded = QuestionManager(data_dir=str(self.test_dir))
+        self.assertEqual(reloaded.get_question(2), updated)
+        self.assertEqual(reloaded.get_ids_by_tags(["Linked List"]), [2])
+        self.assertEqual(reloaded.get_rendered_content(updated), "Two linked lists")
+
+
+class _SlowClient:
+    """后面的题目先返回，用于检查并发数和写入顺序"""
+
+    def __init__(self, count):
+        self.slugs = [f"problem-{i}" for i in range(1, count + 1)]
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.pool_size = None
+
+    def is_authenticated(self):
+        return True
+
+    def configure_pool(self, size):
+        self.pool_size = size
+
+    def get_user_problems(self, limit=1000):
+        return [{"slug": slug} for slug in self.slugs + self.slugs[:1]]
+
+    def get_question_detail(self, slug):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        index = self.slugs.index(slug)
+        time.sleep(0.01 * (len(self.slugs) - index))
+        with self.lock:
+            self.in_flight -= 1
+        return {"id": index + 1, "title": slug, "slug": slug, "difficulty": "Easy", "tags": [], "content": ""}
+
+
+class TestConcurrentSync(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path("test_concurrent_dir")
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.test_dir.mkdir()
+        self.sync_manager = SyncManager(data_dir=str(self.test_dir))
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def test_bounded_concurrency_and_ordered_commit(self):
+        client = _SlowClient(8)
+        inserted = []
+        original = QuestionManager._insert_question
+
+        def record(manager, question):
+            inserted.append(question.id)
+            return original(manager, question)
+
+        with patch.object(QuestionManager, "_insert_question", autospec=True, side_effect=record):
+            report = self.sync_manager.perform_sync(concurrency=3, client=client)
+
+        self.assertEqual((report.status, report.new_count, report.unchanged_count), ("success", 8, 1))
+        self.assertEqual(inserted, list(range(1, 9)))
+        self.assertEqual(client.pool_size, 3)
+        self.assertLessEqual(client.max_in_flight, 3)
+        self.assertGreater(client.max_in_flight, 1)
+        # 8 题在一个写入块内，只写入一次题库文件 (每次写入递增数据版本号)
+        self.assertEqual(read_generation(self.test_dir), 1)
+        self.assertEqual(len(QuestionManager(data_dir=str(self.test_dir)).questions), 8)
+
+
 if __name__ == '__main__':
     unittest.main()
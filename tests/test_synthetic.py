@@ -0,0 +1,32 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from leetcode_fsrs_cli.synthetic import generate_dataset, write_dataset
+from leetcode_fsrs_cli.leetcode import QuestionManager
+from leetcode_fsrs_cli.storage import StorageManager
+
+
+class TestSynthetic(unittest.TestCase):
+    def test_deterministic(self):
+        q1, r1 = generate_dataset(50, 400, seed=7)
+        q2, r2 = generate_dataset(50, 400, seed=7)
+        self.assertEqual([q.to_dict() for q in q1.values()], [q.to_dict() for q in q2.values()])
+        self.assertEqual([r.to_dict() for r in r1.values()], [r.to_dict() for r in r2.values()])
+
+    def test_write_dataset_matches_requested_scale(self):
+        data_dir = tempfile.mkdtemp()
+        try:
+            n_questions, n_reviews = write_dataset(data_dir, 50, 400, seed=1)
+            self.assertEqual((n_questions, n_reviews), (50, 400))
+
+            self.assertEqual(len(QuestionManager(data_dir=data_dir).questions), 50)
+            reviews = StorageManager(data_dir=data_dir).load_reviews()
+            self.assertEqual(sum(len(r.review_history) for r in reviews.values()), 400)
+            self.assertTrue(any(h["rating"] == 1 for r in reviews.values() for h in r.review_history))
+        finally:
+            shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from leetcode_fsrs_cli.fsrs import FSRS
+from leetcode_fsrs_cli.tuning import simulate_schedule, tune_hyperparameters
+
+
+def make_reviews():
+    start = datetime(2024, 1, 1)
+    return [
+        {"question_id": qid, "timestamp": start + timedelta(days=i * 5), "rating": 4 if i % 2 else 3}
+        for qid in range(1, 6)
+        for i in range(4)
+    ]
+
+
+class TestTuning(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, "tune_cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_larger_easy_bonus_reduces_workload(self):
+        cards = [([3, 4, 4, 4], [0, 0, 0, 0])]
+        low = simulate_schedule(dict(FSRS.get_default_params(), easy_bonus=1.1), cards)
+        high = simulate_schedule(dict(FSRS.get_default_params(), easy_bonus=2.0), cards)
+        self.assertLess(high["workload"], low["workload"])
+        self.assertLess(high["retention"], low["retention"])
+
+    def test_grid_results_are_ranked_and_cached(self):
+        grid = {"easy_bonus": [1.1, 1.5], "hard_factor": [1.0], "maximum_interval": [365]}
+        report = tune_hyperparameters(make_reviews(), FSRS.get_default_params(), grid,
+                                      workers=1, cache_path=self.cache_path)
+        self.assertFalse(report["cached"])
+        self.assertEqual(len(report["results"]), 2)
+        self.assertGreaterEqual(report["results"][0]["score"], report["results"][1]["score"])
+
+        again = tune_hyperparameters(make_reviews(), FSRS.get_default_params(), grid,
+                                     workers=1, cache_path=self.cache_path)
+        self.assertTrue(again["cached"])
+        self.assertEqual(again["results"], report["results"])
+
+
+if __name__ == '__main__':
+    unittest.main()